@@ -0,0 +1,72 @@
+'''
+	Name: benchmark_encrypt.py
+	Laboratory 3 - Modes of operation
+
+    Compare the previous CBC encryption loop (a list of ord ints per block, a str per step) against the
+    integer block pipeline that writes in a preallocated buffer: throughput and peak memory (tracemalloc).
+
+    Usage: python benchmark_encrypt.py [--sizes 1M 4M]
+'''
+
+import argparse
+import base64
+import os
+import sys
+import textwrap
+import time
+import tracemalloc
+
+from classes.CBC_Mode import CBC_Mode
+# The Vigenere cipher is shared by the laboratories of the modes of operation
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from ModesOfOperation.classes.Base64VigenereCipher import Base64VigenereCipher
+from benchmark_parallel import parse_size, create_plaintext
+
+
+def legacy_encrypt(plaintext : str, key : str, iv : str):
+    '''
+        Encrypt a plaintext the way CBC_Mode used to do it: the plaintext is wrapped in a list of blocks, every block is
+        transformed to a list of ints and XORed letter by letter, and the encrypted text is a growing string
+    '''
+    vigenere_cipher = Base64VigenereCipher(key, -(-len(iv) * 4 // 3))
+    plaintext += "*" * (-len(plaintext) % len(iv))
+    encrypted_text = ""
+    for block in textwrap.wrap(plaintext, len(iv)):
+        block = [ord(letter) for letter in block]
+        for index in range(len(block)):
+            block[index] ^= ord(iv[index])
+        block = base64.standard_b64encode(bytes(block)).decode()[:-2]
+        block = vigenere_cipher.encrypt_block(block.encode("ascii")).decode("ascii")
+        iv = block
+        encrypted_text += block + "&"
+    return encrypted_text[:-1]
+
+
+def measure(function, *args):
+    '''
+        Run a function twice: once to get its time, and once with tracemalloc to get its peak memory
+    '''
+    start = time.perf_counter()
+    function(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    function(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CBC encryption loop benchmark")
+    parser.add_argument("--sizes", nargs="+", default=["1M", "4M"], help="Plaintext sizes (1M, 10M, ...)")
+    args = parser.parse_args()
+
+    cbc = CBC_Mode()
+    key, iv = cbc.get_key(), cbc.get_iv()
+    print(f"{'size':>6} | {'loop':>8} | {'MB/s':>8} | {'peak MB':>8}")
+    for size in args.sizes:
+        plaintext = create_plaintext(parse_size(size))
+        assert legacy_encrypt(plaintext.decode("ascii"), key, iv).encode("ascii") == cbc.encrypt_bytes(plaintext)
+        for name, function, data in [("legacy", legacy_encrypt, plaintext.decode("ascii")), ("buffer", cbc.encrypt_bytes, plaintext)]:
+            elapsed, peak = measure(function, data, key, iv)
+            print(f"{size:>6} | {name:>8} | {len(plaintext) / (1024 ** 2) / elapsed:>8.2f} | {peak / (1024 ** 2):>8.2f}")
@@ -0,0 +1,90 @@
+'''
+	Name: benchmark_normalizer.py
+	Laboratory 3 - Modes of operation
+
+    Compare the previous plaintext cleaning (four replace calls and lower, a full copy of the text each one) against
+    the single translate pass of TextNormalizer, over the whole text and as a streaming stage over chunks.
+
+    Usage: python benchmark_normalizer.py [--size 100M]
+'''
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from benchmark_parallel import parse_size
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from ModesOfOperation.classes.TextNormalizer import TextNormalizer
+
+
+def legacy_clean(text : str):
+    '''
+        Clean the text the way CBC_Mode and CFB_Mode used to do it
+    '''
+    text = text.replace(' ','')
+    text = text.replace('\n','')
+    text = text.replace('.','')
+    text = text.replace(',','')
+    text = text.lower()
+    return text
+
+
+def create_text(size : int):
+    '''
+        Create size random characters: letters (both cases), spaces, new lines, punctuation and digits
+    '''
+    alphabet = b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJ     \n.,;:!?0123456789"
+    table = bytes(alphabet[value % len(alphabet)] for value in range(256))
+    return os.urandom(size).translate(table).decode("ascii")
+
+
+def measure(function, *args):
+    '''
+        Run a function and get its time and result
+    '''
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plaintext normalization benchmark")
+    parser.add_argument("--size", default="100M", help="Text size (1M, 100M, ...)")
+    parser.add_argument("--chunk-size", default="1M", help="Characters of each chunk of the streaming stage")
+    args = parser.parse_args()
+
+    size = parse_size(args.size)
+    chunk_size = parse_size(args.chunk_size)
+    text = create_text(size)
+    data = text.encode("ascii")
+    normalizer = TextNormalizer()
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "plaintext.txt")
+        with open(filename, "wb") as writer:
+            writer.write(data)
+
+        def stream(clean):
+            with open(filename, "r") as reader:
+                return "".join(clean(chunk) for chunk in iter(lambda: reader.read(chunk_size), ""))
+
+        def normalizer_stream(filename):
+            with open(filename, "r") as reader:
+                return "".join(normalizer.normalize_stream(reader, chunk_size))
+
+        runs = [
+            ("replace chain", legacy_clean, text),
+            ("str.translate", normalizer.normalize, text),
+            ("bytes.translate", lambda data: normalizer.normalize_bytes(data).decode("ascii"), data),
+            ("replace (file)", lambda filename: stream(legacy_clean), filename),
+            ("translate (file)", normalizer_stream, filename),
+        ]
+        print(f"{'cleaning':>16} | {'seconds':>8} | {'MB/s':>8} | {'speedup':>8} | {'kept':>6} | {'outside alphabet':>16}")
+        baseline = None
+        for name, function, argument in runs:
+            elapsed, result = measure(function, argument)
+            baseline = baseline or elapsed
+            outside = sum(not character.isalpha() for character in set(result))
+            print(f"{name:>16} | {elapsed:>8.2f} | {size / (1024 ** 2) / elapsed:>8.2f} | {baseline / elapsed:>7.2f}x | {len(result) / size:>5.0%} | {outside:>16}")
@@ -0,0 +1,102 @@
+'''
+	Name: benchmark_parallel.py
+	Laboratory 3 - Modes of operation
+
+    Compare the sequential CBC decryption loop (block by block, measured on a sample because it is slow and extrapolated to the size) against the vectorized
+    decryption in a single process and the parallel decryption of a binary container. The speedups are relative to the loop.
+
+    Usage: python benchmark_parallel.py [--size 100M] [--loop-size 4M] [--workers 1 2 4 8]
+'''
+
+import argparse
+import base64
+import os
+import sys
+import tempfile
+import time
+
+from classes.CBC_Mode import CBC_Mode
+# The Vigenere cipher is shared by the laboratories of the modes of operation
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from ModesOfOperation.classes.Base64VigenereCipher import Base64VigenereCipher
+
+
+def parse_size(size : str):
+    '''
+        Transform a size like 1K, 1M or 100M into its number of bytes
+    '''
+    multipliers = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    size = size.upper()
+    if size[-1] in multipliers:
+        return int(size[:-1]) * multipliers[size[-1]]
+    return int(size)
+
+
+def create_plaintext(size : int):
+    '''
+        Create size random lowercase letters
+    '''
+    alphabet = b"abcdefghijklmnopqrstuvwxyz"
+    table = bytes(alphabet[value % len(alphabet)] for value in range(256))
+    return os.urandom(size).translate(table)
+
+
+def legacy_decrypt(encrypted_text : str, key : str, iv : str):
+    '''
+        Decrypt an encrypted text the way CBC_Mode used to do it: a sequential loop that decrypts every block,
+        XORs it letter by letter with the previous encrypted block and concatenates the letters to a string
+    '''
+    vigenere_cipher = Base64VigenereCipher(key, -(-len(iv) * 4 // 3))
+    decrypted_text = ""
+    for block in encrypted_text.split("&"):
+        ci = block
+        block = vigenere_cipher.decrypt_block(block.encode("ascii")) + b"=="
+        block = [letter for letter in base64.standard_b64decode(block)]
+        for index in range(len(block)):
+            block[index] ^= ord(iv[index])
+        iv = ci
+        for letter in block:
+            decrypted_text += chr(letter)
+    return decrypted_text
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sequential vs parallel CBC decryption")
+    parser.add_argument("--size", default="100M", help="Plaintext size (1M, 100M, ...)")
+    parser.add_argument("--loop-size", default="4M", help="Size of the sample decrypted by the sequential loop")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4, 8], help="Number of processes to try")
+    args = parser.parse_args()
+
+    size = parse_size(args.size)
+    cbc = CBC_Mode()
+    plaintext = create_plaintext(size)
+    with tempfile.TemporaryDirectory() as directory:
+        encrypted_filename = os.path.join(directory, "encrypted.bin")
+        decrypted_filename = os.path.join(directory, "decrypted.txt")
+        print(f"Encrypting {args.size}...")
+        with open(encrypted_filename, "wb") as writer:
+            cbc.encrypt_container(plaintext, writer)
+
+        loop_size = min(parse_size(args.loop_size), size)
+        encrypted_sample = cbc.encrypt_bytes(plaintext[:loop_size]).decode("ascii")
+        start = time.perf_counter()
+        decrypted = legacy_decrypt(encrypted_sample, cbc.get_key(), cbc.get_iv())
+        loop = (time.perf_counter() - start) / loop_size
+        assert decrypted[:loop_size].encode("latin-1") == plaintext[:loop_size]
+        print(f"{'decryption':>16} | {'seconds':>8} | {'MB/s':>8} | {'speedup':>8}")
+        print(f"{'sequential loop':>16} | {loop * size:>8.2f} | {1 / (1024 ** 2) / loop:>8.2f} | {1:>7.2f}x")
+
+        start = time.perf_counter()
+        decrypted = cbc.decrypt_container(encrypted_filename)
+        elapsed = time.perf_counter() - start
+        assert decrypted[:size] == plaintext
+        print(f"{'vectorized':>16} | {elapsed:>8.2f} | {size / (1024 ** 2) / elapsed:>8.2f} | {loop * size / elapsed:>7.2f}x")
+
+        for workers in args.workers:
+            start = time.perf_counter()
+            with open(decrypted_filename, "wb") as writer:
+                cbc.decrypt_container_parallel(encrypted_filename, writer, workers=workers)
+            elapsed = time.perf_counter() - start
+            with open(decrypted_filename, "rb") as reader:
+                assert reader.read(size) == plaintext
+            print(f"{f'{workers} workers':>16} | {elapsed:>8.2f} | {size / (1024 ** 2) / elapsed:>8.2f} | {loop * size / elapsed:>7.2f}x")
@@ -0,0 +1,82 @@
+'''
+	Name: benchmark_pipeline.py
+	Laboratory 3 - Modes of operation
+
+    Compare the encryption of a text file chunk by chunk (read, encrypt and write one after the other) against the
+    PipelineRunner (a reader thread, the encryption and a writer thread at the same time), and report how busy every
+    stage of the pipeline was. With --sync every write is flushed to the disk, so the I/O is not hidden by the page cache.
+
+    Usage: python benchmark_pipeline.py [--size 100M] [--buffer-size 1M] [--queue-depth 4] [--sync]
+'''
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from classes.CBC_Mode import CBC_Mode
+from benchmark_parallel import parse_size
+from benchmark_normalizer import create_text
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from ModesOfOperation.classes.PipelineRunner import PipelineRunner
+
+
+class SyncedWriter:
+    '''
+        File object that flushes every write to the disk
+    '''
+    def __init__(self, writer, sync : bool):
+        self.__writer = writer
+        self.__sync = sync
+
+
+    def write(self, data : bytes):
+        written = self.__writer.write(data)
+        if self.__sync:
+            self.__writer.flush()
+            os.fsync(self.__writer.fileno())
+        return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CBC pipelined encryption benchmark")
+    parser.add_argument("--size", default="100M", help="Plaintext size (1M, 100M, ...)")
+    parser.add_argument("--buffer-size", default="1M", help="Bytes read each time")
+    parser.add_argument("--queue-depth", type=int, default=4, help="Chunks that can wait between two stages")
+    parser.add_argument("--sync", action="store_true", help="Flush every write to the disk")
+    args = parser.parse_args()
+
+    size = parse_size(args.size)
+    buffer_size = parse_size(args.buffer_size)
+    cbc = CBC_Mode()
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "plaintext.txt")
+        with open(filename, "w") as writer:
+            writer.write(create_text(size))
+
+        def sequential(encrypted_filename):
+            with open(filename, "r") as reader, open(encrypted_filename, "wb") as writer:
+                cbc.encrypt_stream(reader, SyncedWriter(writer, args.sync), chunk_size=buffer_size)
+            return None
+
+        def pipelined(encrypted_filename):
+            runner = PipelineRunner(buffer_size, args.queue_depth)
+            with open(filename, "rb") as reader, open(encrypted_filename, "wb") as writer:
+                return cbc.encrypt_pipelined(reader, SyncedWriter(writer, args.sync), runner=runner)
+
+        print(f"{'encryption':>10} | {'seconds':>8} | {'MB/s':>8} | {'speedup':>8} | {'read':>5} | {'compute':>7} | {'write':>5}")
+        baseline = None
+        outputs = []
+        for name, function in [("sequential", sequential), ("pipelined", pipelined)]:
+            encrypted_filename = os.path.join(directory, f"{name}.txt")
+            start = time.perf_counter()
+            utilization = function(encrypted_filename)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            with open(encrypted_filename, "rb") as reader:
+                outputs.append(reader.read())
+            stages = " | ".join(f"{utilization[stage]:>{width}.0%}" if utilization else f"{'-':>{width}}" for stage, width in [("read", 5), ("compute", 7), ("write", 5)])
+            print(f"{name:>10} | {elapsed:>8.2f} | {size / (1024 ** 2) / elapsed:>8.2f} | {baseline / elapsed:>7.2f}x | {stages}")
+        assert outputs[0] == outputs[1]
@@ -0,0 +1,43 @@
+'''
+	Name: benchmark_transform.py
+	Laboratory 3 - Modes of operation
+
+    Compare the block transforms of CBC_Mode: the Vigenere cipher over base 64 letters against the Vigenere cipher
+    over raw bytes. It reports the encryption and decryption speed and the size of the containers.
+
+    Usage: python benchmark_transform.py [--size 4M]
+'''
+
+import argparse
+import io
+import os
+import tempfile
+import time
+
+from classes.CBC_Mode import CBC_Mode
+from benchmark_parallel import parse_size, create_plaintext
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CBC block transforms benchmark")
+    parser.add_argument("--size", default="4M", help="Plaintext size (1M, 4M, ...)")
+    args = parser.parse_args()
+
+    size = parse_size(args.size)
+    cbc = CBC_Mode()
+    plaintext = create_plaintext(size)
+    print(f"{'transform':>10} | {'encrypt MB/s':>12} | {'decrypt MB/s':>12} | {'container MB':>12} | {'expansion':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for transform in ["base64", "bytes"]:
+            encrypted_filename = os.path.join(directory, f"{transform}.bin")
+            start = time.perf_counter()
+            with open(encrypted_filename, "wb") as writer:
+                cbc.encrypt_container(plaintext, writer, transform=transform)
+            encryption = time.perf_counter() - start
+            start = time.perf_counter()
+            decrypted = io.BytesIO()
+            cbc.decrypt_stream(encrypted_filename, decrypted, container=True)
+            decryption = time.perf_counter() - start
+            assert decrypted.getvalue()[:size] == plaintext
+            container_size = os.path.getsize(encrypted_filename)
+            print(f"{transform:>10} | {size / (1024 ** 2) / encryption:>12.2f} | {size / (1024 ** 2) / decryption:>12.2f} | {container_size / (1024 ** 2):>12.2f} | {container_size / size:>8.2f}x")
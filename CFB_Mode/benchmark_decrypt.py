@@ -0,0 +1,73 @@
+'''
+	Name: benchmark_decrypt.py
+	Laboratory 3 - Modes of operation
+
+    Compare the previous CFB decryption loop (one Vigenere call and one XOR per block) against the batched decryption
+    (the keystream of a whole chunk in one Vigenere pass and one XOR) and the parallel decryption over a pool of processes.
+
+    Usage: python benchmark_decrypt.py [--size 100M] [--workers 1 2 4 8]
+'''
+
+import argparse
+import base64
+import os
+import sys
+import tempfile
+import time
+
+from classes.CFB_Mode import CFB_Mode
+# The Vigenere cipher is shared by the laboratories of the modes of operation
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from ModesOfOperation.classes.Base64VigenereCipher import Base64VigenereCipher
+from benchmark_encrypt import parse_size, create_plaintext
+
+
+def legacy_decrypt(encrypted_filename : str, writer, key : str, iv : str):
+    '''
+        Decrypt an encrypted text the way CFB_Mode used to do it: the blocks are split and decrypted one by one
+    '''
+    vigenere_cipher = Base64VigenereCipher(key, len(iv))
+    with open(encrypted_filename, "rb") as reader:
+        for block in reader.read().split(b"&"):
+            decrypted_block = base64.standard_b64decode(block + b"=" * (-len(block) % 4))
+            iv = vigenere_cipher.encrypt_block(iv[: vigenere_cipher.block_size].encode("ascii")).decode("ascii")
+            writer.write(bytes(letter ^ iv_letter for letter, iv_letter in zip(decrypted_block, iv.encode("ascii"))))
+            iv = block.decode("ascii")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CFB decryption benchmark")
+    parser.add_argument("--size", default="100M", help="Plaintext size (1M, 100M, ...)")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4, 8], help="Number of processes to try")
+    args = parser.parse_args()
+
+    size = parse_size(args.size)
+    cfb = CFB_Mode()
+    key, iv = cfb.get_key(), cfb.get_iv()
+    plaintext = create_plaintext(size)
+    plaintext += b"*" * (-len(plaintext) % len(iv))
+    with tempfile.TemporaryDirectory() as directory:
+        encrypted_filename = os.path.join(directory, "encrypted.txt")
+        decrypted_filename = os.path.join(directory, "decrypted.txt")
+        with open(encrypted_filename, "wb") as writer:
+            writer.write(cfb.encrypt_bytes(plaintext))
+        del plaintext
+
+        runs = [("legacy loop", lambda writer: legacy_decrypt(encrypted_filename, writer, key, iv)),
+                ("batched", lambda writer: cfb.decrypt_stream(encrypted_filename, writer))]
+        for workers in args.workers:
+            runs.append((f"{workers} workers", lambda writer, workers=workers: cfb.decrypt_parallel(encrypted_filename, writer, workers=workers)))
+        print(f"{'decryption':>12} | {'seconds':>8} | {'MB/s':>8} | {'speedup':>8}")
+        baseline = None
+        expected = None
+        for name, function in runs:
+            start = time.perf_counter()
+            with open(decrypted_filename, "wb") as writer:
+                function(writer)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            with open(decrypted_filename, "rb") as reader:
+                decrypted = reader.read()
+            expected = expected or decrypted
+            assert decrypted == expected
+            print(f"{name:>12} | {elapsed:>8.2f} | {size / (1024 ** 2) / elapsed:>8.2f} | {baseline / elapsed:>7.2f}x")
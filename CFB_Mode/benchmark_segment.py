@@ -0,0 +1,61 @@
+'''
+	Name: benchmark_segment.py
+	Laboratory 3 - Modes of operation
+
+    Latency and throughput of the CFB Mode with segments (CFB_Stream) for each segment size.
+    The latency is the time to encrypt a single byte and get it back; the CFB Mode with whole blocks has to wait for
+    len(iv) bytes (and pad the last block) before it writes anything.
+
+    Usage: python benchmark_segment.py [--size 4M] [--segments 1 2 5 10]
+'''
+
+import argparse
+import os
+import statistics
+import time
+
+from classes.CFB_Mode import CFB_Mode
+from benchmark_encrypt import parse_size
+
+
+def measure_latency(stream, count : int):
+    '''
+        Get the median and the 99th percentile of the time (in microseconds) to encrypt/decrypt count single bytes
+    '''
+    times = []
+    for value in os.urandom(count):
+        start = time.perf_counter()
+        stream.update(bytes([value]))
+        times.append((time.perf_counter() - start) * 1e6)
+    times.sort()
+    return statistics.median(times), times[int(len(times) * 0.99)]
+
+
+def measure_throughput(stream, data : bytes, chunk_size : int):
+    '''
+        Get the MB/s of encrypting/decrypting the data in chunks of chunk_size bytes, and the result
+    '''
+    start = time.perf_counter()
+    output = b"".join(stream.update(data[index : index + chunk_size]) for index in range(0, len(data), chunk_size))
+    return len(data) / (1024 ** 2) / (time.perf_counter() - start), output
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CFB segment size benchmark")
+    parser.add_argument("--size", default="4M", help="Data size used for the throughput (1M, 4M, ...)")
+    parser.add_argument("--segments", nargs="+", type=int, default=[1, 2, 5, 10], help="Segment sizes to try")
+    parser.add_argument("--chunk-size", default="64K", help="Bytes passed to update each time for the throughput")
+    parser.add_argument("--bytes", type=int, default=20000, help="Single bytes used for the latency")
+    args = parser.parse_args()
+
+    cfb = CFB_Mode()
+    data = os.urandom(parse_size(args.size))
+    chunk_size = parse_size(args.chunk_size)
+    print(f"block CFB: nothing is written until {len(cfb.get_iv())} bytes arrive")
+    print(f"{'segment':>7} | {'latency us':>10} | {'p99 us':>8} | {'encrypt MB/s':>12} | {'decrypt MB/s':>12}")
+    for segment_size in args.segments:
+        median, percentile = measure_latency(cfb.stream(segment_size), args.bytes)
+        encrypt_speed, encrypted = measure_throughput(cfb.stream(segment_size), data, chunk_size)
+        decrypt_speed, decrypted = measure_throughput(cfb.stream(segment_size, decrypt=True), encrypted, chunk_size)
+        assert decrypted == data
+        print(f"{segment_size:>7} | {median:>10.2f} | {percentile:>8.2f} | {encrypt_speed:>12.2f} | {decrypt_speed:>12.2f}")
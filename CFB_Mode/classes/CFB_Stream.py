@@ -0,0 +1,193 @@
+'''
+	Name: CFB_Stream.py
+	Laboratory 3 - Modes of operation
+    Authors:
+		* María José Salmerón Contreras
+		* Edgar Alejandro Ramírez Fuentes
+
+    CFB Mode with segments of segment_size bytes (CFB-8 when it is 1) over the Vigenere cipher of raw bytes.\n
+    The register starts as the iv; the keystream of a segment is the first segment_size bytes of the Vigenere cipher
+    of the register, and the encrypted segment is shifted into the register. The mode is a self-synchronising stream cipher:
+    every byte is encrypted/decrypted as soon as it arrives (nothing is padded), and a lost or corrupted byte only
+    garbles the next len(iv) bytes. With segment_size = len(iv) it is the CFB Mode of the bytes transform.
+'''
+
+import os
+import sys
+import numpy as np
+
+# The classes shared by the laboratories of the modes of operation are in ModesOfOperation/classes
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from ModesOfOperation.classes.ByteVigenereCipher import ByteVigenereCipher
+
+class CFB_Stream:
+    '''
+        Class used to encipher/decipher a stream of bytes using the CFB Mode with segments of segment_size bytes
+    '''
+    def __init__(self, key : str, iv : str, segment_size : int = 1, decrypt : bool = False):
+        '''
+            Initialize the CFB_Stream object
+
+            Parameters
+            -------------
+            key : str
+                It is the key used for the Vigenere cipher
+
+            iv : str
+                It is the initialization vector, its length is the block size (the size of the register)
+
+            segment_size : int
+                It is the number of bytes shifted into the register each time (from 1 to the block size)
+
+            decrypt : bool
+                If it is True, the stream is decrypted instead of encrypted
+        '''
+        self.__block_size = len(iv)
+        if not 1 <= segment_size <= self.__block_size:
+            raise ValueError(f"The segment size must be between 1 and {self.__block_size} bytes")
+        self.__segment_size = segment_size
+        self.__decrypt = decrypt
+        self.__cipher = ByteVigenereCipher(key, self.__block_size)
+        self.__register_mask = (1 << (8 * self.__block_size)) - 1
+        self.__register = int.from_bytes(iv.encode("ascii"), "big")
+        # Encrypted bytes of the current segment, and the keystream of the segment
+        self.__segment = bytearray()
+        self.__keystream = b""
+
+
+    def __get_keystream(self, register : int):
+        '''
+            Cipher the register (add the key to each byte without carrying to the next one) and keep its first segment_size bytes
+
+            Parameters
+            -------------
+            register : int
+                It is the register (the last block size encrypted bytes)
+
+            Returns
+            -------------
+            keystream : int
+                It is the keystream of the next segment
+        '''
+        keystream = int.from_bytes(self.__cipher.encrypt_block(register.to_bytes(self.__block_size, "big")), "big")
+        return keystream >> (8 * (self.__block_size - self.__segment_size))
+
+
+    def __decrypt_segments(self, data : bytes):
+        '''
+            Decrypt complete segments at once. The register of every segment is made of the previous encrypted bytes,
+            which are all known, so the keystream of all the segments is computed in a single Vigenere call.
+
+            Parameters
+            -------------
+            data : bytes
+                It is the encrypted segments
+
+            Returns
+            -------------
+            bytes
+                It is the decrypted segments
+        '''
+        count = len(data) // self.__segment_size
+        encrypted = np.frombuffer(self.__register.to_bytes(self.__block_size, "big") + bytes(data), dtype=np.uint8)
+        # The register of the segment i is the block_size bytes before it
+        registers = np.lib.stride_tricks.sliding_window_view(encrypted, self.__block_size)[: count * self.__segment_size : self.__segment_size]
+        keystream = np.frombuffer(self.__cipher.encrypt_blocks(registers.tobytes()), dtype=np.uint8)
+        keystream = keystream.reshape(count, self.__block_size)[:, : self.__segment_size].ravel()
+        self.__register = int.from_bytes(encrypted[-self.__block_size :].tobytes(), "big")
+        return np.bitwise_xor(encrypted[self.__block_size :], keystream).tobytes()
+
+
+    def update(self, data : bytes):
+        '''
+            Encrypt/decrypt the next bytes of the stream. Every byte is returned immediately, an incomplete segment
+            is only kept to update the register when it is completed.
+
+            Parameters
+            -------------
+            data : bytes
+                It is the next bytes of the stream
+
+            Returns
+            -------------
+            bytes
+                It is the encrypted/decrypted bytes (as many as data)
+        '''
+        data = memoryview(data)
+        output = bytearray(len(data))
+        index = 0
+        segment_size = self.__segment_size
+        # Complete the current segment byte by byte
+        while self.__segment and index < len(data):
+            index = self.__update_byte(data, output, index)
+        if self.__decrypt:
+            count = (len(data) - index) // segment_size
+            if count:
+                output[index : index + count * segment_size] = self.__decrypt_segments(data[index : index + count * segment_size])
+                index += count * segment_size
+        else:
+            segment_shift = 8 * segment_size
+            register = self.__register
+            while len(data) - index >= segment_size:
+                segment = int.from_bytes(data[index : index + segment_size], "big") ^ self.__get_keystream(register)
+                output[index : index + segment_size] = segment.to_bytes(segment_size, "big")
+                # Shift the encrypted segment into the register
+                register = ((register << segment_shift) | segment) & self.__register_mask
+                index += segment_size
+            self.__register = register
+        # The bytes of an incomplete segment are returned too
+        while index < len(data):
+            index = self.__update_byte(data, output, index)
+        return bytes(output)
+
+
+    def __update_byte(self, data : memoryview, output : bytearray, index : int):
+        '''
+            Encrypt/decrypt a single byte of the current segment, and shift the segment into the register when it is completed
+
+            Parameters
+            -------------
+            data : memoryview
+                It is the bytes passed to update
+
+            output : bytearray
+                It is the buffer of the encrypted/decrypted bytes
+
+            index : int
+                It is the position of the byte
+
+            Returns
+            -------------
+            int
+                It is the position of the next byte
+        '''
+        if not self.__segment:
+            self.__keystream = self.__get_keystream(self.__register).to_bytes(self.__segment_size, "big")
+        output[index] = data[index] ^ self.__keystream[len(self.__segment)]
+        self.__segment.append(data[index] if self.__decrypt else output[index])
+        if len(self.__segment) == self.__segment_size:
+            self.__register = ((self.__register << (8 * self.__segment_size)) | int.from_bytes(self.__segment, "big")) & self.__register_mask
+            self.__segment.clear()
+        return index + 1
+
+
+    def pipe(self, reader, writer, chunk_size : int = 4096):
+        '''
+            Encrypt/decrypt everything read from a file object (a pipe or a socket file) and write it as soon as it is read
+
+            Parameters
+            -------------
+            reader : file object
+                It is the file object (opened in binary mode) that is read until its end
+
+            writer : file object
+                It is the file object (opened in binary mode) where the result is written and flushed after every read
+
+            chunk_size : int
+                It is the maximum number of bytes read each time
+        '''
+        # read1 returns the bytes available without waiting to fill the chunk
+        read = getattr(reader, "read1", reader.read)
+        for chunk in iter(lambda: read(chunk_size), b""):
+            writer.write(self.update(chunk))
+            writer.flush()
@@ -8,18 +8,57 @@
     Using Vigenere cipher and CFB Mode encipher and decipher a 500 characters text (English alphabet).
 '''
 
+import os
+import sys
+
 from classes.CFB_Mode import CFB_Mode
 
+# The classes shared by the laboratories of the modes of operation are in ModesOfOperation/classes
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from ModesOfOperation.classes.PipelineRunner import PipelineRunner
+
 if __name__ == "__main__":
     cfb = CFB_Mode()
-    print("Choose the operation you want to do \n1. Encipher textfile \n2. Decipher textfile")
+    print("Choose the operation you want to do \n1. Encipher textfile \n2. Decipher textfile \n3. Encipher textfile (binary container) \n4. Decipher binary container \n5. Encipher textfile (binary container, byte Vigenere) \n6. Decipher textfile (all the cores) \n7. Encipher textfile (pipelined read, encryption and write)")
     operation = int(input(""))
     if operation == 1:
         filename = input("Input the filename (with extension) that contains the plaintext: ")
-        cfb.encrypt(filename)
+        keys_filename = input("Input the filename (with extension) that will store the keys: ")
+        encrypted_filename = input("Input the filename (with extension) that will store the encrypted text: ")
+        cfb.encrypt(filename, keys_filename, encrypted_filename)
     elif operation == 2:
         encrypted_filename = input("Input the filename (with extension) that contains the encrypted text: ")
         keys_filename = input("Input the filename (with extension) that contains the keys: ")
-        cfb.decrypt(encrypted_filename, keys_filename)
+        decrypted_filename = input("Input the filename (with extension) that will store the decrypted text: ")
+        cfb.decrypt(encrypted_filename, keys_filename, decrypted_filename)
+    elif operation == 3:
+        filename = input("Input the filename (with extension) that contains the plaintext: ")
+        keys_filename = input("Input the filename (with extension) that will store the keys: ")
+        encrypted_filename = input("Input the filename (with extension) that will store the container: ")
+        cfb.encrypt(filename, keys_filename, encrypted_filename, container=True)
+    elif operation == 4:
+        encrypted_filename = input("Input the filename (with extension) of the container: ")
+        keys_filename = input("Input the filename (with extension) that contains the keys: ")
+        decrypted_filename = input("Input the filename (with extension) that will store the decrypted text: ")
+        cfb.decrypt(encrypted_filename, keys_filename, decrypted_filename, container=True)
+    elif operation == 5:
+        filename = input("Input the filename (with extension) that contains the plaintext: ")
+        keys_filename = input("Input the filename (with extension) that will store the keys: ")
+        encrypted_filename = input("Input the filename (with extension) that will store the container: ")
+        cfb.encrypt(filename, keys_filename, encrypted_filename, container=True, transform="bytes")
+    elif operation == 6:
+        encrypted_filename = input("Input the filename (with extension) that contains the encrypted text: ")
+        keys_filename = input("Input the filename (with extension) that contains the keys: ")
+        decrypted_filename = input("Input the filename (with extension) that will store the decrypted text: ")
+        cfb.decrypt(encrypted_filename, keys_filename, decrypted_filename, workers=os.cpu_count())
+    elif operation == 7:
+        filename = input("Input the filename (with extension) that contains the plaintext: ")
+        keys_filename = input("Input the filename (with extension) that will store the keys: ")
+        encrypted_filename = input("Input the filename (with extension) that will store the encrypted text: ")
+        buffer_size = int(input("Input the number of bytes read each time (e.g. 1048576): "))
+        queue_depth = int(input("Input the number of chunks that can wait between two stages (e.g. 4): "))
+        runner = PipelineRunner(buffer_size, queue_depth)
+        cfb.encrypt(filename, keys_filename, encrypted_filename, runner=runner)
+        print(f"Encrypted in {runner.seconds:.2f} seconds. Busy time: " + ", ".join(f"{stage} {utilization:.0%}" for stage, utilization in runner.utilization.items()))
     else:
         print("Wrong option")
\ No newline at end of file
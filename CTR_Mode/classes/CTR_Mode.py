@@ -0,0 +1,509 @@
+'''
+	Name: CTR_Mode.py
+	Laboratory 3 - Modes of operation
+    Authors:
+		* María José Salmerón Contreras
+		* Edgar Alejandro Ramírez Fuentes
+
+    Using Vigenere cipher and CTR Mode encipher and decipher a 500 characters text (English alphabet).
+
+    The counter of the block i is the iv plus i (the iv letters are a number in base 64), its Vigenere cipher is the keystream
+    XORed with the block, and the result is encoded in base 64. Every keystream block only depends on its index, so the keystream
+    can be computed ahead of time, the blocks can be encrypted/decrypted in parallel and any range of the text can be read or rewritten.
+    The blocks are encrypted by the CTR Mode of ModesOfOperation.
+'''
+
+import os
+import sys
+
+# The classes shared by the laboratories of the modes of operation are in ModesOfOperation/classes
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from ModesOfOperation.classes import ModesOfOperation
+from ModesOfOperation.classes.Base64VigenereCipher import Base64VigenereCipher
+from ModesOfOperation.classes.BlockTransform import Base64Transform
+from ModesOfOperation.classes.CipherContainer import get_block_letters
+from ModesOfOperation.classes.TextNormalizer import TextNormalizer
+from ModesOfOperation.classes.VigenereMode import SeparatedBlockWriter, generate_key, join_blocks, read_keys, split_blocks, write_keys
+
+
+class CTR_Mode:
+    def __init__(self):
+        '''
+            Class used to encipher/decipher text using the CTR Mode
+        '''
+        self.__iv = generate_key(10)
+        self.__key = generate_key(10)
+        self.__normalizer = TextNormalizer()
+        # Mode whose keystream was computed ahead of time: (key, iv, mode)
+        self.__precomputed = (None, None, None)
+
+
+    def get_key(self):
+        '''
+            Get the key used for the Vigenere cipher
+
+            Returns
+            ------------
+            key : str
+                It is the key used to encipher/decipher in the Vigenere cipher
+        '''
+        return self.__key
+
+
+    def get_iv(self):
+        '''
+            Get the initialization vector used for the CTR Mode
+
+            Returns
+            ------------
+            iv : str
+                It is the initialization vector used to encipher/decipher in the CTR Mode
+        '''
+        return self.__iv
+
+
+    def __get_mode(self, key : str, iv : str, precomputed : bool = True):
+        '''
+            Get the CTR Mode that encrypts blocks of len(iv) bytes with the Vigenere cipher of their counters (base 64 letters).
+            The data is not padded: the last block is shorter if the data is not a multiple of the block size.
+
+            Parameters
+            -------------
+            key : str
+                It is the key used for the Vigenere cipher
+
+            iv : str
+                It is the initialization vector
+
+            precomputed : bool
+                If it is True, the mode with the keystream precomputed for the same key and iv is reused
+
+            Returns
+            -------------
+            ModesOfOperation.CTR_Mode
+                It is the mode of operation
+        '''
+        precomputed_key, precomputed_iv, mode = self.__precomputed
+        if precomputed and (precomputed_key, precomputed_iv) == (key, iv):
+            return mode
+        return ModesOfOperation.CTR_Mode(Base64VigenereCipher(key, len(iv)), Base64Transform(len(iv)))
+
+
+    def precompute_keystream(self, block_count : int, key : str = None, iv : str = None):
+        '''
+            Compute the keystream of the first block_count blocks ahead of time, so the next encryptions/decryptions
+            with the same key and iv only XOR the blocks
+
+            Parameters
+            -------------
+            block_count : int
+                It is the number of blocks
+
+            key : str
+                It is the key used for the Vigenere cipher. By default, the key of the object.
+
+            iv : str
+                It is the initialization vector. By default, the initialization vector of the object.
+        '''
+        key = key or self.__key
+        iv = iv or self.__iv
+        mode = self.__get_mode(key, iv, False)
+        mode.precompute_keystream(iv.encode("ascii"), block_count)
+        self.__precomputed = (key, iv, mode)
+
+
+    def keystream(self, first_block : int, count : int, key : str = None, iv : str = None):
+        '''
+            Get the keystream of the blocks first_block ... first_block + count - 1, from the precomputed keystream if it has them
+
+            Parameters
+            -------------
+            first_block : int
+                It is the index of the first block
+
+            count : int
+                It is the number of blocks
+
+            key : str
+                It is the key used for the Vigenere cipher. By default, the key of the object.
+
+            iv : str
+                It is the initialization vector. By default, the initialization vector of the object.
+
+            Returns
+            -------------
+            bytes
+                It is the concatenation of the keystream blocks (len(iv) letters each)
+        '''
+        key = key or self.__key
+        iv = iv or self.__iv
+        mode = self.__get_mode(key, iv)
+        return mode.keystream(mode.get_range_state(None, mode.get_state(iv.encode("ascii")), first_block, True), count)[0]
+
+
+    def encrypt_bytes(self, data : bytes, key : str = None, iv : str = None, first_block : int = 0):
+        '''
+            Encrypt the data without prompting anything. The blocks are XORed with their keystream at once,
+            so the data is not padded: the last block is shorter if the data is not a multiple of the block size (the IV length).
+
+            Parameters
+            -------------
+            data : bytes
+                It is the plaintext that will be encrypted
+
+            key : str
+                It is the key used for the Vigenere cipher. By default, the key of the object.
+
+            iv : str
+                It is the initialization vector. By default, the initialization vector of the object.
+
+            first_block : int
+                It is the index of the first block of the data in the whole text
+
+            Returns
+            -------------
+            encrypted_data : bytes
+                It is the encrypted blocks (base 64) separated by &
+        '''
+        key = key or self.__key
+        iv = iv or self.__iv
+        if not data:
+            return b""
+        mode = self.__get_mode(key, iv)
+        state = mode.get_range_state(data, mode.get_state(iv.encode("ascii")), first_block, True)
+        return join_blocks(mode.encrypt_blocks(data, state)[0], mode.encoded_size)
+
+
+    def decrypt_bytes(self, encrypted_data : bytes, key : str = None, iv : str = None, first_block : int = 0):
+        '''
+            Decrypt the data without prompting anything
+
+            Parameters
+            -------------
+            encrypted_data : bytes
+                It is the encrypted blocks (base 64) separated by &
+
+            key : str
+                It is the key used for the Vigenere cipher. By default, the key of the object.
+
+            iv : str
+                It is the initialization vector. By default, the initialization vector of the object.
+
+            first_block : int
+                It is the index of the first encrypted block in the whole text
+
+            Returns
+            -------------
+            data : bytes
+                It is the decrypted data
+        '''
+        key = key or self.__key
+        iv = iv or self.__iv
+        if not encrypted_data:
+            return b""
+        mode = self.__get_mode(key, iv)
+        state = mode.get_range_state(encrypted_data, mode.get_state(iv.encode("ascii")), first_block, False)
+        return mode.decrypt_blocks(split_blocks(encrypted_data, mode.encoded_size), state)[0]
+
+
+    def encrypt_parallel(self, data : bytes, key : str = None, iv : str = None, workers : int = None, blocks_per_task : int = 1024 * 1024):
+        '''
+            Encrypt the data in a pool of processes. The data is divided in ranges of blocks and every range is encrypted
+            by a worker with the keystream of its own counters (see ModeOfOperation.encrypt_parallel).
+
+            Parameters
+            -------------
+            data : bytes
+                It is the plaintext that will be encrypted
+
+            key : str
+                It is the key used for the Vigenere cipher. By default, the key of the object.
+
+            iv : str
+                It is the initialization vector. By default, the initialization vector of the object.
+
+            workers : int
+                It is the number of processes. By default, one per core.
+
+            blocks_per_task : int
+                It is the number of blocks encrypted by a worker each time
+
+            Returns
+            -------------
+            encrypted_data : bytes
+                It is the encrypted blocks (base 64) separated by &
+        '''
+        key = key or self.__key
+        iv = iv or self.__iv
+        # The workers compute their own keystream, so the precomputed one is not sent to them
+        mode = self.__get_mode(key, iv, False)
+        return join_blocks(mode.encrypt_parallel(data, iv.encode("ascii"), workers, blocks_per_task), mode.encoded_size)
+
+
+    def decrypt_parallel(self, encrypted_data : bytes, key : str = None, iv : str = None, workers : int = None, blocks_per_task : int = 1024 * 1024):
+        '''
+            Decrypt the data in a pool of processes. Every encrypted block has the same length, so the data is divided
+            in ranges of blocks without reading it, and every range is decrypted by a worker with the keystream of its own counters.
+
+            Parameters
+            -------------
+            encrypted_data : bytes
+                It is the encrypted blocks (base 64) separated by &
+
+            key : str
+                It is the key used for the Vigenere cipher. By default, the key of the object.
+
+            iv : str
+                It is the initialization vector. By default, the initialization vector of the object.
+
+            workers : int
+                It is the number of processes. By default, one per core.
+
+            blocks_per_task : int
+                It is the number of blocks decrypted by a worker each time
+
+            Returns
+            -------------
+            data : bytes
+                It is the decrypted data
+        '''
+        key = key or self.__key
+        iv = iv or self.__iv
+        mode = self.__get_mode(key, iv, False)
+        return mode.decrypt_parallel(split_blocks(encrypted_data, mode.encoded_size), iv.encode("ascii"), workers, blocks_per_task)
+
+
+    def encrypt_stream(self, reader, writer, key : str = None, iv : str = None, chunk_size : int = 1024 * 1024):
+        '''
+            Encrypt a text file object chunk by chunk, so the memory used does not depend on the size of the plaintext.\n
+            Each chunk is normalized and its complete blocks are encrypted and written immediately (see ModeOfOperation.encryptor);
+            the incomplete block is carried to the next chunk.
+
+            Parameters
+            -------------
+            reader : file object
+                It is the file object (opened in text mode) that contains the plaintext
+
+            writer : file object
+                It is the file object (opened in binary mode) that will store the encrypted text
+
+            key : str
+                It is the key used for the Vigenere cipher. By default, the key of the object.
+
+            iv : str
+                It is the initialization vector. By default, the initialization vector of the object.
+
+            chunk_size : int
+                It is the number of characters read each time
+        '''
+        key = key or self.__key
+        iv = iv or self.__iv
+        mode = self.__get_mode(key, iv)
+        encryptor = mode.encryptor(iv.encode("ascii"))
+        # Add & to split each block in the decryption process
+        output = SeparatedBlockWriter(writer, mode.encoded_size)
+        for chunk in self.__normalizer.normalize_stream(reader, chunk_size):
+            output.write(encryptor.update(chunk.encode("latin-1")))
+        output.write(encryptor.finalize())
+
+
+    def decrypt_stream(self, encrypted_filename : str, writer, key : str = None, iv : str = None, chunk_size : int = 1024 * 1024):
+        '''
+            Decrypt a file chunk by chunk, so the memory used does not depend on the size of the encrypted text
+
+            Parameters
+            -------------
+            encrypted_filename : str
+                It is the filename (with extension) that contains the encrypted text
+
+            writer : file object
+                It is the file object (opened in binary mode) that will store the decrypted data
+
+            key : str
+                It is the key used for the Vigenere cipher. By default, the key of the object.
+
+            iv : str
+                It is the initialization vector. By default, the initialization vector of the object.
+
+            chunk_size : int
+                It is the number of bytes read each time
+        '''
+        key = key or self.__key
+        iv = iv or self.__iv
+        mode = self.__get_mode(key, iv)
+        decryptor = mode.decryptor(iv.encode("ascii"))
+        # Every chunk has whole blocks followed by &, so the separators are removed chunk by chunk
+        chunk_size = max(chunk_size // (mode.encoded_size + 1), 1) * (mode.encoded_size + 1)
+        with open(encrypted_filename, "rb") as reader:
+            for chunk in iter(lambda: reader.read(chunk_size), b""):
+                writer.write(decryptor.update(split_blocks(chunk, mode.encoded_size)))
+        writer.write(decryptor.finalize())
+
+
+    def __get_data_length(self, encrypted_length : int, block_size : int, block_letters : int):
+        '''
+            Get the length of the plaintext from the length of the encrypted text
+
+            Parameters
+            -------------
+            encrypted_length : int
+                It is the number of bytes of the encrypted text (blocks separated by &)
+
+            block_size : int
+                It is the number of bytes of a plaintext block
+
+            block_letters : int
+                It is the number of letters of an encrypted block
+
+            Returns
+            -------------
+            int
+                It is the number of bytes of the plaintext
+        '''
+        count = (encrypted_length + 1) // (block_letters + 1)
+        last_letters = max(encrypted_length - count * (block_letters + 1), 0)
+        return count * block_size + last_letters * 3 // 4
+
+
+    def decrypt_range(self, encrypted_filename : str, offset : int, length : int, key : str = None, iv : str = None):
+        '''
+            Decrypt length bytes of the plaintext from the offset, reading only the blocks that contain them.\n
+            Every encrypted block has the same length, so the position of a block in the file is known.
+
+            Parameters
+            -------------
+            encrypted_filename : str
+                It is the filename (with extension) that contains the encrypted text
+
+            offset : int
+                It is the position of the first byte in the plaintext
+
+            length : int
+                It is the number of bytes
+
+            key : str
+                It is the key used for the Vigenere cipher. By default, the key of the object.
+
+            iv : str
+                It is the initialization vector. By default, the initialization vector of the object.
+
+            Returns
+            -------------
+            data : bytes
+                It is the decrypted bytes (fewer than length if the plaintext ends before)
+        '''
+        iv = iv or self.__iv
+        block_size = len(iv)
+        block_letters = get_block_letters(block_size)
+        if length <= 0:
+            return b""
+        first_block = offset // block_size
+        last_block = (offset + length - 1) // block_size
+        with open(encrypted_filename, "rb") as reader:
+            reader.seek(first_block * (block_letters + 1))
+            encrypted_data = reader.read((last_block - first_block + 1) * (block_letters + 1) - 1)
+        data = self.decrypt_bytes(encrypted_data.rstrip(b"&"), key, iv, first_block)
+        start = offset - first_block * block_size
+        return data[start : start + length]
+
+
+    def encrypt_range(self, encrypted_filename : str, offset : int, data : bytes, key : str = None, iv : str = None):
+        '''
+            Replace the plaintext from the offset with the data in an encrypted file, rewriting only the blocks that contain it.
+            The data can go beyond the end of the plaintext to append to it.
+
+            Parameters
+            -------------
+            encrypted_filename : str
+                It is the filename (with extension) that contains the encrypted text
+
+            offset : int
+                It is the position of the first replaced byte in the plaintext (at most the length of the plaintext)
+
+            data : bytes
+                It is the new plaintext
+
+            key : str
+                It is the key used for the Vigenere cipher. By default, the key of the object.
+
+            iv : str
+                It is the initialization vector. By default, the initialization vector of the object.
+        '''
+        iv = iv or self.__iv
+        block_size = len(iv)
+        block_letters = get_block_letters(block_size)
+        if not data:
+            return
+        first_block = offset // block_size
+        last_block = (offset + len(data) - 1) // block_size
+        with open(encrypted_filename, "r+b") as file:
+            encrypted_length = file.seek(0, 2)
+            if offset > self.__get_data_length(encrypted_length, block_size, block_letters):
+                raise ValueError("The offset is after the end of the plaintext")
+            position = first_block * (block_letters + 1)
+            file.seek(position)
+            encrypted_data = file.read((last_block - first_block + 1) * (block_letters + 1) - 1)
+            # Decrypt the blocks, replace the bytes, and encrypt them again with the same counters
+            blocks = bytearray(self.decrypt_bytes(encrypted_data.rstrip(b"&"), key, iv, first_block))
+            start = offset - first_block * block_size
+            blocks[start : start + len(data)] = data
+            encrypted_data = self.encrypt_bytes(bytes(blocks), key, iv, first_block)
+            if position > encrypted_length:
+                # The first block is appended after the last complete block, so it needs its &
+                position = encrypted_length
+                encrypted_data = b"&" + encrypted_data
+            file.seek(position)
+            file.write(encrypted_data)
+
+
+    def encrypt(self, filename : str, keys_filename : str = None, encrypted_filename : str = None, workers : int = None):
+        '''
+            Encrypt the plaintext from the textfile provided
+
+            Parameters
+            -------------
+            filename : str
+                It is the filename (with extension) that contains the plaintext
+
+            keys_filename : str
+                It is the filename (with extension) that will store the keys. It is asked if it is not provided.
+
+            encrypted_filename : str
+                It is the filename (with extension) that will store the encrypted text. It is asked if it is not provided.
+
+            workers : int
+                If it is provided, the text is encrypted in a pool of workers processes instead of chunk by chunk
+        '''
+        with open(filename, "r", encoding="utf-8") as reader:
+            # Store the keys needed to decrypt the message
+            keys_filename = keys_filename or input("Input the filename (with extension) that will store the keys: ")
+            write_keys(keys_filename, self.__iv, self.__key)
+
+            encrypted_filename = encrypted_filename or input("Input the filename (with extension) that will store the encrypted text: ")
+            with open(encrypted_filename, "wb") as writer:
+                if workers:
+                    writer.write(self.encrypt_parallel(self.__normalizer.normalize(reader.read()).encode("latin-1"), workers=workers))
+                else:
+                    self.encrypt_stream(reader, writer)
+
+
+    def decrypt(self, encrypted_filename : str, keys_filename : str, decrypted_filename : str = None):
+        '''
+            Decrypt the encrypted text from the textfile provided
+
+            Parameters
+            -------------
+            encrypted_filename : str
+                It is the filename (with extension) that contains the encrypted text
+
+            keys_filename : str
+                It is the filename (with extension) that contains the keys to decrypt the text
+
+            decrypted_filename : str
+                It is the filename (with extension) that will store the decrypted text. It is asked if it is not provided.
+        '''
+        iv, key = read_keys(keys_filename)
+        # Write the decripted text in a textfile
+        decrypted_filename = decrypted_filename or input("Input the filename (with extension) that will store the decrypted text: ")
+        with open(decrypted_filename, "wb") as writer:
+            self.decrypt_stream(encrypted_filename, writer, key, iv)
@@ -0,0 +1,47 @@
+'''
+	Name: main.py
+	Laboratory 3 - Modes of operation
+    Authors: 
+		* María José Salmerón Contreras 
+		* Edgar Alejandro Ramírez Fuentes
+
+    Using Vigenere cipher and CTR Mode encipher and decipher a 500 characters text (English alphabet).
+'''
+
+import os
+import sys
+
+from classes.CTR_Mode import CTR_Mode
+
+# The classes shared by the laboratories of the modes of operation are in ModesOfOperation/classes
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from ModesOfOperation.classes.VigenereMode import read_keys
+
+if __name__ == "__main__":
+    ctr = CTR_Mode()
+    print("Choose the operation you want to do \n1. Encipher textfile \n2. Decipher textfile \n3. Encipher textfile (all the cores) \n4. Decipher a part of the textfile")
+    operation = int(input(""))
+    if operation == 1:
+        filename = input("Input the filename (with extension) that contains the plaintext: ")
+        keys_filename = input("Input the filename (with extension) that will store the keys: ")
+        encrypted_filename = input("Input the filename (with extension) that will store the encrypted text: ")
+        ctr.encrypt(filename, keys_filename, encrypted_filename)
+    elif operation == 2:
+        encrypted_filename = input("Input the filename (with extension) that contains the encrypted text: ")
+        keys_filename = input("Input the filename (with extension) that contains the keys: ")
+        decrypted_filename = input("Input the filename (with extension) that will store the decrypted text: ")
+        ctr.decrypt(encrypted_filename, keys_filename, decrypted_filename)
+    elif operation == 3:
+        filename = input("Input the filename (with extension) that contains the plaintext: ")
+        keys_filename = input("Input the filename (with extension) that will store the keys: ")
+        encrypted_filename = input("Input the filename (with extension) that will store the encrypted text: ")
+        ctr.encrypt(filename, keys_filename, encrypted_filename, workers=os.cpu_count())
+    elif operation == 4:
+        encrypted_filename = input("Input the filename (with extension) that contains the encrypted text: ")
+        keys_filename = input("Input the filename (with extension) that contains the keys: ")
+        offset = int(input("Input the position of the first character: "))
+        length = int(input("Input the number of characters: "))
+        iv, key = read_keys(keys_filename)
+        print(ctr.decrypt_range(encrypted_filename, offset, length, key, iv).decode("latin-1"))
+    else:
+        print("Wrong option")
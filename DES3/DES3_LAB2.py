@@ -2,9 +2,14 @@ from Crypto.Cipher import DES, DES3
 from Crypto.Util.Padding import pad, unpad
 from Crypto.Random import get_random_bytes
 import base64
+import os
 import random
 import sys
 
+# The pipeline of the file encryption is shared with the laboratories of the modes of operation
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from ModesOfOperation.classes.PipelineRunner import PipelineRunner
+
 
 def get_permutation ():
     '''
@@ -219,6 +224,67 @@ def EDE_encryption(data_filename : str):
         sys.exit()
 
 
+def EDE_encryption_pipelined(data_filename : str, buffer_size : int = 1024 * 1024, queue_depth : int = 4):
+    '''
+        Encrypt the content of the desired file like EDE_encryption, but reading, encrypting and writing the file at the same time,
+        so the time of a large file approaches the time of the slowest stage instead of their sum.\n
+        Note: The chunks are encrypted as bytes, so only the ASCII whitespace at the beginning and at the end of the text is removed.
+        Parameters
+        ----------------
+        data_filename : str
+            It is the name of the file that contains the data that will be encrypted
+
+        buffer_size : int
+            It is the number of bytes read each time
+
+        queue_depth : int
+            It is the number of chunks that can wait between two stages
+
+        Return
+        ----------------
+        utilization : dict
+            It is the fraction of the time that the read, compute and write stages were busy
+    '''
+    try:
+        encryption_key = generate_key(24)
+        EDE_cipher = DES3.new(encryption_key, DES3.MODE_ECB)
+        # Text that is not encrypted yet, and a \r at the end of the previous chunk (it could be the beginning of a \r\n)
+        pending = b""
+        carriage_return = b""
+        started = False
+
+        def encrypt_chunk(chunk):
+            nonlocal pending, carriage_return, started
+            if chunk is None:
+                # The padding is added only at the end of the text
+                text = (pending + carriage_return).rstrip()
+                if not started:
+                    text = text.lstrip()
+                return base64.b64encode(EDE_cipher.encrypt(pad(text, 8)))
+            data = carriage_return + bytes(chunk)
+            carriage_return = b"\r" if data.endswith(b"\r") else b""
+            # Translate the newlines like a file opened in text mode
+            text = pending + data[: len(data) - len(carriage_return)].replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+            if not started:
+                text = text.lstrip()
+            # The whitespace at the end of the chunk is kept until it is known whether it is the end of the text.
+            # 24 bytes are 3 DES blocks and 4 base 64 characters, so the encoded chunks can be concatenated
+            length = len(text.rstrip())
+            length -= length % 24
+            pending = text[length:]
+            if length == 0:
+                return b""
+            started = True
+            return base64.b64encode(EDE_cipher.encrypt(text[:length]))
+
+        runner = PipelineRunner(buffer_size, queue_depth)
+        with open(data_filename, mode="rb") as data_file, open(data_filename + ".des", mode="wb") as encrypted_data_file:
+            return runner.run(data_file, encrypted_data_file.write, encrypt_chunk)
+    except (OSError, ValueError) as error:
+        print(f"Something went wrong: {error}")
+        sys.exit()
+
+
 def EDE_decryption(encrypted_data_filename : str, key_filename : str):
     '''
         Decrypt the content of the desired file, get the decryption key from the desired file, and create a file that contains the decrypted data\n
@@ -322,6 +388,13 @@ if __name__ == "__main__":
     print("Your data is being decrypted")
     EDE_decryption(encrypted_text_filename, decryption_key_filename)
 
+    print("\n\nNow let's try to encrypt a large text file using the variant EDE, reading, encrypting and writing it at the same time")
+    plaintext_filenme = input("Enter the filename (adding the .txt extension) that contains the data that will be encrypted: ")
+    print("Your data is being encrypted")
+    utilization = EDE_encryption_pipelined(plaintext_filenme)
+    print("Busy time of every stage: " + ", ".join(f"{stage} {busy:.0%}" for stage, busy in utilization.items()))
+    print("The encrypted data was written in the file with the format filename.txt.des, and it can be decrypted like the previous one")
+
     print("\n\nNow let's try to encrypt a text file using 3DES using the variant EEE")
     plaintext_filenme = input("Enter the filename (adding the .txt extension) that contains the data that will be encrypted: ")
     print("Your data is being encrypted")
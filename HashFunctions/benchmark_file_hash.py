@@ -0,0 +1,86 @@
+'''
+    Hash functions laboratory
+
+    Compare hashing a file read whole (read of the full file, then hash) against hashing it mapped in memory window by
+    window, for the XOR hash and SHA3 512. Every measurement runs in its own process to report its peak resident memory.
+
+    Usage: python benchmark_file_hash.py [--size 1G]
+
+    Authors:
+    - Ramírez Fuentes Edgar Alejandro
+    - Salmerón Contreras María José
+'''
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from Crypto.Hash import SHA3_512
+
+from classes.HashFunction import HashFunction
+from cryptodome_hash import sha3_512_file
+from benchmark_hash import parse_size
+
+
+def read_all_xor(filename : str) -> str:
+    '''
+        Hash a file with the XOR hash reading it whole
+    '''
+    with open(filename, 'rb') as file:
+        return HashFunction(64, file.read()).hexdigest()
+
+
+def read_all_sha3(filename : str) -> str:
+    '''
+        Hash a file with SHA3 512 reading it whole, the way cryptodome_hash.py used to do it
+    '''
+    with open(filename, 'rb') as file:
+        data = file.read()
+    hash = SHA3_512.new()
+    hash.update(data)
+    return hash.hexdigest()
+
+
+METHODS = {
+    "XOR read-all": read_all_xor,
+    "XOR mmap": lambda filename: HashFunction(64).hash_file(filename).hex(),
+    "SHA3 read-all": read_all_sha3,
+    "SHA3 mmap": sha3_512_file,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="File hashing benchmark")
+    parser.add_argument("--size", default="1G", help="File size (1M, 1G, ...)")
+    parser.add_argument("--run", nargs=2, metavar=("METHOD", "FILENAME"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        # Measure a single method in this process
+        method, filename = args.run
+        start = time.perf_counter()
+        digest = METHODS[method](filename)
+        elapsed = time.perf_counter() - start
+        print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, digest)
+        sys.exit()
+
+    size = parse_size(args.size)
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "data.bin")
+        with open(filename, "wb") as file:
+            for _ in range(0, size, 64 * 1024 * 1024):
+                file.write(os.urandom(min(64 * 1024 * 1024, size)))
+            file.truncate(size)
+        print(f"{'method':>13} | {'seconds':>8} | {'MB/s':>8} | {'peak RSS MB':>11}")
+        digests = {}
+        for method in METHODS:
+            output = subprocess.run([sys.executable, __file__, "--run", method, filename], capture_output=True, text=True, check=True).stdout
+            elapsed, peak, digest = output.split()
+            digests.setdefault(method.split()[0], set()).add(digest)
+            # ru_maxrss is in kilobytes on Linux
+            print(f"{method:>13} | {float(elapsed):>8.2f} | {size / (1024 ** 2) / float(elapsed):>8.2f} | {int(peak) / 1024:>11.1f}")
+        assert all(len(digest) == 1 for digest in digests.values())
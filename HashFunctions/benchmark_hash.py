@@ -0,0 +1,68 @@
+'''
+    Hash functions laboratory
+
+    Compare the previous XOR hash (textwrap blocks and a binary string per block) against the NumPy XOR fold,
+    for every block size. The previous hash is only measured over a small text because it is very slow.
+
+    Usage: python benchmark_hash.py [--size 1G] [--legacy-size 1M]
+
+    Authors:
+    - Ramírez Fuentes Edgar Alejandro
+    - Salmerón Contreras María José
+'''
+
+import argparse
+import os
+import textwrap
+import time
+
+from classes.HashFunction import xor_fold
+
+
+def parse_size(size : str) -> int:
+    '''
+        Transform a size like 1K, 1M or 1G into its number of bytes
+    '''
+    multipliers = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    size = size.upper()
+    if size[-1] in multipliers:
+        return int(size[:-1]) * multipliers[size[-1]]
+    return int(size)
+
+
+def legacy_hash(data : str, block_size : int) -> int:
+    '''
+        Hash a text the way HashFunction used to do it
+    '''
+    char_per_block = block_size // 8
+    blocks = textwrap.wrap(data, char_per_block)
+    if len(blocks[-1]) < char_per_block:
+        blocks[-1] += '.' * (char_per_block - len(blocks[-1]))
+    digest = 0
+    for block in blocks:
+        binary_representation = ''
+        for character in block:
+            binary_representation += ('0' * len(format(ord(character), 'b'))) + format(ord(character), 'b')
+        digest ^= int(binary_representation, 2)
+    return digest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="XOR hash benchmark")
+    parser.add_argument("--size", default="1G", help="Data size of the NumPy XOR fold (1M, 1G, ...)")
+    parser.add_argument("--legacy-size", default="1M", help="Text size of the previous hash")
+    args = parser.parse_args()
+
+    size = parse_size(args.size)
+    legacy_size = parse_size(args.legacy_size)
+    data = os.urandom(size)
+    text = data[:legacy_size].decode("latin-1")
+    print(f"{'block size':>10} | {'previous MB/s':>13} | {'XOR fold MB/s':>13} | {'speedup':>9}")
+    for block_size in [8, 16, 32, 64, 128, 512]:
+        start = time.perf_counter()
+        legacy_hash(text, block_size)
+        legacy_speed = legacy_size / (1024 ** 2) / (time.perf_counter() - start)
+        start = time.perf_counter()
+        xor_fold(data, block_size // 8)
+        speed = size / (1024 ** 2) / (time.perf_counter() - start)
+        print(f"{block_size:>10} | {legacy_speed:>13.2f} | {speed:>13.2f} | {speed / legacy_speed:>8.0f}x")
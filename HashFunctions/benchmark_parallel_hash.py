@@ -0,0 +1,48 @@
+'''
+    Hash functions laboratory
+
+    Compare the XOR hash of a file mapped in memory in a single process against the parallel hash, from 1 to N processes.
+
+    Usage: python benchmark_parallel_hash.py [--size 1G] [--block-size 64] [--workers 1 2 4 8]
+
+    Authors:
+    - Ramírez Fuentes Edgar Alejandro
+    - Salmerón Contreras María José
+'''
+
+import argparse
+import os
+import tempfile
+import time
+
+from classes.HashFunction import HashFunction
+from benchmark_hash import parse_size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sequential vs parallel XOR hash")
+    parser.add_argument("--size", default="1G", help="File size (1M, 1G, ...)")
+    parser.add_argument("--block-size", type=int, default=64, help="Block size of the hash function")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4, 8], help="Number of processes to try")
+    args = parser.parse_args()
+
+    size = parse_size(args.size)
+    hash_function = HashFunction(args.block_size)
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "data.bin")
+        with open(filename, "wb") as file:
+            for _ in range(0, size, 64 * 1024 * 1024):
+                file.write(os.urandom(min(64 * 1024 * 1024, size)))
+            file.truncate(size)
+
+        start = time.perf_counter()
+        digest = hash_function.hash_file(filename)
+        sequential = time.perf_counter() - start
+        print(f"{'hash':>12} | {'seconds':>8} | {'MB/s':>9} | {'speedup':>8}")
+        print(f"{'sequential':>12} | {sequential:>8.2f} | {size / (1024 ** 2) / sequential:>9.2f} | {1:>7.2f}x")
+
+        for workers in args.workers:
+            start = time.perf_counter()
+            assert hash_function.hash_file_parallel(filename, workers) == digest
+            elapsed = time.perf_counter() - start
+            print(f"{f'{workers} workers':>12} | {elapsed:>8.2f} | {size / (1024 ** 2) / elapsed:>9.2f} | {sequential / elapsed:>7.2f}x")
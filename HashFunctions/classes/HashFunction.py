@@ -2,21 +2,166 @@
     Hash functions laboratory
 
     Implementation of a hash function using the XOR operation
-    This version only hashes the content of a textfile
+    It hashes the content of a textfile, or any data fed chunk by chunk with update (like hashlib)
 
     Authors:
     - Ramírez Fuentes Edgar Alejandro
     - Salmerón Contreras María José
 '''
 
-import textwrap
+from concurrent.futures import ProcessPoolExecutor
+import mmap
+import os
 import random
+import numpy as np
+
+# Number of bytes of the widest unsigned integer that NumPy XORs natively (uint64)
+LANE_BYTES = 8
+# Number of lanes of the buffer used to fold the blocks of more than 64 bits (1 MB)
+FOLD_LANES = 1 << 17
+# Number of bytes of a file mapped in memory at once (a multiple of mmap.ALLOCATIONGRANULARITY)
+WINDOW_SIZE = 64 * 1024 * 1024
+
+
+def map_file(filename : str, window_size : int = WINDOW_SIZE, offset : int = 0, length : int = None):
+    '''
+        Map a file (or a range of it) in memory window by window, so it is read without copying it and the resident memory
+        is at most a window.\n
+        Every view is released when the next one is generated, so it must not be kept.
+
+        Parameters
+        ----------
+        filename : str
+            It is the filename (with extension) of the file
+
+        window_size : int
+            It is the number of bytes of a window, a multiple of mmap.ALLOCATIONGRANULARITY
+
+        offset : int
+            It is the position of the first byte of the range, a multiple of mmap.ALLOCATIONGRANULARITY
+
+        length : int
+            It is the number of bytes of the range. By default, until the end of the file.
+
+        Returns
+        --------
+        generator[memoryview]
+            It generates the views of the consecutive windows of the file
+    '''
+    if window_size <= 0 or window_size % mmap.ALLOCATIONGRANULARITY != 0 or offset % mmap.ALLOCATIONGRANULARITY != 0:
+        raise ValueError(f"The window size and the offset must be multiples of {mmap.ALLOCATIONGRANULARITY}")
+    with open(filename, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        end = size if length is None else min(offset + length, size)
+        for window_offset in range(offset, end, window_size):
+            with mmap.mmap(file.fileno(), min(window_size, end - window_offset), access=mmap.ACCESS_READ, offset=window_offset) as window:
+                if hasattr(window, 'madvise'):
+                    window.madvise(mmap.MADV_SEQUENTIAL)
+                with memoryview(window) as view:
+                    yield view
+
+
+def fold_rows(rows : np.ndarray) -> np.ndarray:
+    '''
+        XOR the rows of a matrix of 64 bits lanes (a block per row). A reduction over the rows is slow for NumPy, so
+        pairs of row groups are XORed into a buffer that is halved in place until a single row is left.
+
+        Parameters
+        ----------
+        rows : np.ndarray
+            It is the matrix of lanes
+
+        Returns
+        --------
+        folded : np.ndarray
+            It is the XOR of all the rows
+    '''
+    lanes = rows.shape[1]
+    group = max(1, FOLD_LANES // lanes)
+    folded = np.zeros(lanes, dtype=np.uint64)
+    buffer = np.empty((group, lanes), dtype=np.uint64)
+    paired = len(rows) - len(rows) % (2 * group)
+    for start in range(0, paired, 2 * group):
+        np.bitwise_xor(rows[start : start + group], rows[start + group : start + 2 * group], out=buffer)
+        half = group
+        while half > 1:
+            half //= 2
+            np.bitwise_xor(buffer[:half], buffer[half : 2 * half], out=buffer[:half])
+        folded ^= buffer[0]
+    if paired < len(rows):
+        folded ^= np.bitwise_xor.reduce(rows[paired:], axis=0)
+    return folded
+
+
+def xor_fold(data : bytes, block_bytes : int) -> bytes:
+    '''
+        XOR all the blocks of the data. The data is viewed as an array of 64 bits lanes (block_bytes // 8 lanes per row
+        for the blocks of more than 64 bits) and reduced in a single NumPy call, then the lanes are folded to the block size.
+        The last block is padded with '.' if it is incomplete.
+
+        Parameters
+        ----------
+        data : bytes
+            It is the data to be hashed (bytes, bytearray, memoryview or mmap)
+
+        block_bytes : int
+            It is the number of bytes of a block, a power of 2
+
+        Returns
+        --------
+        folded : bytes
+            It is the XOR of all the blocks
+    '''
+    data = np.frombuffer(data, dtype=np.uint8)
+    row_bytes = max(block_bytes, LANE_BYTES)
+    rows = len(data) // row_bytes
+    folded = np.zeros(row_bytes // LANE_BYTES, dtype=np.uint64)
+    if rows:
+        lanes = data[: rows * row_bytes].view(np.uint64)
+        folded = fold_rows(lanes.reshape(rows, -1)) if row_bytes > LANE_BYTES else np.bitwise_xor.reduce(lanes, keepdims=True)
+    # The bytes after the last complete row are less than a row, their last block is padded
+    tail = data[rows * row_bytes :]
+    padded_tail = np.full(-(-len(tail) // block_bytes) * block_bytes, ord("."), dtype=np.uint8)
+    padded_tail[: len(tail)] = tail
+    # A row of 64 bits contains 8 // block_bytes blocks of less than 64 bits
+    blocks = np.concatenate([folded.view(np.uint8).reshape(-1, block_bytes), padded_tail.reshape(-1, block_bytes)])
+    return np.bitwise_xor.reduce(blocks, axis=0).tobytes()
+
+
+def hash_file_range(filename : str, block_size : int, offset : int, length : int) -> bytes:
+    '''
+        Hash a range of a file in a worker process (see HashFunction.hash_file_parallel)
+
+        Parameters
+        ----------
+        filename : str
+            It is the filename (with extension) of the file to be hashed
+
+        block_size : int
+            It is the block size of the hash function
+
+        offset : int
+            It is the position of the first byte of the range
+
+        length : int
+            It is the number of bytes of the range
+
+        Returns
+        --------
+        digest : bytes
+            It is the digest of the range
+    '''
+    hash_function = HashFunction(block_size)
+    for window in map_file(filename, offset=offset, length=length):
+        hash_function.update(window)
+    return hash_function.digest()
+
 
 class HashFunction:
     '''
         Hash function class used to hash only characters contained in the Extended ASCII code
     '''
-    def __init__(self, block_size : int = 8) -> None:
+    def __init__(self, block_size : int = 8, data : bytes = None) -> None:
         '''
             Initialize the HashFunction object
 
@@ -25,6 +170,9 @@ class HashFunction:
             block_size : int
                 It represents the block size and It must be a power of 2. If it is not a power of 2, its value will be 8.
 
+            data : bytes
+                It is the first data to be hashed (see update)
+
         '''
 
         ''' 
@@ -34,6 +182,14 @@ class HashFunction:
             8 = 1000 7 = 0111, 1000 & 0111 = 0000
         '''
         self.__block_size = block_size if block_size >= 8 and ( (block_size & (block_size - 1)) == 0) else 8
+        # The data is folded in rows of whole blocks and 64 bits lanes, the bytes of an incomplete row wait for the next update
+        self.__row_bytes = max(self.__block_size // 8, LANE_BYTES)
+        self.__digest = 0
+        self.__pending = b''
+        # Number of bytes hashed, it gives the padding of the last block for any block size
+        self.__length = 0
+        if data is not None:
+            self.update(data)
 
 
     def get_block_size(self):
@@ -49,7 +205,7 @@ class HashFunction:
         return self.__block_size
 
 
-    def __get_data(self, textfile : str) -> str:
+    def __get_data(self, textfile : str) -> bytes:
         '''
             Get the data contained in the provided textfile
 
@@ -60,97 +216,240 @@ class HashFunction:
             
             Returns
             ---------
-            data : str
-                It is the data contained in the textfile
+            data : bytes
+                It is the data contained in the textfile, a byte per Extended ASCII character
 
         '''
-        with open(textfile, 'r') as file:
+        with open(textfile, 'r', encoding='latin-1') as file:
             data = file.read()
-        return data
+        return data.encode('latin-1')
 
 
-    def hash_data(self, filenme : str) -> None:
+    def update(self, data : bytes) -> None:
         '''
-            Hash the data contained in the textfile using the XOR Operation, and print the digest
+            Hash the next data. The data can be fed in chunks of any size: the bytes of an incomplete block are
+            kept until the next update, so the digest is the same as hashing all the data at once.
 
             Parameters
             ------------
+            data : bytes
+                It is the next data to be hashed (bytes, bytearray, memoryview or mmap)
+        '''
+        data = memoryview(data).cast('B')
+        block_bytes = self.__block_size // 8
+        self.__length += len(data)
+        if self.__pending:
+            # Complete the pending row first
+            missing = self.__row_bytes - len(self.__pending)
+            self.__pending += bytes(data[:missing])
+            data = data[missing:]
+            if len(self.__pending) < self.__row_bytes:
+                return
+            # Each block is a big endian integer (the first character is the most significant byte)
+            self.__digest ^= int.from_bytes(xor_fold(self.__pending, block_bytes), 'big')
+            self.__pending = b''
+        complete = len(data) - len(data) % self.__row_bytes
+        if complete:
+            self.__digest ^= int.from_bytes(xor_fold(data[:complete], block_bytes), 'big')
+        self.__pending = bytes(data[complete:])
 
-            filename : str
-                It is the filename (with extension) that contains the data to be hashed
+
+    def digest(self) -> bytes:
         '''
-        # Get the data from the textfile with padding added if necessary to fulfill the block size
-        data = self.__get_blocks(self.__get_data(filenme))
+            Get the digest of the data hashed so far. The last block is padded with '.', but the hash can still be updated.
 
-        # The resulting digest
-        digest = 0
-        
-        # Process each block of the data to hash it
-        for block in data:
-            digest ^= self.__block_to_bits(block)
-        print("Digest")
-        self.__digest_to_binary(digest)
-        self.__digest_to_hexadecimal(digest)
+            Returns
+            ------------
+            digest : bytes
+                It is the digest (block_size // 8 bytes)
+        '''
+        block_bytes = self.__block_size // 8
+        digest = self.__digest ^ int.from_bytes(xor_fold(self.__pending, block_bytes), 'big')
+        return digest.to_bytes(block_bytes, 'big')
 
 
-    def __block_to_bits(self, block : str):
+    def hexdigest(self) -> str:
         '''
-            Transform a block of characters to its bits representation
-            
+            Get the digest of the data hashed so far as hexadecimal digits
+
+            Returns
+            ------------
+            hexdigest : str
+                It is the digest (block_size // 4 hexadecimal digits)
+        '''
+        return self.digest().hex()
+
+
+    def copy(self):
+        '''
+            Get a copy of the hash, so the digest of data that share a prefix is computed by hashing the prefix once
+
+            Returns
+            ------------
+            hash_function : HashFunction
+                It is a HashFunction object with the same block size and the same data hashed
+        '''
+        hash_function = HashFunction(self.__block_size)
+        hash_function.__digest = self.__digest
+        hash_function.__pending = self.__pending
+        hash_function.__length = self.__length
+        return hash_function
+
+
+    def narrow_digest(self, block_size : int) -> bytes:
+        '''
+            Get the digest of the data hashed so far for a narrower block size, without hashing the data again.
+            A wide block is made of whole narrow blocks, so the narrow digest is the XOR of the narrow blocks of the wide digest.
+            The wide padding has (-length % wide - -length % narrow) // narrow more blocks of '.' than the narrow padding,
+            and an odd number of them is cancelled with another block of '.'.
+
             Parameters
-            -----------
-            block : str 
-                It is the characters contained in the block to be converted to its bits representation
-                
+            ------------
+            block_size : int
+                It is the narrower block size, a power of 2 from 8 to the block size of the hash function
+
             Returns
-            ----------
-            integer_representation : int
-                It is the integer that represents the bits representation
-            
-            
+            ------------
+            digest : bytes
+                It is the digest that a HashFunction with that block size would have
         '''
-        # Store the bits representation in string
-        binary_representation = ''
-        for character in block:
-            # Get the binary representation of the ASCII character value and oncatenate it ot the block bits representation
-            # Add the necesary 0's to complete the 8 bits in the bits representation
-            binary_representation += ('0' * len(format(ord(character), 'b'))) + format(ord(character), 'b')
+        if block_size < 8 or block_size & (block_size - 1) != 0 or block_size > self.__block_size:
+            raise ValueError(f"The block size must be a power of 2 from 8 to {self.__block_size}")
+        block_bytes = block_size // 8
+        digest = xor_fold(self.digest(), block_bytes)
+        extra_blocks = (-self.__length % (self.__block_size // 8) - -self.__length % block_bytes) // block_bytes
+        if extra_blocks % 2:
+            digest = bytes(byte ^ ord('.') for byte in digest)
+        return digest
+
+
+    def digests(self, block_sizes : list) -> dict:
         '''
-            Store the integer value that belongs to the bits representation
-            e.g
-            block = "AB"
-            A = 65 = 1000001
-            B = 66 = 1000010
-            bits representation of the block = 0100000101000010
-            integer = 16706
+            Get the digests of the data hashed so far for many block sizes, from the digest of this block size (the widest)
+
+            Parameters
+            ------------
+            block_sizes : list[int]
+                It is the block sizes, powers of 2 from 8 to the block size of the hash function
+
+            Returns
+            ------------
+            digests : dict
+                It is the digest of every block size
         '''
-        integer_representation = int(binary_representation, 2)
-        return integer_representation
+        return {block_size: self.narrow_digest(block_size) for block_size in block_sizes}
 
 
-    def __get_blocks(self, data : str) -> list:
+    def hash_file(self, filename : str, window_size : int = WINDOW_SIZE) -> bytes:
         '''
-            Divide the data provided in block to process them in the hash function
-            
+            Hash the bytes of a file (of any type, the new lines are not translated) mapped in memory window by window.
+            The windows are folded without copying them, so the memory used does not depend on the size of the file.
+
             Parameters
-            ----------
-            
-            data : str
-                It is the data that will be divided in blocks
-                
+            ------------
+            filename : str
+                It is the filename (with extension) of the file to be hashed
+
+            window_size : int
+                It is the number of bytes of the file mapped in memory at once
+
             Returns
-            --------
-            
-            data : list 
-                It is a list of strings that represent the blocks to be processed in the hash function
-        '''
-        char_per_block = self.__block_size // 8
-        data = textwrap.wrap(data, char_per_block)
-        # Add padding to the last block if necessary
-        if len(data[-1]) < char_per_block:
-            # Concatenate the missing characters to fulfill the blocksize
-            data[-1] += '.' * (char_per_block - len(data[-1]))
-        return data
+            ------------
+            digest : bytes
+                It is the digest of the file
+        '''
+        hash_function = HashFunction(self.__block_size)
+        for window in map_file(filename, window_size):
+            hash_function.update(window)
+        return hash_function.digest()
+
+
+    def hash_file_parallel(self, filename : str, workers : int = None, range_size : int = None) -> bytes:
+        '''
+            Hash the bytes of a file in a pool of processes. The XOR of the blocks is associative and commutative, so the file is
+            divided in ranges of whole blocks, each range is hashed by a worker and the digests of the ranges are XORed.
+            Only the last range can end with an incomplete block, so the digest is the same as hash_file.
+
+            Parameters
+            ------------
+            filename : str
+                It is the filename (with extension) of the file to be hashed
+
+            workers : int
+                It is the number of processes. By default, one per core.
+
+            range_size : int
+                It is the number of bytes hashed by a worker each time. By default, the file is divided in one range per worker.
+
+            Returns
+            ------------
+            digest : bytes
+                It is the digest of the file
+        '''
+        workers = workers or os.cpu_count()
+        size = os.path.getsize(filename)
+        # The ranges start at multiples of the block size and of the granularity of mmap (both are powers of 2)
+        alignment = max(self.__block_size // 8, mmap.ALLOCATIONGRANULARITY)
+        range_size = range_size or -(-size // workers)
+        range_size = max(alignment, -(-range_size // alignment) * alignment)
+        digest = 0
+        with ProcessPoolExecutor(workers) as executor:
+            futures = [executor.submit(hash_file_range, filename, self.__block_size, offset, range_size) for offset in range(0, size, range_size)]
+            for future in futures:
+                digest ^= int.from_bytes(future.result(), 'big')
+        return digest.to_bytes(self.__block_size // 8, 'big')
+
+
+    def hash_data(self, filenme : str) -> bytes:
+        '''
+            Hash the data contained in the textfile using the XOR Operation, and print the digest
+
+            Parameters
+            ------------
+
+            filename : str
+                It is the filename (with extension) that contains the data to be hashed
+
+            Returns
+            ------------
+            digest : bytes
+                It is the digest of the textfile
+        '''
+        digest = HashFunction(self.__block_size, self.__get_data(filenme)).digest()
+        print("Digest")
+        self.__digest_to_binary(int.from_bytes(digest, 'big'))
+        self.__digest_to_hexadecimal(int.from_bytes(digest, 'big'))
+        return digest
+
+
+    def hash_data_widths(self, filenme : str, block_sizes : list) -> dict:
+        '''
+            Hash the data contained in the textfile for many block sizes reading and folding it once with this block size
+            (the widest), and print the digests
+
+            Parameters
+            ------------
+            filename : str
+                It is the filename (with extension) that contains the data to be hashed
+
+            block_sizes : list[int]
+                It is the block sizes, powers of 2 from 8 to the block size of the hash function
+
+            Returns
+            ------------
+            digests : dict
+                It is the digest of the textfile for every block size
+        '''
+        digests = HashFunction(self.__block_size, self.__get_data(filenme)).digests(block_sizes)
+        for index, (block_size, digest) in enumerate(digests.items()):
+            # Print the digest with the representation of its block size
+            printer = HashFunction(block_size)
+            if index:
+                print()
+            print(f"Block size: {block_size}\nDigest")
+            printer.__digest_to_binary(int.from_bytes(digest, 'big'))
+            printer.__digest_to_hexadecimal(int.from_bytes(digest, 'big'))
+        return digests
 
 
     def __digest_to_hexadecimal(self, digest : int) -> None:
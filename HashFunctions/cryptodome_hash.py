@@ -10,20 +10,37 @@
 
 from Crypto.Hash import SHA3_512
 
-if __name__ == '__main__':
-    
-    # Hashing an image
-    with open('./images/meme.jpg', "rb") as image:
-        meme_bytes = image.read()
+from classes.HashFunction import map_file, WINDOW_SIZE
+
+
+def sha3_512_file(filename : str, window_size : int = WINDOW_SIZE) -> str:
+    '''
+        Hash the bytes of a file with SHA3 512. The file is mapped in memory window by window and every window is
+        passed to update without copying it, so the memory used does not depend on the size of the file.
+
+        Parameters
+        ----------
+        filename : str
+            It is the filename (with extension) of the file to be hashed
 
+        window_size : int
+            It is the number of bytes of the file mapped in memory at once
+
+        Returns
+        --------
+        hexdigest : str
+            It is the digest of the file
+    '''
     hash = SHA3_512.new()
-    hash.update(meme_bytes)
-    print(f"Image digest: {hash.hexdigest()}")
+    for window in map_file(filename, window_size):
+        hash.update(window)
+    return hash.hexdigest()
+
 
-    # Hashing a textfile
-    with open('./textfiles/data.txt', 'r') as textfile:
-        textfile_bytes = bytes(textfile.read(), 'utf-8')
+if __name__ == '__main__':
     
-    hash2 = SHA3_512.new()
-    hash2.update(textfile_bytes)
-    print(f"Textfile digest: {hash2.hexdigest()}")
\ No newline at end of file
+    # Hashing an image
+    print(f"Image digest: {sha3_512_file('./images/meme.jpg')}")
+
+    # Hashing a textfile (its bytes, like the image)
+    print(f"Textfile digest: {sha3_512_file('./textfiles/data.txt')}")
\ No newline at end of file
@@ -12,22 +12,9 @@ import base64
 from classes.HashFunction import HashFunction
 
 if __name__ == "__main__":
-    print("Block size: 8")
-    hash1 = HashFunction(8)
-    hash1.hash_data("./textfiles/data.txt")
-
-    print("\nBlock size: 16")
-    hash2 = HashFunction(16)
-    hash2.hash_data("./textfiles/data.txt")
-
-    print("\nBlock size: 32")
-    hash3 = HashFunction(32)
-    hash3.hash_data("./textfiles/data.txt")
-    
-    # If the block size is not a power of 2, the default block size is 8
-    print("\nBlock size: 64")
-    hash4 = HashFunction(64)
-    hash4.hash_data("./textfiles/data.txt")
+    # The data is read and folded once with the widest block size, the narrower digests are derived from its digest
+    hash_function = HashFunction(64)
+    hash_function.hash_data_widths("./textfiles/data.txt", [8, 16, 32, 64])
     '''
     data = ['AB', 'CD']
     digest = [0 for i in range(len(data[0]))]
@@ -0,0 +1,84 @@
+'''
+    Hash functions laboratory
+
+    Tests of the XOR hash: the digests of data.txt, the padding of the last block against a pure Python fold,
+    and the agreement of update, copy, hash_file and hash_file_parallel.
+
+    Usage: python -m pytest test_hash_function.py
+
+    Authors:
+    - Ramírez Fuentes Edgar Alejandro
+    - Salmerón Contreras María José
+'''
+
+import os
+import random
+
+import pytest
+
+from classes.HashFunction import HashFunction
+
+DATA_FILENAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "textfiles", "data.txt")
+BLOCK_SIZES = [8, 16, 32, 64, 128, 256, 512, 1024]
+# Lengths around the 64 bits lanes and the widest block, so every kind of tail is padded
+LENGTHS = [0, 1, 7, 8, 9, 63, 64, 65, 127, 128, 129, 1000, 4096 + 3]
+
+
+def reference_hash(data : bytes, block_size : int) -> bytes:
+    '''
+        Hash the data block by block in pure Python: the last block is padded with '.' and every block is XORed as a big endian integer
+    '''
+    block_bytes = block_size // 8
+    data = data + b'.' * (-len(data) % block_bytes)
+    digest = 0
+    for start in range(0, len(data), block_bytes):
+        digest ^= int.from_bytes(data[start : start + block_bytes], 'big')
+    return digest.to_bytes(block_bytes, 'big')
+
+
+@pytest.mark.parametrize("block_size, expected", [(8, "5c"), (16, "6614"), (32, "66422e78"), (64, "0f4a76694726763f")])
+def test_data_digests(block_size, expected, capsys):
+    assert HashFunction(block_size).hash_data(DATA_FILENAME).hex() == expected
+    assert HashFunction(64).hash_data_widths(DATA_FILENAME, [block_size])[block_size].hex() == expected
+
+
+@pytest.mark.parametrize("block_size", BLOCK_SIZES)
+@pytest.mark.parametrize("length", LENGTHS)
+def test_padding(block_size, length):
+    data = random.Random(length).randbytes(length)
+    assert HashFunction(block_size, data).digest() == reference_hash(data, block_size)
+
+
+@pytest.mark.parametrize("block_size", BLOCK_SIZES)
+def test_narrow_digests(block_size):
+    data = random.Random(block_size).randbytes(1000)
+    narrow_sizes = [size for size in BLOCK_SIZES if size <= block_size]
+    digests = HashFunction(block_size, data).digests(narrow_sizes)
+    assert digests == {size: reference_hash(data, size) for size in narrow_sizes}
+
+
+@pytest.mark.parametrize("block_size", BLOCK_SIZES)
+def test_update_and_copy(block_size):
+    generator = random.Random(block_size)
+    prefix, first, second = generator.randbytes(1001), generator.randbytes(77), generator.randbytes(130)
+    hash_function = HashFunction(block_size)
+    # Chunks of uneven sizes, so the pending row is completed across updates
+    for start in range(0, len(prefix), 13):
+        hash_function.update(prefix[start : start + 13])
+    other = hash_function.copy()
+    hash_function.update(first)
+    other.update(second)
+    assert hash_function.digest() == reference_hash(prefix + first, block_size)
+    assert other.digest() == reference_hash(prefix + second, block_size)
+
+
+@pytest.mark.parametrize("block_size", [8, 64, 1024])
+@pytest.mark.parametrize("size", [0, 5, 2 * 65536 + 3])
+def test_hash_file(block_size, size, tmp_path):
+    data = random.Random(size).randbytes(size)
+    filename = tmp_path / "data.bin"
+    filename.write_bytes(data)
+    hash_function = HashFunction(block_size)
+    digest = HashFunction(block_size, data).digest()
+    assert hash_function.hash_file(filename, window_size=65536) == digest
+    assert hash_function.hash_file_parallel(filename, workers=2, range_size=65536) == digest
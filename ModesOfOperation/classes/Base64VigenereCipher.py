@@ -0,0 +1,175 @@
+'''
+	Name: Base64VigenereCipher.py
+	Laboratory 3 - Modes of operation
+    Authors:
+		* María José Salmerón Contreras
+		* Edgar Alejandro Ramírez Fuentes
+
+    Vigenere cipher over base 64 letters (shift modulo 64) used as a block cipher: the key starts again at every block.
+    It is the cipher of the CBC, CFB and CTR laboratories, whose blocks are encoded with the Base64Transform.
+'''
+
+from .BlockCipher import BlockCipher
+from .BlockTransform import BASE64_ALPHABET
+
+# Translation tables between the letters and their values (the other bytes are not letters)
+LETTER_TO_VALUE = bytes.maketrans(BASE64_ALPHABET, bytes(range(len(BASE64_ALPHABET))))
+VALUE_TO_LETTER = bytes.maketrans(bytes(range(len(BASE64_ALPHABET))), BASE64_ALPHABET)
+
+
+class Base64VigenereCipher(BlockCipher):
+    '''
+        This class is used to encrypt/decrypt blocks of base 64 letters (ASCII encoded) using the Vigenere cipher
+    '''
+    # Translation tables shared by every instance, indexed by shift
+    __shift_tables = dict()
+
+    def __init__(self, key : str, block_size : int = None):
+        '''
+            Initialize the Base64VigenereCipher object
+
+            Parameters
+            --------------
+            key : str
+                It is the key, each letter is a shift (bytes are read as ASCII letters)
+
+            block_size : int
+                It is the number of letters of a block. By default, the length of the key.
+        '''
+        if isinstance(key, str):
+            key = key.encode("ascii")
+        if not key:
+            raise ValueError("The key must contain at least one letter")
+        if bytes(key).translate(None, BASE64_ALPHABET):
+            raise ValueError("The key contains characters that do not belong to the base 64 alphabet")
+        super().__init__(block_size or len(key))
+        self.key = bytes(key)
+        # Shift of each position of a block
+        shifts = bytes(self.key[position % len(self.key)] for position in range(self.block_size)).translate(LETTER_TO_VALUE)
+        # A letter value only has 6 bits, so the key (and its opposite modulo 64) packed in an integer
+        # is added to every value of a block without carrying to the next byte
+        self.__packed_key = int.from_bytes(shifts, "big")
+        self.__negative_packed_key = int.from_bytes(bytes(-shift % 64 for shift in shifts), "big")
+        self.__value_bits = int.from_bytes(b"\x3f" * self.block_size, "big")
+        self.__encryption_tables = [self.__get_table(shift) for shift in shifts]
+        self.__decryption_tables = [self.__get_table(-shift % 64) for shift in shifts]
+
+
+    def __get_table(self, shift : int):
+        '''
+            Get the translation table that shifts every letter.\n
+            The tables only depend on the shift, so they are built once and shared by every instance.
+
+            Parameters
+            --------------
+            shift : int
+                It is the shift (from 0 to 63)
+
+            Returns
+            --------------
+            bytes
+                It is the translation table (for bytes.translate)
+        '''
+        table = Base64VigenereCipher.__shift_tables.get(shift)
+        if table is None:
+            table = bytes.maketrans(BASE64_ALPHABET, BASE64_ALPHABET[shift:] + BASE64_ALPHABET[:shift])
+            Base64VigenereCipher.__shift_tables[shift] = table
+        return table
+
+
+    def encrypt_block(self, block : bytes):
+        '''
+            Encrypt a single block: the values of the letters are read as an integer (a byte each) and the key is added at once
+
+            Parameters
+            --------------
+            block : bytes
+                It is the block (block_size letters) that will be encrypted
+
+            Returns
+            --------------
+            bytes
+                It is the encrypted block
+        '''
+        block = (int.from_bytes(block.translate(LETTER_TO_VALUE), "big") + self.__packed_key) & self.__value_bits
+        return block.to_bytes(self.block_size, "big").translate(VALUE_TO_LETTER)
+
+
+    def decrypt_block(self, block : bytes):
+        '''
+            Decrypt a single block: subtracting the key modulo 64 is adding its opposite
+
+            Parameters
+            --------------
+            block : bytes
+                It is the encrypted block (block_size letters) that will be decrypted
+
+            Returns
+            --------------
+            bytes
+                It is the decrypted block
+        '''
+        block = (int.from_bytes(block.translate(LETTER_TO_VALUE), "big") + self.__negative_packed_key) & self.__value_bits
+        return block.to_bytes(self.block_size, "big").translate(VALUE_TO_LETTER)
+
+
+    def __translate(self, data : bytes, tables : list):
+        '''
+            Shift every letter using the table of its position in the block.\n
+            Each position is processed as a whole strided slice, so the letters are transformed in block_size calls.
+
+            Parameters
+            --------------
+            data : bytes
+                It is the concatenation of the blocks
+
+            tables : list[bytes]
+                It is the translation table of each position
+
+            Returns
+            --------------
+            bytes
+                It is the concatenation of the transformed blocks
+        '''
+        data = bytes(data)
+        # Every letter must belong to the base 64 alphabet
+        if data.translate(None, BASE64_ALPHABET):
+            raise ValueError("The text contains characters that do not belong to the base 64 alphabet")
+        result = bytearray(len(data))
+        for position in range(self.block_size):
+            result[position :: self.block_size] = data[position :: self.block_size].translate(tables[position])
+        return bytes(result)
+
+
+    def encrypt_blocks(self, data : bytes):
+        '''
+            Encrypt many blocks at once
+
+            Parameters
+            --------------
+            data : bytes
+                It is the concatenation of the blocks (its length is a multiple of block_size)
+
+            Returns
+            --------------
+            bytes
+                It is the concatenation of the encrypted blocks
+        '''
+        return self.__translate(data, self.__encryption_tables)
+
+
+    def decrypt_blocks(self, data : bytes):
+        '''
+            Decrypt many blocks at once
+
+            Parameters
+            --------------
+            data : bytes
+                It is the concatenation of the encrypted blocks (its length is a multiple of block_size)
+
+            Returns
+            --------------
+            bytes
+                It is the concatenation of the decrypted blocks
+        '''
+        return self.__translate(data, self.__decryption_tables)
@@ -0,0 +1,99 @@
+'''
+	Name: BlockCipher.py
+	Laboratory 3 - Modes of operation
+    Authors:
+		* María José Salmerón Contreras
+		* Edgar Alejandro Ramírez Fuentes
+
+    Common interface of the block ciphers used by the modes of operation.
+'''
+
+from abc import ABC, abstractmethod
+
+
+class BlockCipher(ABC):
+    '''
+        Base class of a block cipher: a permutation of blocks of block_size bytes chosen by a key.\n
+        A block cipher only has to implement encrypt_block and decrypt_block; encrypt_blocks and decrypt_blocks
+        (many blocks in one call, like ECB) should be overridden when the cipher can process them faster.
+    '''
+    def __init__(self, block_size : int):
+        '''
+            Initialize the BlockCipher object
+
+            Parameters
+            --------------
+            block_size : int
+                It is the number of bytes of a block
+        '''
+        self.block_size = block_size
+
+
+    @abstractmethod
+    def encrypt_block(self, block : bytes):
+        '''
+            Encrypt a single block
+
+            Parameters
+            --------------
+            block : bytes
+                It is the block (block_size bytes) that will be encrypted
+
+            Returns
+            --------------
+            bytes
+                It is the encrypted block
+        '''
+
+
+    @abstractmethod
+    def decrypt_block(self, block : bytes):
+        '''
+            Decrypt a single block
+
+            Parameters
+            --------------
+            block : bytes
+                It is the encrypted block (block_size bytes) that will be decrypted
+
+            Returns
+            --------------
+            bytes
+                It is the decrypted block
+        '''
+
+
+    def encrypt_blocks(self, data : bytes):
+        '''
+            Encrypt many blocks independently of each other
+
+            Parameters
+            --------------
+            data : bytes
+                It is the concatenation of the blocks (its length is a multiple of block_size)
+
+            Returns
+            --------------
+            bytes
+                It is the concatenation of the encrypted blocks
+        '''
+        data = memoryview(data)
+        return b"".join(self.encrypt_block(data[index : index + self.block_size]) for index in range(0, len(data), self.block_size))
+
+
+    def decrypt_blocks(self, data : bytes):
+        '''
+            Decrypt many blocks independently of each other
+
+            Parameters
+            --------------
+            data : bytes
+                It is the concatenation of the encrypted blocks (its length is a multiple of block_size)
+
+            Returns
+            --------------
+            bytes
+                It is the concatenation of the decrypted blocks
+        '''
+        data = memoryview(data)
+        return b"".join(self.decrypt_block(data[index : index + self.block_size]) for index in range(0, len(data), self.block_size))
@@ -0,0 +1,141 @@
+'''
+	Name: BlockTransform.py
+	Laboratory 3 - Modes of operation
+    Authors:
+		* María José Salmerón Contreras
+		* Edgar Alejandro Ramírez Fuentes
+
+    Encodings of the encrypted blocks used by the modes of operation.
+    A transform maps every block of block_size bytes to encoded_size symbols of its alphabet, so an encrypted block
+    can be wider than the plaintext block (for example, 10 bytes are 14 base 64 letters).
+'''
+
+import base64
+import binascii
+
+import numpy as np
+
+# Letters of the base 64 alphabet, in the order of their values
+BASE64_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+
+
+class BlockTransform:
+    '''
+        Identity transform: the encrypted blocks are raw bytes, so every block keeps its block_size bytes
+    '''
+    # Symbols of the encoded blocks, None for raw bytes
+    alphabet = None
+
+    def __init__(self, block_size : int):
+        '''
+            Initialize the BlockTransform object
+
+            Parameters
+            --------------
+            block_size : int
+                It is the number of bytes of a plaintext block
+        '''
+        self.block_size = block_size
+        self.encoded_size = block_size
+
+
+    def encode_block(self, block : bytes):
+        '''
+            Encode a single complete block
+
+            Parameters
+            --------------
+            block : bytes
+                It is the block (block_size bytes) that will be encoded
+
+            Returns
+            --------------
+            bytes
+                It is the encoded block (encoded_size symbols)
+        '''
+        return block
+
+
+    def encode(self, data : bytes):
+        '''
+            Encode consecutive blocks (only the last one can be incomplete)
+
+            Parameters
+            --------------
+            data : bytes
+                It is the concatenation of the blocks
+
+            Returns
+            --------------
+            bytes
+                It is the concatenation of the encoded blocks
+        '''
+        return bytes(data)
+
+
+    def decode(self, data : bytes):
+        '''
+            Decode consecutive encoded blocks (only the last one can be incomplete)
+
+            Parameters
+            --------------
+            data : bytes
+                It is the concatenation of the encoded blocks
+
+            Returns
+            --------------
+            bytes
+                It is the concatenation of the decoded blocks
+        '''
+        return bytes(data)
+
+
+class Base64Transform(BlockTransform):
+    '''
+        Base 64 transform: every block is encoded in base 64 without the = padding, so a block of block_size bytes
+        always has ceil(8 * block_size / 6) letters and the blocks can be split without separators
+    '''
+    alphabet = BASE64_ALPHABET
+
+    def __init__(self, block_size : int):
+        '''
+            Initialize the Base64Transform object
+
+            Parameters
+            --------------
+            block_size : int
+                It is the number of bytes of a plaintext block
+        '''
+        super().__init__(block_size)
+        self.encoded_size = -(-block_size * 8 // 6)
+
+
+    def encode_block(self, block : bytes):
+        return binascii.b2a_base64(block, newline=False)[: self.encoded_size]
+
+
+    def encode(self, data : bytes):
+        count = len(data) // self.block_size
+        encoded = b""
+        if count:
+            # Complete every block with zero bytes to a multiple of 3 bytes, so all of them are encoded at once
+            padded = np.zeros((count, self.block_size + (-self.block_size % 3)), dtype=np.uint8)
+            padded[:, : self.block_size] = np.frombuffer(data, dtype=np.uint8, count=count * self.block_size).reshape(count, self.block_size)
+            encoded = np.frombuffer(base64.standard_b64encode(padded.tobytes()), dtype=np.uint8).reshape(count, -1)[:, : self.encoded_size].tobytes()
+        if count * self.block_size < len(data):
+            encoded += base64.standard_b64encode(data[count * self.block_size :]).rstrip(b"=")
+        return encoded
+
+
+    def decode(self, data : bytes):
+        count = len(data) // self.encoded_size
+        decoded = b""
+        if count:
+            # Complete every block with A (zero bits) to a multiple of 4 letters, so all of them are decoded at once
+            padded = np.full((count, self.encoded_size + (-self.encoded_size % 4)), ord("A"), dtype=np.uint8)
+            padded[:, : self.encoded_size] = np.frombuffer(data, dtype=np.uint8, count=count * self.encoded_size).reshape(count, self.encoded_size)
+            decoded = np.frombuffer(base64.b64decode(padded.tobytes(), validate=True), dtype=np.uint8).reshape(count, -1)[:, : self.block_size].tobytes()
+        if count * self.encoded_size < len(data):
+            last_block = bytes(data[count * self.encoded_size :])
+            decoded += base64.b64decode(last_block + b"=" * (-len(last_block) % 4), validate=True)
+        return decoded
@@ -0,0 +1,119 @@
+'''
+	Name: ByteVigenereCipher.py
+	Laboratory 3 - Modes of operation
+    Authors:
+		* María José Salmerón Contreras
+		* Edgar Alejandro Ramírez Fuentes
+
+    Vigenere cipher over raw bytes (shift modulo 256) used as a block cipher: the key starts again at every block.
+'''
+
+import numpy as np
+
+from .BlockCipher import BlockCipher
+
+class ByteVigenereCipher(BlockCipher):
+    '''
+        This class is used to encrypt/decrypt blocks of raw bytes using the Vigenere cipher (shift modulo 256)
+    '''
+    def __init__(self, key : bytes, block_size : int = None):
+        '''
+            Initialize the ByteVigenereCipher object
+
+            Parameters
+            --------------
+            key : bytes
+                It is the key, each byte is a shift (a str is encoded as ASCII)
+
+            block_size : int
+                It is the number of bytes of a block. By default, the length of the key.
+        '''
+        if isinstance(key, str):
+            key = key.encode("ascii")
+        if not key:
+            raise ValueError("The key must contain at least one byte")
+        super().__init__(block_size or len(key))
+        self.key = bytes(key)
+        # Shift of each position of a block
+        self.__shifts = np.frombuffer(self.key, dtype=np.uint8)[np.arange(self.block_size) % len(self.key)]
+        # The key (and its opposite modulo 256) packed in an integer, split in the highest bit of every byte and the other 7 bits
+        packed_key = int.from_bytes(self.__shifts.tobytes(), "big")
+        negative_packed_key = int.from_bytes((-self.__shifts).tobytes(), "big")
+        self.__high_bits = int.from_bytes(b"\x80" * self.block_size, "big")
+        self.__low_bits = int.from_bytes(b"\x7f" * self.block_size, "big")
+        self.__key_high_bits = packed_key & self.__high_bits
+        self.__key_low_bits = packed_key & self.__low_bits
+        self.__negative_key_high_bits = negative_packed_key & self.__high_bits
+        self.__negative_key_low_bits = negative_packed_key & self.__low_bits
+
+
+    def encrypt_block(self, block : bytes):
+        '''
+            Encrypt a single block: the block is read as an integer and the key is added to each byte without carrying to the next one
+
+            Parameters
+            --------------
+            block : bytes
+                It is the block (block_size bytes) that will be encrypted
+
+            Returns
+            --------------
+            bytes
+                It is the encrypted block
+        '''
+        block = int.from_bytes(block, "big")
+        block = ((block & self.__low_bits) + self.__key_low_bits) ^ (block & self.__high_bits) ^ self.__key_high_bits
+        return block.to_bytes(self.block_size, "big")
+
+
+    def decrypt_block(self, block : bytes):
+        '''
+            Decrypt a single block: subtracting the key modulo 256 is adding its opposite
+
+            Parameters
+            --------------
+            block : bytes
+                It is the encrypted block (block_size bytes) that will be decrypted
+
+            Returns
+            --------------
+            bytes
+                It is the decrypted block
+        '''
+        block = int.from_bytes(block, "big")
+        block = ((block & self.__low_bits) + self.__negative_key_low_bits) ^ (block & self.__high_bits) ^ self.__negative_key_high_bits
+        return block.to_bytes(self.block_size, "big")
+
+
+    def encrypt_blocks(self, data : bytes):
+        '''
+            Encrypt many blocks at once: the data is seen as a matrix with a row per block, and every row is shifted with uint8 arithmetic
+
+            Parameters
+            --------------
+            data : bytes
+                It is the concatenation of the blocks (its length is a multiple of block_size)
+
+            Returns
+            --------------
+            bytes
+                It is the concatenation of the encrypted blocks
+        '''
+        return (np.frombuffer(data, dtype=np.uint8).reshape(-1, self.block_size) + self.__shifts).tobytes()
+
+
+    def decrypt_blocks(self, data : bytes):
+        '''
+            Decrypt many blocks at once
+
+            Parameters
+            --------------
+            data : bytes
+                It is the concatenation of the encrypted blocks (its length is a multiple of block_size)
+
+            Returns
+            --------------
+            bytes
+                It is the concatenation of the decrypted blocks
+        '''
+        return (np.frombuffer(data, dtype=np.uint8).reshape(-1, self.block_size) - self.__shifts).tobytes()
@@ -0,0 +1,425 @@
+'''
+	Name: CipherContainer.py
+	Laboratory 3 - Modes of operation
+    Authors:
+		* María José Salmerón Contreras
+		* Edgar Alejandro Ramírez Fuentes
+
+    Binary container that stores the blocks encrypted by CBC_Mode and CFB_Mode (shared by both laboratories).
+
+    Layout (big endian):
+        header  : magic "VGMC", version, mode, block transform, block size, record size, key id (8 bytes), block count, IV length, IV
+        records : block count fixed-size records, each one is an encrypted block: base 64 letters packed in 6 bits per letter,
+                  or the raw encrypted bytes for the byte Vigenere cipher
+        index   : offset of the record of every INDEX_INTERVAL-th block (8 bytes each)
+        footer  : index offset, block count, index interval, magic "VGMI"
+'''
+
+import base64
+import hashlib
+import math
+import mmap
+import struct
+
+import numpy as np
+
+
+HEADER = struct.Struct(">4sBBBHH8sQH")
+# The first version has no block transform field (every block is base 64)
+HEADER_VERSION_1 = struct.Struct(">4sBBHH8sQH")
+FOOTER = struct.Struct(">QQI4s")
+MAGIC = b"VGMC"
+FOOTER_MAGIC = b"VGMI"
+VERSION = 2
+MODES = {"CBC": 1, "CFB": 2}
+TRANSFORMS = {"base64": 1, "bytes": 2}
+INDEX_INTERVAL = 65536
+
+
+def get_key_id(key : str):
+    '''
+        Get the identifier of a key, so the container tells which key was used without storing it
+
+        Parameters
+        --------------
+        key : str
+            It is the key used for Vigenere cipher
+
+        Returns
+        --------------
+        bytes
+            It is the first 8 bytes of the SHA-256 digest of the key
+    '''
+    return hashlib.sha256(key.encode("utf-8")).digest()[:8]
+
+
+def get_block_letters(block_size : int):
+    '''
+        Get the number of base 64 letters of an encrypted block (without the = padding)
+
+        Parameters
+        --------------
+        block_size : int
+            It is the number of bytes of a plaintext block
+
+        Returns
+        --------------
+        int
+            It is the number of letters of the encrypted block
+    '''
+    return math.ceil(block_size * 8 / 6)
+
+
+def get_block_length(block_size : int, transform : str):
+    '''
+        Get the length of an encrypted block
+
+        Parameters
+        --------------
+        block_size : int
+            It is the number of bytes of a plaintext block
+
+        transform : str
+            It is the block transform: base64 (Vigenere cipher over base 64 letters) or bytes (Vigenere cipher over raw bytes)
+
+        Returns
+        --------------
+        int
+            It is the number of letters (base64) or bytes (bytes) of the encrypted block
+    '''
+    if transform not in TRANSFORMS:
+        raise ValueError(f"The block transform must be one of {', '.join(TRANSFORMS)}")
+    return get_block_letters(block_size) if transform == "base64" else block_size
+
+
+class CipherContainerWriter:
+    '''
+        Class used to write encrypted blocks in a binary container
+    '''
+    def __init__(self, writer, mode : str, block_size : int, iv : str, key : str, transform : str = "base64", append : bool = False):
+        '''
+            Write the header of the container, or open an existing container to append blocks to it
+
+            Parameters
+            --------------
+            writer : file object
+                It is the file object (opened in binary mode) where the container is written
+
+            mode : str
+                It is the mode of operation (CBC or CFB)
+
+            block_size : int
+                It is the number of bytes of a plaintext block
+
+            iv : str
+                It is the initialization vector
+
+            key : str
+                It is the key used for Vigenere cipher (only its identifier is stored)
+
+            transform : str
+                It is the block transform used to encrypt the blocks (base64 or bytes)
+
+            append : bool
+                If it is True, the writer (opened in r+b mode at the beginning of the container) contains a container with the same
+                mode, block size, iv, key and transform: its index and footer are removed and the new blocks are written after its records.
+                If a write fails inside a with block, the previous index and footer are restored.
+        '''
+        self.__writer = writer
+        self.__transform = transform
+        self.__letters = get_block_length(block_size, transform)
+        self.__record_size = math.ceil(self.__letters * 6 / 8) if transform == "base64" else block_size
+        self.__block_count = 0
+        self.__index = []
+        # Position and bytes of the index and footer removed to append blocks, restored if a write fails
+        self.__tail = None
+        self.__start = writer.tell() if writer.seekable() else 0
+        iv = iv.encode("ascii")
+        self.__header = [MAGIC, VERSION, MODES[mode], TRANSFORMS[transform], block_size, self.__record_size, get_key_id(key), 0, len(iv)]
+        self.__data_offset = HEADER.size + len(iv)
+        if append:
+            self.__open_for_append(iv)
+        else:
+            writer.write(HEADER.pack(*self.__header) + iv)
+
+
+    def __open_for_append(self, iv : bytes):
+        '''
+            Read the header, the footer and the index of the container, and remove the index and the footer so the next records
+            are written after the last one. Only the tail of the container is read, the records are not.
+
+            Parameters
+            --------------
+            iv : bytes
+                It is the initialization vector that the container must have
+        '''
+        header = HEADER.unpack(self.__writer.read(HEADER.size))
+        if header[0] != MAGIC or header[1] != VERSION:
+            raise ValueError(f"Only containers of version {VERSION} can be appended")
+        if header[2:7] != tuple(self.__header[2:7]) or header[8] != len(iv) or self.__writer.read(len(iv)) != iv:
+            raise ValueError("The container was not encrypted with the same mode, block transform, key and initialization vector")
+        end = self.__writer.seek(0, 2)
+        self.__writer.seek(end - FOOTER.size)
+        index_offset, block_count, index_interval, footer_magic = FOOTER.unpack(self.__writer.read(FOOTER.size))
+        if footer_magic != FOOTER_MAGIC or index_interval != INDEX_INTERVAL:
+            raise ValueError("The container is incomplete")
+        index_length = -(-block_count // INDEX_INTERVAL)
+        self.__writer.seek(self.__start + index_offset)
+        self.__index = list(struct.unpack(f">{index_length}Q", self.__writer.read(index_length * 8)))
+        self.__block_count = block_count
+        self.__writer.seek(self.__start + index_offset)
+        self.__tail = (self.__start + index_offset, self.__writer.read())
+        self.__writer.seek(self.__start + index_offset)
+        self.__writer.truncate()
+
+
+    def __restore(self):
+        '''
+            Remove the blocks appended and write back the index and the footer of the container, so it is as it was before
+        '''
+        position, tail = self.__tail
+        self.__writer.seek(position)
+        self.__writer.truncate()
+        self.__writer.write(tail)
+
+
+    def write_blocks(self, blocks : list):
+        '''
+            Pack the encrypted blocks and write them as records
+
+            Parameters
+            --------------
+            blocks : list[bytes]
+                It is the list of encrypted blocks (base 64 letters without the = padding, or raw bytes)
+        '''
+        for block in blocks:
+            if len(block) != self.__letters:
+                raise ValueError(f"Every encrypted block must have a length of {self.__letters}")
+        self.write_letters(b"".join(blocks))
+
+
+    def write_letters(self, letters : bytes):
+        '''
+            Pack many encrypted blocks at once and write them as records
+
+            Parameters
+            --------------
+            letters : bytes
+                It is the concatenation of the encrypted blocks (base 64 letters without the = padding, or raw bytes)
+        '''
+        if len(letters) % self.__letters != 0:
+            raise ValueError(f"Every encrypted block must have a length of {self.__letters}")
+        count = len(letters) // self.__letters
+        if count == 0:
+            return
+        # Offset of the record of every INDEX_INTERVAL-th block
+        first_indexed = -(-self.__block_count // INDEX_INTERVAL) * INDEX_INTERVAL
+        for block in range(first_indexed, self.__block_count + count, INDEX_INTERVAL):
+            self.__index.append(self.__data_offset + block * self.__record_size)
+        if self.__transform == "bytes":
+            # The raw encrypted blocks are the records
+            self.__writer.write(letters)
+            self.__block_count += count
+            return
+        # Complete every block with A (zero bits) to a multiple of 4 letters, so all of them are decoded from base 64 at once
+        padded = np.full((count, self.__letters + (-self.__letters % 4)), ord("A"), dtype=np.uint8)
+        padded[:, : self.__letters] = np.frombuffer(letters, dtype=np.uint8).reshape(count, self.__letters)
+        records = np.frombuffer(base64.standard_b64decode(padded.tobytes()), dtype=np.uint8).reshape(count, -1)
+        self.__writer.write(records[:, : self.__record_size].tobytes())
+        self.__block_count += count
+
+
+    def write(self, letters : bytes):
+        '''
+            Write many encrypted blocks (see write_letters), so the container can be the writer of a mode of operation
+
+            Parameters
+            --------------
+            letters : bytes
+                It is the concatenation of the encrypted blocks
+        '''
+        self.write_letters(letters)
+
+
+    def close(self):
+        '''
+            Write the index and the footer, and update the block count of the header if the file object is seekable
+        '''
+        index_offset = self.__data_offset + self.__block_count * self.__record_size
+        self.__writer.write(struct.pack(f">{len(self.__index)}Q", *self.__index))
+        self.__writer.write(FOOTER.pack(index_offset, self.__block_count, INDEX_INTERVAL, FOOTER_MAGIC))
+        if self.__writer.seekable():
+            end = self.__writer.tell()
+            self.__header[7] = self.__block_count
+            self.__writer.seek(self.__start)
+            self.__writer.write(HEADER.pack(*self.__header))
+            self.__writer.seek(end)
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exception_type, exception, traceback):
+        if exception_type is None:
+            self.close()
+        elif self.__tail is not None:
+            self.__restore()
+
+
+class CipherContainerReader:
+    '''
+        Class used to read the encrypted blocks of a binary container through a memory map
+    '''
+    def __init__(self, filename : str):
+        '''
+            Map the container and read its header and footer
+
+            Parameters
+            --------------
+            filename : str
+                It is the filename (with extension) of the container
+        '''
+        self.__file = open(filename, "rb")
+        self.__map = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = struct.unpack_from(">4sB", self.__map, 0)
+        if magic != MAGIC or version not in (1, VERSION):
+            self.close()
+            raise ValueError("The file is not a valid container")
+        if version == 1:
+            header = HEADER_VERSION_1
+            _, _, mode, self.block_size, self.record_size, self.key_id, _, iv_length = header.unpack_from(self.__map, 0)
+            transform = TRANSFORMS["base64"]
+        else:
+            header = HEADER
+            _, _, mode, transform, self.block_size, self.record_size, self.key_id, _, iv_length = header.unpack_from(self.__map, 0)
+        self.mode = {value: name for name, value in MODES.items()}[mode]
+        self.transform = {value: name for name, value in TRANSFORMS.items()}[transform]
+        self.iv = bytes(self.__map[header.size : header.size + iv_length]).decode("ascii")
+        self.data_offset = header.size + iv_length
+        self.index_offset, self.block_count, self.index_interval, footer_magic = FOOTER.unpack_from(self.__map, len(self.__map) - FOOTER.size)
+        if footer_magic != FOOTER_MAGIC:
+            self.close()
+            raise ValueError("The container is incomplete")
+        self.__letters = get_block_length(self.block_size, self.transform)
+
+
+    def check_key(self, key : str):
+        '''
+            Check that the key is the one used to encrypt the container
+
+            Parameters
+            --------------
+            key : str
+                It is the key used for Vigenere cipher
+        '''
+        if get_key_id(key) != self.key_id:
+            raise ValueError("The key is not the one used to encrypt the container")
+
+
+    def read_letters(self, first_block : int = 0, last_block : int = None):
+        '''
+            Read and unpack the encrypted blocks first_block ... last_block (both included) in a single buffer
+
+            Parameters
+            --------------
+            first_block : int
+                It is the index of the first block
+
+            last_block : int
+                It is the index of the last block. By default, the last block of the container.
+
+            Returns
+            --------------
+            letters : bytes
+                It is the concatenation of the encrypted blocks (base 64 letters without the = padding, or raw bytes)
+        '''
+        last_block = self.block_count - 1 if last_block is None else last_block
+        if first_block < 0 or last_block >= self.block_count:
+            raise IndexError("The container does not have those blocks")
+        count = last_block - first_block + 1
+        if count <= 0:
+            return b""
+        return self.__unpack(self.__map[self.data_offset + first_block * self.record_size : self.data_offset + (last_block + 1) * self.record_size])
+
+
+    def iter_letters(self, blocks_per_chunk : int = 65536):
+        '''
+            Read the encrypted blocks sequentially in chunks, without mapping the whole container in memory
+
+            Parameters
+            --------------
+            blocks_per_chunk : int
+                It is the number of blocks of each chunk
+
+            Returns
+            --------------
+            generator[bytes]
+                It generates the concatenation of the encrypted blocks (base 64 letters without the = padding) of each chunk
+        '''
+        self.__file.seek(self.data_offset)
+        for first_block in range(0, self.block_count, blocks_per_chunk):
+            count = min(blocks_per_chunk, self.block_count - first_block)
+            yield self.__unpack(self.__file.read(count * self.record_size))
+
+
+    def __unpack(self, records : bytes):
+        '''
+            Unpack records into the letters of the encrypted blocks
+
+            Parameters
+            --------------
+            records : bytes
+                It is the concatenation of the records
+
+            Returns
+            --------------
+            letters : bytes
+                It is the concatenation of the encrypted blocks (base 64 letters without the = padding, or raw bytes)
+        '''
+        if self.transform == "bytes":
+            # The records are the raw encrypted blocks
+            return bytes(records)
+        count = len(records) // self.record_size
+        # Complete every record to a multiple of 3 bytes so all of them are encoded in base 64 at once
+        padded = np.zeros((count, self.record_size + (-self.record_size % 3)), dtype=np.uint8)
+        padded[:, : self.record_size] = np.frombuffer(records, dtype=np.uint8).reshape(count, self.record_size)
+        letters = np.frombuffer(base64.standard_b64encode(padded.tobytes()), dtype=np.uint8).reshape(count, -1)
+        return letters[:, : self.__letters].tobytes()
+
+
+    def read_blocks(self, first_block : int = 0, last_block : int = None):
+        '''
+            Read and unpack the encrypted blocks first_block ... last_block (both included)
+
+            Parameters
+            --------------
+            first_block : int
+                It is the index of the first block
+
+            last_block : int
+                It is the index of the last block. By default, the last block of the container.
+
+            Returns
+            --------------
+            blocks : list[bytes]
+                It is the list of encrypted blocks (base 64 letters without the = padding, or raw bytes)
+        '''
+        letters = self.read_letters(first_block, last_block)
+        return [letters[index : index + self.__letters] for index in range(0, len(letters), self.__letters)]
+
+
+    def close(self):
+        '''
+            Close the memory map and the file
+        '''
+        self.__map.close()
+        self.__file.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.close()
@@ -0,0 +1,117 @@
+'''
+	Name: CryptodomeCipher.py
+	Laboratory 3 - Modes of operation
+    Authors:
+		* María José Salmerón Contreras
+		* Edgar Alejandro Ramírez Fuentes
+
+    Block ciphers of PyCryptodome (DES, Triple DES and AES) used as a block cipher through their ECB mode.
+'''
+
+from Crypto.Cipher import AES, DES, DES3
+
+from .BlockCipher import BlockCipher
+
+
+ALGORITHMS = {"DES": DES, "DES3": DES3, "AES": AES}
+
+
+class CryptodomeCipher(BlockCipher):
+    '''
+        This class is used to encrypt/decrypt blocks using DES, Triple DES or AES
+    '''
+    def __init__(self, algorithm : str, key : bytes):
+        '''
+            Initialize the CryptodomeCipher object
+
+            Parameters
+            --------------
+            algorithm : str
+                It is the name of the block cipher: DES, DES3 or AES
+
+            key : bytes
+                It is the key (8 bytes for DES, 16 or 24 for Triple DES, 16, 24 or 32 for AES)
+        '''
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"The algorithm must be one of {', '.join(ALGORITHMS)}")
+        super().__init__(ALGORITHMS[algorithm].block_size)
+        self.algorithm = algorithm
+        self.key = bytes(key)
+        self.__cipher = ALGORITHMS[algorithm].new(self.key, ALGORITHMS[algorithm].MODE_ECB)
+
+
+    def __getstate__(self):
+        # The PyCryptodome object can not be sent to another process, it is created again from the key
+        return {"algorithm": self.algorithm, "key": self.key}
+
+
+    def __setstate__(self, state : dict):
+        self.__init__(state["algorithm"], state["key"])
+
+
+    def encrypt_block(self, block : bytes):
+        '''
+            Encrypt a single block
+
+            Parameters
+            --------------
+            block : bytes
+                It is the block (block_size bytes) that will be encrypted
+
+            Returns
+            --------------
+            bytes
+                It is the encrypted block
+        '''
+        return self.__cipher.encrypt(block)
+
+
+    def decrypt_block(self, block : bytes):
+        '''
+            Decrypt a single block
+
+            Parameters
+            --------------
+            block : bytes
+                It is the encrypted block (block_size bytes) that will be decrypted
+
+            Returns
+            --------------
+            bytes
+                It is the decrypted block
+        '''
+        return self.__cipher.decrypt(block)
+
+
+    def encrypt_blocks(self, data : bytes):
+        '''
+            Encrypt many blocks at once (ECB mode)
+
+            Parameters
+            --------------
+            data : bytes
+                It is the concatenation of the blocks (its length is a multiple of block_size)
+
+            Returns
+            --------------
+            bytes
+                It is the concatenation of the encrypted blocks
+        '''
+        return self.__cipher.encrypt(data)
+
+
+    def decrypt_blocks(self, data : bytes):
+        '''
+            Decrypt many blocks at once (ECB mode)
+
+            Parameters
+            --------------
+            data : bytes
+                It is the concatenation of the encrypted blocks (its length is a multiple of block_size)
+
+            Returns
+            --------------
+            bytes
+                It is the concatenation of the decrypted blocks
+        '''
+        return self.__cipher.decrypt(data)
@@ -0,0 +1,901 @@
+'''
+	Name: ModesOfOperation.py
+	Laboratory 3 - Modes of operation
+    Authors:
+		* María José Salmerón Contreras
+		* Edgar Alejandro Ramírez Fuentes
+
+    Modes of operation (ECB, CBC, CFB, OFB and CTR) over any BlockCipher.
+    The padding, the streaming of files, the pipelined and the parallel processing are written once in ModeOfOperation;
+    each mode only describes how consecutive blocks are encrypted and decrypted from a state
+    (the previous encrypted block, the feedback register or the counter).\n
+    The encrypted blocks are encoded with a BlockTransform (raw bytes by default), so they can be wider than the plaintext blocks:
+    the state taken from an encrypted block is always its first block_size symbols.
+'''
+
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .BlockTransform import BlockTransform
+from .PipelineRunner import PipelineRunner
+
+
+def xor_bytes(data : bytes, keystream : bytes):
+    '''
+        XOR the data with the first len(data) bytes of the keystream in a single vectorized operation
+
+        Parameters
+        --------------
+        data : bytes
+            It is the data that will be XORed
+
+        keystream : bytes
+            It is the value XORed with the data (at least as long as the data)
+
+        Returns
+        --------------
+        bytes
+            It is the result of the XOR operation
+    '''
+    data = np.frombuffer(data, dtype=np.uint8)
+    return np.bitwise_xor(data, np.frombuffer(keystream, dtype=np.uint8)[: data.size]).tobytes()
+
+
+def process_range(mode, data : bytes, state, encrypt : bool):
+    '''
+        Encrypt or decrypt a range of blocks in a worker process (see ModeOfOperation.encrypt_parallel)
+
+        Parameters
+        --------------
+        mode : ModeOfOperation
+            It is the mode of operation (with its block cipher)
+
+        data : bytes
+            It is the range of blocks
+
+        state
+            It is the state of the mode at the first block of the range
+
+        encrypt : bool
+            It is True to encrypt and False to decrypt
+
+        Returns
+        --------------
+        bytes
+            It is the processed range
+    '''
+    return (mode.encrypt_blocks(data, state) if encrypt else mode.decrypt_blocks(data, state))[0]
+
+
+class BlockStream:
+    '''
+        Class used to encrypt/decrypt data that arrives in chunks with a mode of operation. The complete blocks of every chunk
+        are processed at once and the incomplete block is carried to the next one; the padding is added (or removed) in finalize.
+    '''
+    def __init__(self, mode, iv : bytes, encrypt : bool):
+        '''
+            Initialize the BlockStream object
+
+            Parameters
+            --------------
+            mode : ModeOfOperation
+                It is the mode of operation (with its block cipher)
+
+            iv : bytes
+                It is the initialization vector (block_size bytes, ECB does not use it)
+
+            encrypt : bool
+                It is True to encrypt and False to decrypt
+        '''
+        self.__mode = mode
+        self.__state = mode.get_state(iv)
+        self.__encrypt = encrypt
+        # The plaintext blocks are encrypted, the encoded blocks are decrypted
+        self.__block_size = mode.block_size if encrypt else mode.encoded_size
+        self.__pending = b""
+
+
+    def update(self, data : bytes):
+        '''
+            Encrypt/decrypt the complete blocks of the pending data followed by the next chunk
+
+            Parameters
+            --------------
+            data : bytes
+                It is the next chunk (it is not kept, so it can be a reused buffer)
+
+            Returns
+            --------------
+            bytes
+                It is the encrypted/decrypted blocks (empty if no block was completed)
+        '''
+        data = self.__pending + data if self.__pending else data
+        length = len(data) - len(data) % self.__block_size
+        if not self.__encrypt and self.__mode.padding and length == len(data):
+            # The last block is kept until the end to remove its padding
+            length -= self.__block_size
+        self.__pending = bytes(data[max(length, 0) :])
+        if length <= 0:
+            return b""
+        if self.__encrypt:
+            result, self.__state = self.__mode.encrypt_blocks(memoryview(data)[:length], self.__state)
+        else:
+            result, self.__state = self.__mode.decrypt_blocks(memoryview(data)[:length], self.__state)
+        return result
+
+
+    def finalize(self):
+        '''
+            Encrypt/decrypt the pending data, adding or removing the padding
+
+            Returns
+            --------------
+            bytes
+                It is the last encrypted/decrypted blocks
+        '''
+        data, self.__pending = self.__pending, b""
+        if self.__encrypt:
+            data = self.__mode.pad(data)
+            return self.__mode.encrypt_blocks(data, self.__state)[0] if data else b""
+        self.__mode.check_encrypted_length(len(data))
+        if not data and not self.__mode.padding:
+            return b""
+        return self.__mode.unpad(self.__mode.decrypt_blocks(data, self.__state)[0])
+
+
+class ModeOfOperation(ABC):
+    '''
+        Base class of the modes of operation. A mode implements encrypt_blocks and decrypt_blocks, which process consecutive blocks
+        from a state and return the state for the next blocks, and get_range_state if its blocks can be processed in parallel.
+    '''
+    # Name of the mode
+    name = ""
+    # The plaintext is padded to complete blocks (PKCS#7), otherwise the last block can be incomplete
+    padding = False
+    # The block cipher encrypts the encoded blocks (ECB and CBC), otherwise it encrypts the state and its output is XORed with the blocks
+    encrypts_encoded_blocks = False
+    # The blocks can be encrypted/decrypted independently once the state of each range is known
+    parallel_encryption = False
+    parallel_decryption = False
+
+    def __init__(self, cipher, transform : BlockTransform = None, fill : bytes = None):
+        '''
+            Initialize the ModeOfOperation object
+
+            Parameters
+            --------------
+            cipher : BlockCipher
+                It is the block cipher used to encrypt the blocks (encoded blocks for ECB and CBC, states for the other modes)
+
+            transform : BlockTransform
+                It is the encoding of the encrypted blocks. By default, raw bytes of the block size of the cipher.
+
+            fill : bytes
+                If it is provided, the last block is completed with this byte instead of the padding of the mode,
+                and it is kept in the decrypted data
+        '''
+        self.cipher = cipher
+        self.transform = transform or BlockTransform(cipher.block_size)
+        self.block_size = self.transform.block_size
+        self.encoded_size = self.transform.encoded_size
+        cipher_size = self.encoded_size if self.encrypts_encoded_blocks else self.block_size
+        if cipher.block_size != cipher_size:
+            raise ValueError(f"The block cipher of the {self.name} mode must have blocks of {cipher_size} bytes")
+        self.fill = fill
+        self.padding = self.padding and fill is None
+
+
+    def get_state(self, iv : bytes):
+        '''
+            Get the state of the mode before the first block
+
+            Parameters
+            --------------
+            iv : bytes
+                It is the initialization vector (block_size bytes)
+
+            Returns
+            --------------
+            state
+                It is the state of the mode before the first block
+        '''
+        if iv is None or len(iv) != self.block_size:
+            raise ValueError(f"The initialization vector must have {self.block_size} bytes")
+        return bytes(iv)
+
+
+    def get_range_state(self, data : bytes, state, first_block : int, encrypt : bool):
+        '''
+            Get the state of the mode at a block without processing the previous ones
+
+            Parameters
+            --------------
+            data : bytes
+                It is the whole data (plaintext to encrypt or encrypted data to decrypt)
+
+            state
+                It is the state of the mode before the first block
+
+            first_block : int
+                It is the index of the block
+
+            encrypt : bool
+                It is True to encrypt and False to decrypt
+
+            Returns
+            --------------
+            state
+                It is the state of the mode before the block
+        '''
+        raise ValueError(f"The {self.name} mode can not process its blocks in parallel")
+
+
+    def get_previous_blocks(self, data : bytes, state : bytes, count : int):
+        '''
+            Get the state of each block of an encrypted data: the state before the first block, and then
+            the first block_size symbols of the encrypted block previous to each one
+
+            Parameters
+            --------------
+            data : bytes
+                It is the concatenation of the encrypted blocks
+
+            state : bytes
+                It is the state before the first block
+
+            count : int
+                It is the number of blocks (the last one can be incomplete)
+
+            Returns
+            --------------
+            numpy.ndarray
+                It is a matrix with the state of every block in a row
+        '''
+        previous = np.empty((count, self.block_size), dtype=np.uint8)
+        previous[0] = np.frombuffer(state, dtype=np.uint8)
+        previous[1:] = np.frombuffer(data, dtype=np.uint8, count=(count - 1) * self.encoded_size).reshape(count - 1, self.encoded_size)[:, : self.block_size]
+        return previous
+
+
+    @abstractmethod
+    def encrypt_blocks(self, data : bytes, state):
+        '''
+            Encrypt consecutive blocks (only the last one can be incomplete, if the mode does not use padding)
+
+            Parameters
+            --------------
+            data : bytes
+                It is the plaintext that will be encrypted
+
+            state
+                It is the state of the mode before the first block
+
+            Returns
+            --------------
+            encrypted_data : bytes
+                It is the encrypted data (the encoded blocks)
+
+            state
+                It is the state of the mode after the last block
+        '''
+
+
+    @abstractmethod
+    def decrypt_blocks(self, data : bytes, state):
+        '''
+            Decrypt consecutive blocks (only the last one can be incomplete, if the mode does not use padding)
+
+            Parameters
+            --------------
+            data : bytes
+                It is the encrypted data (the encoded blocks) that will be decrypted
+
+            state
+                It is the state of the mode before the first block
+
+            Returns
+            --------------
+            data : bytes
+                It is the decrypted data
+
+            state
+                It is the state of the mode after the last block
+        '''
+
+
+    def pad(self, data : bytes):
+        '''
+            Complete the last block with the fill byte, or add the PKCS#7 padding if the mode uses it: n bytes of value n to complete
+            the last block (a whole block if it is already complete). Otherwise, the data is not changed.
+        '''
+        if self.fill is not None:
+            return bytes(data) + self.fill * (-len(data) % self.block_size)
+        if not self.padding:
+            return data
+        padding = self.block_size - len(data) % self.block_size
+        return bytes(data) + bytes([padding]) * padding
+
+
+    def unpad(self, data : bytes):
+        '''
+            Remove the PKCS#7 padding if the mode uses it (the fill bytes are kept)
+        '''
+        if not self.padding:
+            return data
+        if len(data) == 0 or len(data) % self.block_size != 0 or not 1 <= data[-1] <= self.block_size or data[-data[-1]:] != bytes([data[-1]]) * data[-1]:
+            raise ValueError("The padding is not valid (wrong key or initialization vector)")
+        return data[: -data[-1]]
+
+
+    def check_encrypted_length(self, length : int):
+        '''
+            Check that the encrypted data is a sequence of complete blocks when the mode needs them
+
+            Parameters
+            --------------
+            length : int
+                It is the length of the encrypted data
+        '''
+        if (self.padding or self.fill is not None or self.encrypts_encoded_blocks) and length % self.encoded_size != 0:
+            raise ValueError(f"The encrypted data of the {self.name} mode must be a sequence of complete blocks")
+
+
+    def encrypt(self, data : bytes, iv : bytes = None):
+        '''
+            Encrypt the data
+
+            Parameters
+            --------------
+            data : bytes
+                It is the plaintext that will be encrypted
+
+            iv : bytes
+                It is the initialization vector (block_size bytes, ECB does not use it)
+
+            Returns
+            --------------
+            bytes
+                It is the encrypted data
+        '''
+        return self.encrypt_blocks(self.pad(data), self.get_state(iv))[0]
+
+
+    def decrypt(self, data : bytes, iv : bytes = None):
+        '''
+            Decrypt the data
+
+            Parameters
+            --------------
+            data : bytes
+                It is the encrypted data that will be decrypted
+
+            iv : bytes
+                It is the initialization vector (block_size bytes, ECB does not use it)
+
+            Returns
+            --------------
+            bytes
+                It is the decrypted data
+        '''
+        self.check_encrypted_length(len(data))
+        return self.unpad(self.decrypt_blocks(data, self.get_state(iv))[0])
+
+
+    def encryptor(self, iv : bytes = None):
+        '''
+            Get a BlockStream that encrypts the data chunk by chunk
+
+            Parameters
+            --------------
+            iv : bytes
+                It is the initialization vector (block_size bytes, ECB does not use it)
+
+            Returns
+            --------------
+            BlockStream
+                It is the stream, its update method encrypts the next chunk and finalize encrypts the last block
+        '''
+        return BlockStream(self, iv, True)
+
+
+    def decryptor(self, iv : bytes = None):
+        '''
+            Get a BlockStream that decrypts the data chunk by chunk
+
+            Parameters
+            --------------
+            iv : bytes
+                It is the initialization vector (block_size bytes, ECB does not use it)
+
+            Returns
+            --------------
+            BlockStream
+                It is the stream, its update method decrypts the next chunk and finalize decrypts the last block
+        '''
+        return BlockStream(self, iv, False)
+
+
+    def encrypt_stream(self, reader, writer, iv : bytes = None, chunk_size : int = 1024 * 1024):
+        '''
+            Encrypt a file object chunk by chunk, so the memory used does not depend on the size of the file.
+            The incomplete block of each chunk is carried to the next one and the padding is added at the end.
+
+            Parameters
+            --------------
+            reader : file object
+                It is the file object (opened in binary mode) that contains the plaintext
+
+            writer : file object
+                It is the file object (opened in binary mode) that will store the encrypted data
+
+            iv : bytes
+                It is the initialization vector (block_size bytes, ECB does not use it)
+
+            chunk_size : int
+                It is the number of bytes read each time
+        '''
+        encryptor = self.encryptor(iv)
+        for chunk in iter(lambda: reader.read(chunk_size), b""):
+            writer.write(encryptor.update(chunk))
+        writer.write(encryptor.finalize())
+
+
+    def decrypt_stream(self, reader, writer, iv : bytes = None, chunk_size : int = 1024 * 1024):
+        '''
+            Decrypt a file object chunk by chunk, so the memory used does not depend on the size of the file.
+            If the mode uses padding, the last block is kept until the end of the file to remove it.
+
+            Parameters
+            --------------
+            reader : file object
+                It is the file object (opened in binary mode) that contains the encrypted data
+
+            writer : file object
+                It is the file object (opened in binary mode) that will store the decrypted data
+
+            iv : bytes
+                It is the initialization vector (block_size bytes, ECB does not use it)
+
+            chunk_size : int
+                It is the number of bytes read each time
+        '''
+        decryptor = self.decryptor(iv)
+        for chunk in iter(lambda: reader.read(chunk_size), b""):
+            writer.write(decryptor.update(chunk))
+        writer.write(decryptor.finalize())
+
+
+    def encrypt_pipelined(self, reader, writer, iv : bytes = None, runner : PipelineRunner = None, prepare = None):
+        '''
+            Encrypt a file object like encrypt_stream, but reading, encrypting and writing the chunks at the same time
+            with a PipelineRunner, so the time of a large file approaches the time of the slowest stage instead of their sum.
+
+            Parameters
+            --------------
+            reader : file object
+                It is the file object (opened in binary mode) that contains the plaintext
+
+            writer : file object
+                It is the file object (opened in binary mode) that will store the encrypted data
+
+            iv : bytes
+                It is the initialization vector (block_size bytes, ECB does not use it)
+
+            runner : PipelineRunner
+                It is the runner with the buffer size and the queue depth. By default, a runner with buffers of 1 MB.
+
+            prepare : function
+                If it is provided, it transforms every chunk read (bytes) before it is encrypted, e.g. a normalization of the text
+
+            Returns
+            --------------
+            utilization : dict
+                It is the fraction of the time that the read, compute and write stages were busy
+        '''
+        encryptor = self.encryptor(iv)
+
+        def encrypt_chunk(chunk):
+            if chunk is None:
+                return encryptor.finalize()
+            return encryptor.update(prepare(bytes(chunk)) if prepare else chunk)
+
+        return (runner or PipelineRunner()).run(reader, writer.write, encrypt_chunk)
+
+
+    def encrypt_parallel(self, data : bytes, iv : bytes = None, workers : int = None, blocks_per_task : int = 65536):
+        '''
+            Encrypt the data in a pool of processes, each one encrypts a range of blocks from its own state
+
+            Parameters
+            --------------
+            data : bytes
+                It is the plaintext that will be encrypted
+
+            iv : bytes
+                It is the initialization vector (block_size bytes, ECB does not use it)
+
+            workers : int
+                It is the number of processes. By default, one per core.
+
+            blocks_per_task : int
+                It is the number of blocks encrypted by a worker each time
+
+            Returns
+            --------------
+            bytes
+                It is the encrypted data
+        '''
+        if not self.parallel_encryption:
+            raise ValueError(f"The {self.name} mode can not encrypt its blocks in parallel")
+        return self.__process_parallel(self.pad(data), iv, workers, blocks_per_task, True)
+
+
+    def decrypt_parallel(self, data : bytes, iv : bytes = None, workers : int = None, blocks_per_task : int = 65536):
+        '''
+            Decrypt the data in a pool of processes, each one decrypts a range of blocks from its own state
+
+            Parameters
+            --------------
+            data : bytes
+                It is the encrypted data that will be decrypted
+
+            iv : bytes
+                It is the initialization vector (block_size bytes, ECB does not use it)
+
+            workers : int
+                It is the number of processes. By default, one per core.
+
+            blocks_per_task : int
+                It is the number of blocks decrypted by a worker each time
+
+            Returns
+            --------------
+            bytes
+                It is the decrypted data
+        '''
+        if not self.parallel_decryption:
+            raise ValueError(f"The {self.name} mode can not decrypt its blocks in parallel")
+        self.check_encrypted_length(len(data))
+        return self.unpad(self.__process_parallel(data, iv, workers, blocks_per_task, False))
+
+
+    def __process_parallel(self, data : bytes, iv : bytes, workers : int, blocks_per_task : int, encrypt : bool):
+        '''
+            Divide the data in ranges of blocks and process them in a pool of processes
+
+            Parameters
+            --------------
+            data : bytes
+                It is the data that will be processed
+
+            iv : bytes
+                It is the initialization vector
+
+            workers : int
+                It is the number of processes
+
+            blocks_per_task : int
+                It is the number of blocks processed by a worker each time
+
+            encrypt : bool
+                It is True to encrypt and False to decrypt
+
+            Returns
+            --------------
+            bytes
+                It is the processed data, in order
+        '''
+        state = self.get_state(iv)
+        # The plaintext blocks are encrypted, the encoded blocks are decrypted
+        block_size = self.block_size if encrypt else self.encoded_size
+        task_size = blocks_per_task * block_size
+        with ProcessPoolExecutor(workers) as executor:
+            futures = [
+                executor.submit(process_range, self, bytes(data[start : start + task_size]), self.get_range_state(data, state, start // block_size, encrypt), encrypt)
+                for start in range(0, len(data), task_size)
+            ]
+            return b"".join(future.result() for future in futures)
+
+
+class ECB_Mode(ModeOfOperation):
+    '''
+        Electronic Codebook: every block is encrypted independently
+    '''
+    name = "ECB"
+    padding = True
+    encrypts_encoded_blocks = True
+    parallel_encryption = True
+    parallel_decryption = True
+
+    def get_state(self, iv : bytes):
+        # ECB does not use an initialization vector
+        return None
+
+
+    def get_range_state(self, data : bytes, state, first_block : int, encrypt : bool):
+        return None
+
+
+    def encrypt_blocks(self, data : bytes, state):
+        return self.cipher.encrypt_blocks(self.transform.encode(data)), None
+
+
+    def decrypt_blocks(self, data : bytes, state):
+        return self.transform.decode(self.cipher.decrypt_blocks(data)), None
+
+
+class CBC_Mode(ModeOfOperation):
+    '''
+        Cipher Block Chaining: Ci = E(T(Pi XOR Ci-1)), where T is the transform, and the state is the previous encrypted block.\n
+        The encryption is sequential, but the decryption only needs Ci and Ci-1, so it is vectorized and parallel.
+    '''
+    name = "CBC"
+    padding = True
+    encrypts_encoded_blocks = True
+    parallel_decryption = True
+
+    def get_range_state(self, data : bytes, state, first_block : int, encrypt : bool):
+        # The state of a block is the previous encrypted block
+        start = (first_block - 1) * self.encoded_size
+        return state if first_block == 0 else bytes(data[start : start + self.block_size])
+
+
+    def encrypt_blocks(self, data : bytes, state):
+        data = memoryview(data)
+        block_size, encoded_size = self.block_size, self.encoded_size
+        count = len(data) // block_size
+        encrypted_data = bytearray(count * encoded_size)
+        previous_block = int.from_bytes(state, "big")
+        # The raw bytes are not encoded, so the identity transform is skipped
+        encode = None if type(self.transform) is BlockTransform else self.transform.encode_block
+        encrypt = self.cipher.encrypt_block
+        for index in range(count):
+            # XOR the whole block with the previous encrypted block, and encrypt the encoded result
+            block = (int.from_bytes(data[index * block_size : (index + 1) * block_size], "big") ^ previous_block).to_bytes(block_size, "big")
+            block = encrypt(encode(block) if encode else block)
+            encrypted_data[index * encoded_size : (index + 1) * encoded_size] = block
+            previous_block = int.from_bytes(block[:block_size], "big")
+        return bytes(encrypted_data), previous_block.to_bytes(block_size, "big")
+
+
+    def decrypt_blocks(self, data : bytes, state):
+        if len(data) == 0:
+            return b"", state
+        data = bytes(data)
+        count = len(data) // self.encoded_size
+        decrypted = np.frombuffer(self.transform.decode(self.cipher.decrypt_blocks(data)), dtype=np.uint8).reshape(count, self.block_size)
+        # The value XORed with each decrypted block is the previous encrypted block
+        previous_blocks = self.get_previous_blocks(data, state, count)
+        return np.bitwise_xor(decrypted, previous_blocks).tobytes(), data[-self.encoded_size :][: self.block_size]
+
+
+class CFB_Mode(ModeOfOperation):
+    '''
+        Cipher Feedback: Ci = T(Pi XOR E(Ci-1)), where T is the transform, and the state is the previous encrypted block.\n
+        The encryption is sequential, but every keystream block of the decryption comes from a known encrypted block,
+        so the decryption is vectorized and parallel.
+    '''
+    name = "CFB"
+    parallel_decryption = True
+
+    def get_range_state(self, data : bytes, state, first_block : int, encrypt : bool):
+        # The state of a block is the previous encrypted block
+        start = (first_block - 1) * self.encoded_size
+        return state if first_block == 0 else bytes(data[start : start + self.block_size])
+
+
+    def encrypt_blocks(self, data : bytes, state):
+        data = memoryview(data)
+        block_size, encoded_size = self.block_size, self.encoded_size
+        count = len(data) // block_size
+        encrypted_data = bytearray(count * encoded_size)
+        previous_block = state
+        # The raw bytes are not encoded, so the identity transform is skipped
+        encode = None if type(self.transform) is BlockTransform else self.transform.encode_block
+        encrypt = self.cipher.encrypt_block
+        for index in range(count):
+            # XOR the block with the encrypted previous block
+            block = (int.from_bytes(data[index * block_size : (index + 1) * block_size], "big") ^ int.from_bytes(encrypt(previous_block), "big")).to_bytes(block_size, "big")
+            block = encode(block) if encode else block
+            encrypted_data[index * encoded_size : (index + 1) * encoded_size] = block
+            previous_block = block[:block_size]
+        if count * block_size < len(data):
+            # Only the first len(block) bytes of the keystream are XORed with the incomplete last block
+            block = data[count * block_size :]
+            keystream = int.from_bytes(encrypt(previous_block)[: len(block)], "big")
+            previous_block = self.transform.encode((int.from_bytes(block, "big") ^ keystream).to_bytes(len(block), "big"))
+            encrypted_data += previous_block
+        return bytes(encrypted_data), previous_block
+
+
+    def decrypt_blocks(self, data : bytes, state):
+        if len(data) == 0:
+            return b"", state
+        data = bytes(data)
+        count = -(-len(data) // self.encoded_size)
+        # The keystream of each block is the encryption of the previous encrypted block
+        keystream = self.cipher.encrypt_blocks(self.get_previous_blocks(data, state, count).tobytes())
+        last_block = (count - 1) * self.encoded_size
+        return xor_bytes(self.transform.decode(data), keystream), data[last_block : last_block + self.block_size]
+
+
+class OFB_Mode(ModeOfOperation):
+    '''
+        Output Feedback: Oi = E(Oi-1) and Ci = T(Pi XOR Oi), where T is the transform, and the state is the last keystream block.\n
+        The keystream does not depend on the data, so it can be precomputed before the data is available.
+    '''
+    name = "OFB"
+
+    def keystream(self, state : bytes, count : int):
+        '''
+            Generate the next count keystream blocks by chaining the block cipher over the state:
+            every keystream block is the encryption of the previous one, starting from the initialization vector
+
+            Parameters
+            --------------
+            state : bytes
+                It is the last keystream block (the initialization vector at the beginning)
+
+            count : int
+                It is the number of keystream blocks
+
+            Returns
+            --------------
+            keystream : bytes
+                It is the concatenation of the keystream blocks
+
+            state : bytes
+                It is the last keystream block
+        '''
+        keystream = bytearray(count * self.block_size)
+        for index in range(0, len(keystream), self.block_size):
+            state = self.cipher.encrypt_block(state)
+            keystream[index : index + self.block_size] = state
+        return keystream, state
+
+
+    def encrypt_blocks(self, data : bytes, state):
+        keystream, state = self.keystream(state, -(-len(data) // self.block_size))
+        return self.transform.encode(xor_bytes(data, keystream)), state
+
+
+    def decrypt_blocks(self, data : bytes, state):
+        data = self.transform.decode(data)
+        keystream, state = self.keystream(state, -(-len(data) // self.block_size))
+        return xor_bytes(data, keystream), state
+
+
+class CTR_Mode(ModeOfOperation):
+    '''
+        Counter: Ci = T(Pi XOR E(iv + i)), where T is the transform and iv + i is a number written with the symbols of its alphabet
+        (block_size digits, big endian, modulo the number of blocks). The state is the next counter.\n
+        Every keystream block only depends on its index, so the keystream is computed for many blocks in one call,
+        it can be computed ahead of time (see precompute_keystream), and both the encryption and the decryption are parallel.
+    '''
+    name = "CTR"
+    parallel_encryption = True
+    parallel_decryption = True
+
+    def __init__(self, cipher, transform : BlockTransform = None, fill : bytes = None):
+        super().__init__(cipher, transform, fill)
+        # A digit of the counter is a byte, or the index of a symbol of the alphabet of the transform
+        alphabet = self.transform.alphabet
+        self.__radix = 256 if alphabet is None else len(alphabet)
+        self.__modulus = self.__radix ** self.block_size
+        self.__to_digits = None if alphabet is None else bytes.maketrans(alphabet, bytes(range(len(alphabet))))
+        self.__to_symbols = None if alphabet is None else np.frombuffer(alphabet, dtype=np.uint8)
+        # Keystream computed ahead of time: (first counter, keystream of the counters first, first + 1, ...)
+        self.__precomputed = (0, b"")
+
+
+    def get_state(self, iv : bytes):
+        iv = super().get_state(iv)
+        if self.__to_digits is None:
+            return int.from_bytes(iv, "big")
+        if iv.translate(None, self.transform.alphabet):
+            raise ValueError("The initialization vector contains symbols that do not belong to the alphabet of the transform")
+        counter = 0
+        for digit in iv.translate(self.__to_digits):
+            counter = counter * self.__radix + digit
+        return counter
+
+
+    def get_range_state(self, data : bytes, state, first_block : int, encrypt : bool):
+        return (state + first_block) % self.__modulus
+
+
+    def get_counter_blocks(self, counter : int, count : int):
+        '''
+            Get the blocks counter, counter + 1, ..., counter + count - 1 (big endian, modulo the number of blocks) in a single buffer
+
+            Parameters
+            --------------
+            counter : int
+                It is the first counter
+
+            count : int
+                It is the number of counters
+
+            Returns
+            --------------
+            bytes
+                It is the concatenation of the counter blocks
+        '''
+        radix = np.uint64(self.__radix)
+        # The lowest digits are added with uint64 arithmetic (without overflow), and the highest digits get the carry
+        low_digits = min(self.block_size, 63 // (self.__radix - 1).bit_length())
+        high_digits = self.block_size - low_digits
+        low_modulus = self.__radix ** low_digits
+        lows = np.uint64(counter % low_modulus) + np.arange(count, dtype=np.uint64)
+        carry = lows >= np.uint64(low_modulus)
+        lows[carry] -= np.uint64(low_modulus)
+        digits = np.empty((count, self.block_size), dtype=np.uint8)
+        positions = np.arange(low_digits - 1, -1, -1, dtype=np.uint64)
+        if self.__radix & (self.__radix - 1) == 0:
+            # The radix is a power of two (bytes or base 64), so the digits are taken with shifts instead of divisions
+            digit_bits = np.uint64(self.__radix.bit_length() - 1)
+            digits[:, high_digits:] = (lows[:, None] >> positions * digit_bits) & (radix - np.uint64(1))
+        else:
+            digits[:, high_digits:] = lows[:, None] // radix ** positions % radix
+        if high_digits:
+            high = counter // low_modulus
+            highs = [[(value % self.__radix ** high_digits) // self.__radix ** power % self.__radix for power in range(high_digits - 1, -1, -1)] for value in (high, high + 1)]
+            digits[:, :high_digits] = np.array(highs, dtype=np.uint8)[carry.astype(np.intp)]
+        return (digits if self.__to_symbols is None else self.__to_symbols[digits]).tobytes()
+
+
+    def precompute_keystream(self, iv : bytes, count : int):
+        '''
+            Compute the keystream of the first count blocks ahead of time, so the next encryptions/decryptions
+            with the same initialization vector only XOR the blocks
+
+            Parameters
+            --------------
+            iv : bytes
+                It is the initialization vector (block_size bytes)
+
+            count : int
+                It is the number of keystream blocks
+        '''
+        state = self.get_state(iv)
+        self.__precomputed = (state, self.cipher.encrypt_blocks(self.get_counter_blocks(state, count)))
+
+
+    def keystream(self, state : int, count : int):
+        '''
+            Get the next count keystream blocks, from the precomputed keystream if it has them
+
+            Parameters
+            --------------
+            state : int
+                It is the next counter
+
+            count : int
+                It is the number of keystream blocks
+
+            Returns
+            --------------
+            keystream : bytes
+                It is the concatenation of the keystream blocks
+
+            state : int
+                It is the counter after the last block
+        '''
+        first, precomputed = self.__precomputed
+        start = (state - first) % self.__modulus * self.block_size
+        if start + count * self.block_size <= len(precomputed):
+            return precomputed[start : start + count * self.block_size], (state + count) % self.__modulus
+        return self.cipher.encrypt_blocks(self.get_counter_blocks(state, count)), (state + count) % self.__modulus
+
+
+    def encrypt_blocks(self, data : bytes, state):
+        keystream, state = self.keystream(state, -(-len(data) // self.block_size))
+        return self.transform.encode(xor_bytes(data, keystream)), state
+
+
+    def decrypt_blocks(self, data : bytes, state):
+        data = self.transform.decode(data)
+        keystream, state = self.keystream(state, -(-len(data) // self.block_size))
+        return xor_bytes(data, keystream), state
@@ -0,0 +1,145 @@
+'''
+	Name: PipelineRunner.py
+	Laboratory 3 - Modes of operation
+    Authors:
+		* María José Salmerón Contreras
+		* Edgar Alejandro Ramírez Fuentes
+
+    Pipelined processing of a file: a reader thread, a compute stage and a writer thread connected by bounded queues.
+    The reader fills reusable buffers while the previous chunk is computed and the one before it is written, so the time
+    of a large file approaches the time of the slowest stage instead of the sum of the three.
+    It is shared by the CBC and CFB laboratories and by the Triple DES laboratory.
+'''
+
+import queue
+import threading
+import time
+
+
+class PipelineRunner:
+    '''
+        This class is used to read, compute and write a file at the same time
+    '''
+    def __init__(self, buffer_size : int = 1024 * 1024, queue_depth : int = 4):
+        '''
+            Initialize the PipelineRunner object
+
+            Parameters
+            --------------
+            buffer_size : int
+                It is the number of bytes read each time (the size of every reusable buffer)
+
+            queue_depth : int
+                It is the number of chunks that can wait between two stages
+        '''
+        if buffer_size <= 0 or queue_depth <= 0:
+            raise ValueError("The buffer size and the queue depth must be positive")
+        self.buffer_size = buffer_size
+        self.queue_depth = queue_depth
+        # Fraction of the time each stage was busy in the last run, and its duration
+        self.utilization = dict()
+        self.seconds = 0
+
+
+    def run(self, reader, write, compute):
+        '''
+            Read the reader in chunks, compute each chunk and write the results in order.\n
+            compute is called with a memoryview of every chunk (it must copy what it keeps, the buffer is reused)
+            and finally with None, so it returns what it kept (e.g. the padded last block).
+
+            Parameters
+            --------------
+            reader : file object
+                It is the file object (opened in binary mode) that is read
+
+            write : function
+                It is the function that writes the bytes returned by compute in order (e.g. the write method of a file object)
+
+            compute : function
+                It is the function that transforms a chunk (memoryview, or None at the end) into the bytes to write
+
+            Returns
+            --------------
+            utilization : dict
+                It is the fraction of the time that the read, compute and write stages were busy
+        '''
+        # Two extra buffers: the one being read and the one being computed
+        free_buffers = queue.Queue()
+        for _ in range(self.queue_depth + 2):
+            free_buffers.put(bytearray(self.buffer_size))
+        read_queue = queue.Queue(self.queue_depth)
+        write_queue = queue.Queue(self.queue_depth)
+        busy = {"read": 0.0, "compute": 0.0, "write": 0.0}
+        errors = []
+        stop = threading.Event()
+
+        def read_stage():
+            try:
+                while not stop.is_set():
+                    buffer = free_buffers.get()
+                    start = time.perf_counter()
+                    length = reader.readinto(buffer)
+                    busy["read"] += time.perf_counter() - start
+                    if not length:
+                        break
+                    read_queue.put((buffer, length))
+            except BaseException as error:
+                errors.append(error)
+            finally:
+                read_queue.put(None)
+
+        def write_stage():
+            while True:
+                output = write_queue.get()
+                if output is None:
+                    return
+                if errors:
+                    # Keep consuming so the compute stage is never blocked
+                    continue
+                try:
+                    start = time.perf_counter()
+                    write(output)
+                    busy["write"] += time.perf_counter() - start
+                except BaseException as error:
+                    errors.append(error)
+
+        reader_thread = threading.Thread(target=read_stage, daemon=True)
+        writer_thread = threading.Thread(target=write_stage, daemon=True)
+        start_time = time.perf_counter()
+        reader_thread.start()
+        writer_thread.start()
+        finished = False
+        try:
+            while not errors:
+                item = read_queue.get()
+                if item is None:
+                    finished = True
+                    break
+                buffer, length = item
+                start = time.perf_counter()
+                output = compute(memoryview(buffer)[:length])
+                busy["compute"] += time.perf_counter() - start
+                free_buffers.put(buffer)
+                if output:
+                    write_queue.put(output)
+            if finished and not errors:
+                start = time.perf_counter()
+                output = compute(None)
+                busy["compute"] += time.perf_counter() - start
+                if output:
+                    write_queue.put(output)
+        finally:
+            if not finished:
+                # Stop the reader and free it if it is waiting for a buffer or for space in the queue
+                stop.set()
+                free_buffers.put(bytearray(0))
+                while read_queue.get() is not None:
+                    pass
+            write_queue.put(None)
+            reader_thread.join()
+            writer_thread.join()
+        self.seconds = time.perf_counter() - start_time
+        self.utilization = {stage: seconds / max(self.seconds, 1e-9) for stage, seconds in busy.items()}
+        if errors:
+            raise errors[0]
+        return self.utilization
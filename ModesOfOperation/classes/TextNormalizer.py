@@ -0,0 +1,114 @@
+'''
+	Name: TextNormalizer.py
+	Laboratory 3 - Modes of operation
+    Authors:
+		* María José Salmerón Contreras
+		* Edgar Alejandro Ramírez Fuentes
+
+    Normalization of the plaintext before it is encrypted: the characters outside the alphabet are deleted and the
+    uppercase letters are folded to lowercase in a single translate pass with a precomputed table.
+    It is shared by the CBC, CFB and CTR laboratories.
+'''
+
+ENGLISH_ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+
+class TranslationTable(dict):
+    '''
+        Translation table of str.translate: the characters that are not in the table are deleted.
+        str.translate only looks up once every different ASCII character, so the deletion of the others is cheap.
+    '''
+    def __missing__(self, character : int):
+        return None
+
+
+class TextNormalizer:
+    '''
+        This class is used to keep only the characters of an alphabet in a text, folding the case of the letters
+    '''
+    def __init__(self, alphabet : str = ENGLISH_ALPHABET, lowercase : bool = True):
+        '''
+            Initialize the TextNormalizer object and build its translation tables
+
+            Parameters
+            --------------
+            alphabet : str
+                It is the characters kept in the text
+
+            lowercase : bool
+                If it is True, the uppercase version of every letter of the alphabet is kept as the letter
+        '''
+        if not alphabet:
+            raise ValueError("The alphabet must contain at least one character")
+        self.alphabet = alphabet
+        self.__table = TranslationTable((ord(character), character) for character in alphabet)
+        if lowercase:
+            for character in alphabet:
+                if len(character.upper()) == 1 and character.upper() not in alphabet:
+                    self.__table[ord(character.upper())] = character
+        # Tables of bytes.translate for the characters of one byte (latin-1): map every byte, and delete the others
+        byte_table = bytearray(range(256))
+        kept = bytearray()
+        for code, character in self.__table.items():
+            if code < 256 and ord(character) < 256:
+                byte_table[code] = ord(character)
+                kept.append(code)
+        self.__byte_table = bytes(byte_table)
+        self.__deleted_bytes = bytes(code for code in range(256) if code not in kept)
+
+
+    def normalize(self, text : str):
+        '''
+            Normalize a text in a single str.translate pass
+
+            Parameters
+            --------------
+            text : str
+                It is the text that will be normalized
+
+            Returns
+            --------------
+            str
+                It is the text with only the characters of the alphabet
+        '''
+        return text.translate(self.__table)
+
+
+    def normalize_bytes(self, data : bytes):
+        '''
+            Normalize a text encoded in latin-1 (or ASCII) in a single bytes.translate pass
+
+            Parameters
+            --------------
+            data : bytes
+                It is the encoded text that will be normalized
+
+            Returns
+            --------------
+            bytes
+                It is the encoded text with only the characters of the alphabet
+        '''
+        return data.translate(self.__byte_table, self.__deleted_bytes)
+
+
+    def normalize_stream(self, reader, chunk_size : int = 1024 * 1024):
+        '''
+            Normalize a file object chunk by chunk. Every character is normalized on its own, so the chunks are independent.
+
+            Parameters
+            --------------
+            reader : file object
+                It is the file object (opened in text or binary mode) that contains the text
+
+            chunk_size : int
+                It is the number of characters (or bytes) read each time
+
+            Returns
+            --------------
+            generator[str] or generator[bytes]
+                It generates the normalized chunks (str for text mode, bytes for binary mode)
+        '''
+        chunk = reader.read(chunk_size)
+        while chunk:
+            yield self.normalize_bytes(chunk) if isinstance(chunk, (bytes, bytearray)) else self.normalize(chunk)
+            chunk = reader.read(chunk_size)
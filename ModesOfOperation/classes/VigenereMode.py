@@ -0,0 +1,872 @@
+'''
+	Name: VigenereMode.py
+	Laboratory 3 - Modes of operation
+    Authors:
+		* María José Salmerón Contreras
+		* Edgar Alejandro Ramírez Fuentes
+
+    Text encryption of the CBC and CFB laboratories: the text is normalized, encrypted with the Vigenere cipher through a mode
+    of ModesOfOperation, and stored as base 64 blocks separated by & or in a binary container (see CipherContainer).
+    The block transform is base64 (Vigenere cipher over base 64 letters) or bytes (Vigenere cipher over raw bytes),
+    and the last block is completed with *.
+'''
+
+from concurrent.futures import ProcessPoolExecutor
+import mmap
+import os
+import random
+
+import numpy as np
+
+from .Base64VigenereCipher import Base64VigenereCipher
+from .BlockTransform import BASE64_ALPHABET, Base64Transform
+from .ByteVigenereCipher import ByteVigenereCipher
+from .CipherContainer import CipherContainerReader, CipherContainerWriter, get_block_letters, get_block_length
+from .PipelineRunner import PipelineRunner
+from .TextNormalizer import TextNormalizer
+
+
+def generate_key(size : int):
+    '''
+        Generates a random key base 64
+
+        Parameters
+        ------------
+        size : int
+            It is the key size
+
+        Returns
+        ------------
+        random_key : str
+            It is the random key generated
+    '''
+    alphabet = BASE64_ALPHABET.decode("ascii")
+    random_key = ""
+    for i in range(size):
+        random_key += random.choice(alphabet)
+    return random_key
+
+
+def read_keys(filename : str):
+    '''
+        Get the initialization vector and the key stored in a file as iv&key
+
+        Parameters
+        ------------
+        filename : str
+            It is the filename (with extension) that contains the keys
+
+        Returns
+        ------------
+        iv : str
+            It is the initialization vector
+
+        key : str
+            It is the key used for the Vigenere cipher
+    '''
+    with open(filename, "r") as reader:
+        iv, key = reader.read().split("&")
+    return iv, key
+
+
+def write_keys(filename : str, iv : str, key : str):
+    '''
+        Create a file, and write the initialization vector and the key as iv&key
+
+        Parameters
+        ------------
+        filename : str
+            It is the name (with extension) that the new file will get
+
+        iv : str
+            It is the initialization vector
+
+        key : str
+            It is the key used for the Vigenere cipher
+    '''
+    with open(filename, "w") as writer:
+        writer.write(iv + "&" + key)
+
+
+def join_blocks(encrypted_letters : bytes, block_letters : int):
+    '''
+        Add the & character between the encrypted blocks to split them in the decryption process
+
+        Parameters
+        ------------
+        encrypted_letters : bytes
+            It is the concatenation of the encrypted blocks (base 64 without the = padding, only the last one can be incomplete)
+
+        block_letters : int
+            It is the number of letters of an encrypted block
+
+        Returns
+        ------------
+        bytes
+            It is the encrypted blocks separated by &
+    '''
+    count = len(encrypted_letters) // block_letters
+    joined = b""
+    if count:
+        blocks = np.full((count, block_letters + 1), ord("&"), dtype=np.uint8)
+        blocks[:, :block_letters] = np.frombuffer(encrypted_letters, dtype=np.uint8, count=count * block_letters).reshape(count, block_letters)
+        joined = blocks.tobytes()[:-1]
+    if count * block_letters < len(encrypted_letters):
+        joined += (b"&" if count else b"") + bytes(encrypted_letters[count * block_letters :])
+    return joined
+
+
+def split_blocks(encrypted_text : bytes, block_letters : int):
+    '''
+        Remove the & character between the encrypted blocks. Every block but the last one must have block_letters letters;
+        if the text ends with &, the blocks continue in the next part of the file.
+
+        Parameters
+        ------------
+        encrypted_text : bytes
+            It is the encrypted blocks separated by &
+
+        block_letters : int
+            It is the number of letters of an encrypted block
+
+        Returns
+        ------------
+        bytes
+            It is the concatenation of the encrypted blocks
+    '''
+    count = len(encrypted_text) // (block_letters + 1)
+    blocks = np.frombuffer(encrypted_text, dtype=np.uint8, count=count * (block_letters + 1)).reshape(count, block_letters + 1)
+    last_block = bytes(encrypted_text[count * (block_letters + 1) :])
+    if (blocks[:, -1] != ord("&")).any() or b"&" in last_block:
+        raise ValueError(f"Every encrypted block but the last one must have {block_letters} letters")
+    return blocks[:, :block_letters].tobytes() + last_block
+
+
+def decrypt_file_range(mode, encrypted_filename : str, container : bool, iv : bytes, first_block : int, last_block : int):
+    '''
+        Decrypt the encrypted blocks first_block ... last_block (both included) of a file in a worker process (see VigenereMode.decrypt_parallel).
+        Only the range is read through a memory map, with the encrypted block before it, which is the state of the mode at its first block.
+
+        Parameters
+        ------------
+        mode : ModeOfOperation
+            It is the mode of operation (with its block cipher)
+
+        encrypted_filename : str
+            It is the filename (with extension) that contains the encrypted text or the container
+
+        container : bool
+            If it is True, the file is a binary container instead of blocks separated by &
+
+        iv : bytes
+            It is the initialization vector, the state of the first block of the file
+
+        first_block : int
+            It is the index of the first block of the range
+
+        last_block : int
+            It is the index of the last block of the range
+
+        Returns
+        ------------
+        bytes
+            It is the decrypted range
+    '''
+    previous_block = max(first_block - 1, 0)
+    if container:
+        with CipherContainerReader(encrypted_filename) as encrypted_container:
+            encrypted_letters = encrypted_container.read_letters(previous_block, last_block)
+    else:
+        block_letters = mode.encoded_size
+        with open(encrypted_filename, "rb") as reader, mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ) as encrypted_map:
+            encrypted_letters = split_blocks(encrypted_map[previous_block * (block_letters + 1) : (last_block + 1) * (block_letters + 1) - 1], block_letters)
+    state = mode.get_state(iv)
+    if first_block > 0:
+        state = mode.get_range_state(encrypted_letters, state, 1, False)
+        encrypted_letters = memoryview(encrypted_letters)[mode.encoded_size :]
+    return mode.decrypt_blocks(encrypted_letters, state)[0]
+
+
+class SeparatedBlockWriter:
+    '''
+        File object that writes the encrypted blocks separated by &, continuing the blocks already written
+    '''
+    def __init__(self, writer, block_letters : int, written : bool = False):
+        '''
+            Initialize the SeparatedBlockWriter object
+
+            Parameters
+            ------------
+            writer : file object
+                It is the file object (opened in binary mode) that will store the encrypted blocks
+
+            block_letters : int
+                It is the number of letters of an encrypted block
+
+            written : bool
+                If it is True, the file object already has encrypted blocks, so the next block is preceded by &
+        '''
+        self.__writer = writer
+        self.__block_letters = block_letters
+        self.__written = written
+
+
+    def write(self, encrypted_letters : bytes):
+        '''
+            Write the next encrypted blocks
+
+            Parameters
+            ------------
+            encrypted_letters : bytes
+                It is the concatenation of the encrypted blocks (only the last block of the file can be incomplete)
+        '''
+        if not encrypted_letters:
+            return
+        self.__writer.write((b"&" if self.__written else b"") + join_blocks(encrypted_letters, self.__block_letters))
+        self.__written = True
+
+
+class VigenereMode:
+    '''
+        Base class of the CBC_Mode and CFB_Mode laboratories. A laboratory only chooses its mode of operation (see ModesOfOperation),
+        which encrypts the blocks; this class reads and writes the text, the keys and the containers.
+    '''
+    # Mode of operation of ModesOfOperation that encrypts the blocks
+    mode = None
+
+    def __init__(self):
+        self.__iv = generate_key(10)
+        # Key used for the Vigenere cipher
+        self.__key = generate_key(10)
+        self.__normalizer = TextNormalizer()
+
+
+    def get_key(self):
+        '''
+            Get the key used for the Vigenere cipher
+
+            Returns
+            ---------------
+            key : str
+                It is the key used for the Vigenere cipher
+        '''
+        return self.__key
+
+
+    def get_iv(self):
+        '''
+            Get the initialization vector used for the mode
+
+            Returns
+            ---------------
+            iv : str
+                It is the initialization vector used for the mode
+        '''
+        return self.__iv
+
+
+    def __get_mode(self, key : str, block_size : int, transform : str):
+        '''
+            Get the mode of operation that encrypts blocks of block_size bytes with the Vigenere cipher of the block transform.
+            The last block is completed with *, and the * are kept in the decrypted data.
+
+            Parameters
+            -------------
+            key : str
+                It is the key used for the Vigenere cipher
+
+            block_size : int
+                It is the number of bytes of a plaintext block (the IV length)
+
+            transform : str
+                It is the block transform: base64 (Vigenere cipher over base 64 letters) or bytes (Vigenere cipher over raw bytes)
+
+            Returns
+            -------------
+            ModeOfOperation
+                It is the mode of operation
+        '''
+        get_block_length(block_size, transform)
+        if transform == "bytes":
+            return self.mode(ByteVigenereCipher(key, block_size), fill=b"*")
+        base64_transform = Base64Transform(block_size)
+        # The CBC Mode encrypts the encoded blocks, the CFB Mode encrypts the first block_size letters of the previous one
+        cipher_size = base64_transform.encoded_size if self.mode.encrypts_encoded_blocks else block_size
+        return self.mode(Base64VigenereCipher(key, cipher_size), base64_transform, b"*")
+
+
+    def __open_container(self, encrypted_filename : str, key : str):
+        '''
+            Open a binary container, checking that it was encrypted using the mode and the key provided
+
+            Parameters
+            -------------
+            encrypted_filename : str
+                It is the filename (with extension) of the container
+
+            key : str
+                It is the key used for the Vigenere cipher
+
+            Returns
+            -------------
+            CipherContainerReader
+                It is the open container
+        '''
+        container = CipherContainerReader(encrypted_filename)
+        try:
+            if container.mode != self.mode.name:
+                raise ValueError(f"The container was not encrypted using the {self.mode.name} Mode")
+            container.check_key(key)
+        except ValueError:
+            container.close()
+            raise
+        return container
+
+
+    def __get_output(self, writer, key : str, iv : str, container : bool, transform : str):
+        '''
+            Get the file object that stores the encrypted blocks: a binary container, or the blocks separated by &
+
+            Parameters
+            -------------
+            writer : file object
+                It is the file object (opened in binary mode) that will store the encrypted text
+
+            key : str
+                It is the key used for the Vigenere cipher
+
+            iv : str
+                It is the initialization vector
+
+            container : bool
+                If it is True, the encrypted text is stored in a binary container instead of blocks separated by &
+
+            transform : str
+                It is the block transform: base64 or bytes (it needs the container)
+
+            Returns
+            -------------
+            CipherContainerWriter or SeparatedBlockWriter
+                It is the file object whose write method stores the encrypted blocks
+        '''
+        if container:
+            return CipherContainerWriter(writer, self.mode.name, len(iv), iv, key, transform)
+        if transform == "bytes":
+            raise ValueError("The blocks encrypted using the bytes transform can only be stored in a binary container")
+        return SeparatedBlockWriter(writer, get_block_letters(len(iv)))
+
+
+    def encrypt_bytes(self, data : bytes, key : str = None, iv : str = None, transform : str = "base64"):
+        '''
+            Encrypt the data without prompting anything. The data is padded with * to fulfill the block size (the IV length).
+
+            Parameters
+            -------------
+            data : bytes
+                It is the plaintext that will be encrypted
+
+            key : str
+                It is the key used for the Vigenere cipher. By default, the key of the object.
+
+            iv : str
+                It is the initialization vector. By default, the initialization vector of the object.
+
+            transform : str
+                It is the block transform: base64 (Vigenere cipher over base 64 letters) or bytes (Vigenere cipher over raw bytes)
+
+            Returns
+            -------------
+            encrypted_data : bytes
+                It is the encrypted blocks (base 64) separated by &, or the concatenation of the encrypted blocks for the bytes transform
+        '''
+        iv = iv or self.__iv
+        encrypted_data = self.__get_mode(key or self.__key, len(iv), transform).encrypt(data, iv.encode("ascii"))
+        if transform == "bytes":
+            # Every encrypted block has the block size, so they are not separated
+            return encrypted_data
+        return join_blocks(encrypted_data, get_block_letters(len(iv)))
+
+
+    def decrypt_bytes(self, encrypted_data : bytes, key : str = None, iv : str = None, transform : str = "base64"):
+        '''
+            Decrypt the data without prompting anything
+
+            Parameters
+            -------------
+            encrypted_data : bytes
+                It is the encrypted blocks (base 64) separated by &, or the concatenation of the encrypted blocks for the bytes transform
+
+            key : str
+                It is the key used for the Vigenere cipher. By default, the key of the object.
+
+            iv : str
+                It is the initialization vector. By default, the initialization vector of the object.
+
+            transform : str
+                It is the block transform used to encrypt the data: base64 or bytes
+
+            Returns
+            -------------
+            data : bytes
+                It is the decrypted data (with the padding added during the encryption)
+        '''
+        iv = iv or self.__iv
+        mode = self.__get_mode(key or self.__key, len(iv), transform)
+        if transform == "base64":
+            encrypted_data = split_blocks(encrypted_data, get_block_letters(len(iv)))
+        return mode.decrypt(encrypted_data, iv.encode("ascii"))
+
+
+    def encrypt_container(self, data : bytes, writer, key : str = None, iv : str = None, transform : str = "base64"):
+        '''
+            Encrypt the data and write it in a binary container (see CipherContainer)
+
+            Parameters
+            -------------
+            data : bytes
+                It is the plaintext that will be encrypted
+
+            writer : file object
+                It is the file object (opened in binary mode) that will store the container
+
+            key : str
+                It is the key used for the Vigenere cipher. By default, the key of the object.
+
+            iv : str
+                It is the initialization vector. By default, the initialization vector of the object.
+
+            transform : str
+                It is the block transform: base64 (Vigenere cipher over base 64 letters) or bytes (Vigenere cipher over raw bytes)
+        '''
+        key = key or self.__key
+        iv = iv or self.__iv
+        with CipherContainerWriter(writer, self.mode.name, len(iv), iv, key, transform) as container:
+            container.write_letters(self.__get_mode(key, len(iv), transform).encrypt(data, iv.encode("ascii")))
+
+
+    def encrypt_append(self, data : bytes, encrypted_filename : str, key : str = None, iv : str = None, container : bool = False):
+        '''
+            Encrypt the data and append it to an encrypted file without encrypting its blocks again.\n
+            The next block only depends on the last encrypted block, so only the tail of the file is read (the last block, and the
+            index and footer of a container) and the cost depends on the size of the data, not on the size of the file.
+            The padding of the last block of the file stays in the middle of the decrypted text.
+
+            Parameters
+            -------------
+            data : bytes
+                It is the plaintext that will be appended
+
+            encrypted_filename : str
+                It is the filename (with extension) that contains the encrypted text or the container
+
+            key : str
+                It is the key used for the Vigenere cipher. By default, the key of the object.
+
+            iv : str
+                It is the initialization vector of the encrypted text. By default, the initialization vector of the object (the container stores its own).
+
+            container : bool
+                If it is True, the file is a binary container instead of blocks separated by &
+        '''
+        key = key or self.__key
+        if not data:
+            return
+        if container:
+            with self.__open_container(encrypted_filename, key) as encrypted_container:
+                iv, block_size, transform = encrypted_container.iv, encrypted_container.block_size, encrypted_container.transform
+                previous_block = iv.encode("ascii")
+                if encrypted_container.block_count:
+                    previous_block = encrypted_container.read_letters(encrypted_container.block_count - 1)[:block_size]
+            # The data is encrypted before the index and the footer of the container are removed, so an error leaves it untouched
+            encrypted_letters = self.__get_mode(key, block_size, transform).encrypt(data, previous_block)
+            with open(encrypted_filename, "r+b") as writer:
+                with CipherContainerWriter(writer, self.mode.name, block_size, iv, key, transform, append=True) as output:
+                    output.write_letters(encrypted_letters)
+            return
+        iv = iv or self.__iv
+        block_letters = get_block_letters(len(iv))
+        with open(encrypted_filename, "r+b") as writer:
+            end = writer.seek(0, 2)
+            previous_block = iv.encode("ascii")
+            if end:
+                # Every encrypted block has block_letters letters, the state is the first len(iv) of the last one
+                writer.seek(end - block_letters)
+                previous_block = writer.read(len(iv))
+            encrypted_letters = self.__get_mode(key, len(iv), "base64").encrypt(data, previous_block)
+            writer.seek(end)
+            SeparatedBlockWriter(writer, block_letters, end > 0).write(encrypted_letters)
+
+
+    def decrypt_container(self, encrypted_filename : str, key : str = None):
+        '''
+            Decrypt a binary container. The initialization vector is read from the container.
+
+            Parameters
+            -------------
+            encrypted_filename : str
+                It is the filename (with extension) of the container
+
+            key : str
+                It is the key used for the Vigenere cipher. By default, the key of the object.
+
+            Returns
+            -------------
+            data : bytes
+                It is the decrypted data (with the padding added during the encryption)
+        '''
+        key = key or self.__key
+        with self.__open_container(encrypted_filename, key) as container:
+            mode = self.__get_mode(key, container.block_size, container.transform)
+            return mode.decrypt(container.read_letters(), container.iv.encode("ascii"))
+
+
+    def encrypt_file(self, reader, writer, key : str = None, iv : str = None, transform : str = "base64"):
+        '''
+            Encrypt the data of a file object and write the encrypted data in another file object
+
+            Parameters
+            -------------
+            reader : file object
+                It is the file object (opened in binary mode) that contains the plaintext
+
+            writer : file object
+                It is the file object (opened in binary mode) that will store the encrypted data
+
+            key : str
+                It is the key used for the Vigenere cipher. By default, the key of the object.
+
+            iv : str
+                It is the initialization vector. By default, the initialization vector of the object.
+
+            transform : str
+                It is the block transform: base64 (Vigenere cipher over base 64 letters) or bytes (Vigenere cipher over raw bytes)
+        '''
+        writer.write(self.encrypt_bytes(reader.read(), key, iv, transform))
+
+
+    def decrypt_file(self, reader, writer, key : str = None, iv : str = None, transform : str = "base64"):
+        '''
+            Decrypt the data of a file object and write the decrypted data in another file object
+
+            Parameters
+            -------------
+            reader : file object
+                It is the file object (opened in binary mode) that contains the encrypted data
+
+            writer : file object
+                It is the file object (opened in binary mode) that will store the decrypted data
+
+            key : str
+                It is the key used for the Vigenere cipher. By default, the key of the object.
+
+            iv : str
+                It is the initialization vector. By default, the initialization vector of the object.
+
+            transform : str
+                It is the block transform: base64 (Vigenere cipher over base 64 letters) or bytes (Vigenere cipher over raw bytes)
+        '''
+        writer.write(self.decrypt_bytes(reader.read(), key, iv, transform))
+
+
+    def encrypt_stream(self, reader, writer, key : str = None, iv : str = None, container : bool = False, chunk_size : int = 1024 * 1024, transform : str = "base64"):
+        '''
+            Encrypt a text file object chunk by chunk, so the memory used does not depend on the size of the plaintext.\n
+            Each chunk is normalized and its complete blocks are encrypted and written immediately (see ModeOfOperation.encryptor);
+            the incomplete block is carried to the next chunk and the padding is added only at the end of the text.
+
+            Parameters
+            -------------
+            reader : file object
+                It is the file object (opened in text mode) that contains the plaintext
+
+            writer : file object
+                It is the file object (opened in binary mode) that will store the encrypted text
+
+            key : str
+                It is the key used for the Vigenere cipher. By default, the key of the object.
+
+            iv : str
+                It is the initialization vector. By default, the initialization vector of the object.
+
+            container : bool
+                If it is True, the encrypted text is stored in a binary container instead of blocks separated by &
+
+            chunk_size : int
+                It is the number of characters read each time
+
+            transform : str
+                It is the block transform: base64 (Vigenere cipher over base 64 letters) or bytes (Vigenere cipher over raw bytes, it needs the container)
+        '''
+        key = key or self.__key
+        iv = iv or self.__iv
+        encryptor = self.__get_mode(key, len(iv), transform).encryptor(iv.encode("ascii"))
+        output = self.__get_output(writer, key, iv, container, transform)
+        for chunk in self.__normalizer.normalize_stream(reader, chunk_size):
+            output.write(encryptor.update(chunk.encode("latin-1")))
+        output.write(encryptor.finalize())
+        if container:
+            output.close()
+
+
+    def encrypt_pipelined(self, reader, writer, key : str = None, iv : str = None, container : bool = False, transform : str = "base64", runner : PipelineRunner = None):
+        '''
+            Encrypt a text file object like encrypt_stream, but reading, encrypting and writing the chunks at the same time
+            with a PipelineRunner (see ModeOfOperation.encrypt_pipelined).\n
+            The chunks are normalized as bytes: the letters of the alphabet are ASCII, so the other UTF-8 characters are deleted as well.
+
+            Parameters
+            -------------
+            reader : file object
+                It is the file object (opened in binary mode) that contains the plaintext
+
+            writer : file object
+                It is the file object (opened in binary mode) that will store the encrypted text
+
+            key : str
+                It is the key used for the Vigenere cipher. By default, the key of the object.
+
+            iv : str
+                It is the initialization vector. By default, the initialization vector of the object.
+
+            container : bool
+                If it is True, the encrypted text is stored in a binary container instead of blocks separated by &
+
+            transform : str
+                It is the block transform: base64 (Vigenere cipher over base 64 letters) or bytes (Vigenere cipher over raw bytes, it needs the container)
+
+            runner : PipelineRunner
+                It is the runner with the buffer size and the queue depth. By default, a runner with buffers of 1 MB.
+
+            Returns
+            -------------
+            utilization : dict
+                It is the fraction of the time that the read, compute and write stages were busy
+        '''
+        key = key or self.__key
+        iv = iv or self.__iv
+        mode = self.__get_mode(key, len(iv), transform)
+        output = self.__get_output(writer, key, iv, container, transform)
+        utilization = mode.encrypt_pipelined(reader, output, iv.encode("ascii"), runner, self.__normalizer.normalize_bytes)
+        if container:
+            output.close()
+        return utilization
+
+
+    def decrypt_stream(self, encrypted_filename : str, writer, key : str = None, iv : str = None, container : bool = False, chunk_size : int = 1024 * 1024):
+        '''
+            Decrypt a file chunk by chunk, so the memory used does not depend on the size of the encrypted text
+
+            Parameters
+            -------------
+            encrypted_filename : str
+                It is the filename (with extension) that contains the encrypted text
+
+            writer : file object
+                It is the file object (opened in binary mode) that will store the decrypted data
+
+            key : str
+                It is the key used for the Vigenere cipher. By default, the key of the object.
+
+            iv : str
+                It is the initialization vector. By default, the initialization vector of the object (the container stores its own).
+
+            container : bool
+                If it is True, the encrypted text is read from a binary container instead of blocks separated by &
+
+            chunk_size : int
+                It is the number of bytes read each time
+        '''
+        key = key or self.__key
+        if container:
+            with self.__open_container(encrypted_filename, key) as encrypted_container:
+                decryptor = self.__get_mode(key, encrypted_container.block_size, encrypted_container.transform).decryptor(encrypted_container.iv.encode("ascii"))
+                for encrypted_letters in encrypted_container.iter_letters(max(chunk_size // encrypted_container.record_size, 1)):
+                    writer.write(decryptor.update(encrypted_letters))
+            writer.write(decryptor.finalize())
+            return
+        iv = iv or self.__iv
+        block_letters = get_block_letters(len(iv))
+        decryptor = self.__get_mode(key, len(iv), "base64").decryptor(iv.encode("ascii"))
+        # Every chunk has whole blocks followed by &, so the separators are removed chunk by chunk
+        chunk_size = max(chunk_size // (block_letters + 1), 1) * (block_letters + 1)
+        with open(encrypted_filename, "rb") as reader:
+            for chunk in iter(lambda: reader.read(chunk_size), b""):
+                writer.write(decryptor.update(split_blocks(chunk, block_letters)))
+        writer.write(decryptor.finalize())
+
+
+    def decrypt_range(self, encrypted_filename : str, first_block : int, last_block : int, key : str = None):
+        '''
+            Decrypt the blocks first_block ... last_block (both included) of a binary container without reading the rest of it
+
+            Parameters
+            -------------
+            encrypted_filename : str
+                It is the filename (with extension) of the container
+
+            first_block : int
+                It is the index of the first block
+
+            last_block : int
+                It is the index of the last block
+
+            key : str
+                It is the key used for the Vigenere cipher. By default, the key of the object.
+
+            Returns
+            -------------
+            data : bytes
+                It is the decrypted blocks
+        '''
+        key = key or self.__key
+        with self.__open_container(encrypted_filename, key) as container:
+            # The state of the first block is the iv, the state of the others is the previous encrypted block
+            if first_block == 0:
+                previous_block = container.iv.encode("ascii")
+            else:
+                previous_block = container.read_letters(first_block - 1, first_block - 1)[: container.block_size]
+            mode = self.__get_mode(key, container.block_size, container.transform)
+            return mode.decrypt(container.read_letters(first_block, last_block), previous_block)
+
+
+    def decrypt_parallel(self, encrypted_filename : str, writer, key : str = None, iv : str = None, container : bool = False, workers : int = None, blocks_per_task : int = 1024 * 1024):
+        '''
+            Decrypt a file in a pool of processes. A block only needs the previous encrypted block, so the file is divided in ranges of blocks,
+            each worker maps and decrypts its own range (see decrypt_file_range) and the ranges are written in order.
+            The file is never read whole by this process.
+
+            Parameters
+            -------------
+            encrypted_filename : str
+                It is the filename (with extension) that contains the encrypted text
+
+            writer : file object
+                It is the file object (opened in binary mode) that will store the decrypted data
+
+            key : str
+                It is the key used for the Vigenere cipher. By default, the key of the object.
+
+            iv : str
+                It is the initialization vector. By default, the initialization vector of the object (the container stores its own).
+
+            container : bool
+                If it is True, the encrypted text is read from a binary container instead of blocks separated by &
+
+            workers : int
+                It is the number of processes. By default, one per core.
+
+            blocks_per_task : int
+                It is the number of blocks decrypted by a worker each time
+        '''
+        key = key or self.__key
+        if container:
+            with self.__open_container(encrypted_filename, key) as encrypted_container:
+                iv, block_size, transform = encrypted_container.iv, encrypted_container.block_size, encrypted_container.transform
+                block_count = encrypted_container.block_count
+        else:
+            iv, transform = iv or self.__iv, "base64"
+            block_size = len(iv)
+            # Every block but the last one is followed by &
+            block_count = (os.path.getsize(encrypted_filename) + 1) // (get_block_letters(block_size) + 1)
+        mode = self.__get_mode(key, block_size, transform)
+        if not mode.parallel_decryption:
+            raise ValueError(f"The {mode.name} mode can not decrypt its blocks in parallel")
+        with ProcessPoolExecutor(workers) as executor:
+            futures = [
+                executor.submit(decrypt_file_range, mode, encrypted_filename, container, iv.encode("ascii"), first_block, min(first_block + blocks_per_task, block_count) - 1)
+                for first_block in range(0, block_count, blocks_per_task)
+            ]
+            for future in futures:
+                writer.write(future.result())
+
+
+    def encrypt(self, filename : str, keys_filename : str = None, encrypted_filename : str = None, container : bool = False, transform : str = "base64", runner : PipelineRunner = None):
+        '''
+            Encrypt the plaintext from the textfile provided
+
+            Parameters
+            -------------
+            filename : str
+                It is the filename (with extension) that contains the plaintext
+
+            keys_filename : str
+                It is the filename (with extension) that will store the keys. It is asked if it is not provided.
+
+            encrypted_filename : str
+                It is the filename (with extension) that will store the encrypted text. It is asked if it is not provided.
+
+            container : bool
+                If it is True, the encrypted text is stored in a binary container instead of text
+
+            transform : str
+                It is the block transform: base64 (Vigenere cipher over base 64 letters) or bytes (Vigenere cipher over raw bytes, it needs the container)
+
+            runner : PipelineRunner
+                If it is provided, the file is read, encrypted and written at the same time (see encrypt_pipelined)
+        '''
+        with open(filename, "rb") if runner else open(filename, "r", encoding="utf-8") as reader:
+            # Store the keys needed to decrypt the message
+            keys_filename = keys_filename or input("Input the filename (with extension) that will store the keys: ")
+            write_keys(keys_filename, self.__iv, self.__key)
+
+            encrypted_filename = encrypted_filename or input("Input the filename (with extension) that will store the encrypted text: ")
+            with open(encrypted_filename, "wb") as writer:
+                if runner:
+                    self.encrypt_pipelined(reader, writer, container=container, transform=transform, runner=runner)
+                else:
+                    self.encrypt_stream(reader, writer, container=container, transform=transform)
+
+
+    def append(self, filename : str, keys_filename : str, encrypted_filename : str, container : bool = False):
+        '''
+            Encrypt the plaintext from the textfile provided and append it to an encrypted file (see encrypt_append)
+
+            Parameters
+            -------------
+            filename : str
+                It is the filename (with extension) that contains the plaintext
+
+            keys_filename : str
+                It is the filename (with extension) that contains the keys used to encrypt the file
+
+            encrypted_filename : str
+                It is the filename (with extension) that contains the encrypted text
+
+            container : bool
+                If it is True, the encrypted text is stored in a binary container instead of text
+        '''
+        iv, key = read_keys(keys_filename)
+        with open(filename, "r", encoding="utf-8") as reader:
+            text = self.__normalizer.normalize(reader.read())
+        self.encrypt_append(text.encode("latin-1"), encrypted_filename, key, iv, container)
+
+
+    def decrypt(self, encrypted_filename : str, keys_filename : str, decrypted_filename : str = None, container : bool = False, workers : int = None):
+        '''
+            Decrypt the encrypted text from the textfile provided
+
+            Parameters
+            -------------
+            encrypted_filename : str
+                It is the filename (with extension) that contains the encrypted text
+
+            keys_filename : str
+                It is the filename (with extension) that contains the keys to decrypt the text
+
+            decrypted_filename : str
+                It is the filename (with extension) that will store the decrypted text. It is asked if it is not provided.
+
+            container : bool
+                If it is True, the encrypted text is read from a binary container instead of text
+
+            workers : int
+                If it is provided, the encrypted text is decrypted in a pool of workers processes instead of chunk by chunk
+        '''
+        iv, key = read_keys(keys_filename)
+        # Write the decrypted text in a textfile
+        decrypted_filename = decrypted_filename or input("Input the filename (with extension) that will store the decrypted text: ")
+        with open(decrypted_filename, "wb") as writer:
+            if workers:
+                self.decrypt_parallel(encrypted_filename, writer, key, iv, container, workers)
+            else:
+                self.decrypt_stream(encrypted_filename, writer, key, iv, container)
@@ -0,0 +1,75 @@
+'''
+	Name: main.py
+	Laboratory 3 - Modes of operation
+    Authors:
+		* María José Salmerón Contreras
+		* Edgar Alejandro Ramírez Fuentes
+
+    Encipher and decipher a file choosing the block cipher (Vigenere over bytes, DES, Triple DES or AES)
+    and the mode of operation (ECB, CBC, CFB, OFB or CTR).
+'''
+
+import base64
+import os
+
+from Crypto.Cipher import DES3
+
+from classes.ByteVigenereCipher import ByteVigenereCipher
+from classes.CryptodomeCipher import CryptodomeCipher
+from classes.ModesOfOperation import ECB_Mode, CBC_Mode, CFB_Mode, OFB_Mode, CTR_Mode
+
+CIPHERS = {1: "Vigenere", 2: "DES", 3: "DES3", 4: "AES"}
+MODES = {1: ECB_Mode, 2: CBC_Mode, 3: CFB_Mode, 4: OFB_Mode, 5: CTR_Mode}
+
+
+def get_cipher(algorithm : str, key : bytes):
+    '''
+        Create the block cipher of the algorithm with the key
+    '''
+    if algorithm == "Vigenere":
+        return ByteVigenereCipher(key)
+    return CryptodomeCipher(algorithm, key)
+
+
+def generate_key(algorithm : str):
+    '''
+        Generate a random key for the algorithm
+    '''
+    if algorithm == "Vigenere":
+        return os.urandom(10)
+    if algorithm == "DES3":
+        return DES3.adjust_key_parity(os.urandom(24))
+    return os.urandom(8 if algorithm == "DES" else 16)
+
+
+if __name__ == "__main__":
+    print("Choose the block cipher \n1. Vigenere (bytes) \n2. DES \n3. Triple DES \n4. AES")
+    algorithm = CIPHERS.get(int(input("")))
+    print("Choose the mode of operation \n1. ECB \n2. CBC \n3. CFB \n4. OFB \n5. CTR")
+    mode = MODES.get(int(input("")))
+    print("Choose the operation you want to do \n1. Encipher file \n2. Decipher file")
+    operation = int(input(""))
+    if algorithm is None or mode is None:
+        print("Wrong option")
+    elif operation == 1:
+        filename = input("Input the filename (with extension) that contains the plaintext: ")
+        keys_filename = input("Input the filename (with extension) that will store the keys: ")
+        encrypted_filename = input("Input the filename (with extension) that will store the encrypted file: ")
+        key = generate_key(algorithm)
+        cipher = get_cipher(algorithm, key)
+        iv = os.urandom(cipher.block_size)
+        # The keys file stores the key and the initialization vector in base 64
+        with open(keys_filename, "w") as writer:
+            writer.write(f"{base64.standard_b64encode(key).decode('ascii')}\n{base64.standard_b64encode(iv).decode('ascii')}")
+        with open(filename, "rb") as reader, open(encrypted_filename, "wb") as writer:
+            mode(cipher).encrypt_stream(reader, writer, iv)
+    elif operation == 2:
+        encrypted_filename = input("Input the filename (with extension) that contains the encrypted file: ")
+        keys_filename = input("Input the filename (with extension) that contains the keys: ")
+        decrypted_filename = input("Input the filename (with extension) that will store the decrypted file: ")
+        with open(keys_filename, "r") as reader:
+            key, iv = (base64.standard_b64decode(line) for line in reader.read().split())
+        with open(encrypted_filename, "rb") as reader, open(decrypted_filename, "wb") as writer:
+            mode(get_cipher(algorithm, key)).decrypt_stream(reader, writer, iv)
+    else:
+        print("Wrong option")
@@ -0,0 +1,190 @@
+'''
+    Encrypt/decrypt large files with the Vigenere cipher using every core.
+
+    The Vigenere cipher only needs the position of a letter to know which key letter shifts it,
+    so the file is divided in ranges that are processed independently by a pool of processes.
+    Like the command line of VigenereCipher, only the letters are transformed and use a key position: the other characters
+    (spaces, new lines, punctuation...) are copied unchanged, so the letters before every range are counted first.
+'''
+
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+
+from VigenereCipher import VigenereCipher
+
+
+def count_range(input_filename : str, start : int, end : int):
+    '''
+        Count the letters of the range [start, end) of the input file
+
+        Parameters
+        ------------
+        input_filename : str
+            It is the filename (with extension) that contains the text
+
+        start : int
+            It is the position of the first byte of the range
+
+        end : int
+            It is the position after the last byte of the range
+
+        Return
+        ------------
+        int
+            It is the number of letters of the range
+    '''
+    with open(input_filename, "rb") as reader:
+        with mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ) as input_map:
+            return VigenereCipher().count_letters(input_map[start:end])
+
+
+def transform_range(input_filename : str, output_filename : str, key : str, direction : int, start : int, end : int, offset : int):
+    '''
+        Encrypt/decrypt the range [start, end) of the input file and write it in the same range of the output file.
+        The characters that are not letters are copied unchanged.
+
+        Parameters
+        ------------
+        input_filename : str
+            It is the filename (with extension) that contains the text
+
+        output_filename : str
+            It is the filename (with extension) of the preallocated output file
+
+        key : str
+            It is the key used to transform the text
+
+        direction : int
+            It is 1 to encrypt and -1 to decrypt
+
+        start : int
+            It is the position of the first byte of the range
+
+        end : int
+            It is the position after the last byte of the range
+
+        offset : int
+            It is the number of letters before the range, i.e. the key position of its first letter
+    '''
+    cipher = VigenereCipher()
+    with open(input_filename, "rb") as reader, open(output_filename, "r+b") as writer:
+        with mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ) as input_map, mmap.mmap(writer.fileno(), 0) as output_map:
+            if direction == 1:
+                output_map[start:end] = cipher.encrypt_bytes(input_map[start:end], key, offset, keep_other=True)
+            else:
+                output_map[start:end] = cipher.decrypt_bytes(input_map[start:end], key, offset, keep_other=True)
+
+
+class ParallelVigenereCipher:
+    '''
+        This class is used to encrypt/decrypt files using the Vigenere cipher in a process pool
+    '''
+    def __init__(self, workers : int = None, chunk_size : int = 64 * 1024 * 1024):
+        '''
+            Initialize the ParallelVigenereCipher object
+
+            Parameters
+            ------------
+            workers : int
+                It is the number of processes used. By default, one per core.
+
+            chunk_size : int
+                It is the number of bytes processed by a worker each time
+        '''
+        self.__workers = workers or os.cpu_count()
+        self.__chunk_size = chunk_size
+
+
+    def __transform_file(self, input_filename : str, output_filename : str, key : str, direction : int):
+        '''
+            Divide the input file in ranges, transform them in the process pool and write them in the output file.\n
+            The pool counts the letters of every range first, so each range starts at the key position of its first letter.
+            If a worker fails, the output file is deleted instead of being left partially written.
+
+            Parameters
+            ------------
+            input_filename : str
+                It is the filename (with extension) that contains the text
+
+            output_filename : str
+                It is the filename (with extension) that will store the result
+
+            key : str
+                It is the key used to transform the text
+
+            direction : int
+                It is 1 to encrypt and -1 to decrypt
+
+            Return
+            ------------
+            int
+                It is the number of letters transformed
+        '''
+        if not key:
+            raise ValueError("The key must contain at least one letter")
+        size = os.path.getsize(input_filename)
+        # Preallocate the output file so every worker writes its range in place
+        with open(output_filename, "wb") as writer:
+            writer.truncate(size)
+        if size == 0:
+            return 0
+        ranges = [(start, min(start + self.__chunk_size, size)) for start in range(0, size, self.__chunk_size)]
+        try:
+            with ProcessPoolExecutor(max_workers=self.__workers) as executor:
+                counts = [future.result() for future in [executor.submit(count_range, input_filename, start, end) for start, end in ranges]]
+                offsets = accumulate(counts, initial=0)
+                futures = [executor.submit(transform_range, input_filename, output_filename, key, direction, start, end, offset) for (start, end), offset in zip(ranges, offsets)]
+                for future in futures:
+                    future.result()
+        except BaseException:
+            os.remove(output_filename)
+            raise
+        return sum(counts)
+
+
+    def encrypt_file(self, input_filename : str, output_filename : str, key : str):
+        '''
+            Encrypt the plaintext contained in a file
+
+            Parameters
+            ------------
+            input_filename : str
+                It is the filename (with extension) that contains the plaintext
+
+            output_filename : str
+                It is the filename (with extension) that will store the encrypted text
+
+            key : str
+                It is the key used to encrypt the text
+
+            Return
+            ------------
+            int
+                It is the number of letters encrypted
+        '''
+        return self.__transform_file(input_filename, output_filename, key, 1)
+
+
+    def decrypt_file(self, input_filename : str, output_filename : str, key : str):
+        '''
+            Decrypt the encrypted text contained in a file
+
+            Parameters
+            ------------
+            input_filename : str
+                It is the filename (with extension) that contains the encrypted text
+
+            output_filename : str
+                It is the filename (with extension) that will store the decrypted text
+
+            key : str
+                It is the key used to decrypt the text
+
+            Return
+            ------------
+            int
+                It is the number of letters decrypted
+        '''
+        return self.__transform_file(input_filename, output_filename, key, -1)
@@ -0,0 +1,263 @@
+'''
+    Cryptanalysis of the Vigenere cipher: key length estimation (Kasiski examination and index of coincidence)
+    and key recovery (chi-squared test against the letter frequencies of the language).
+
+    Every statistic is computed with NumPy histograms over the whole text, so a 1 MB text is analyzed in a fraction of a second.
+'''
+
+import math
+import sys
+
+import numpy as np
+
+
+# Relative frequency (percentage) of each letter in English text
+ENGLISH_FREQUENCIES = {
+    'a': 8.167, 'b': 1.492, 'c': 2.782, 'd': 4.253, 'e': 12.702, 'f': 2.228, 'g': 2.015, 'h': 6.094, 'i': 6.966,
+    'j': 0.153, 'k': 0.772, 'l': 4.025, 'm': 2.406, 'n': 6.749, 'o': 7.507, 'p': 1.929, 'q': 0.095, 'r': 5.987,
+    's': 6.327, 't': 9.056, 'u': 2.758, 'v': 0.978, 'w': 2.360, 'x': 0.150, 'y': 1.974, 'z': 0.074
+}
+
+ENGLISH_ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+BASE64_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+
+
+class VigenereAnalyzer:
+    '''
+        This class is used to estimate the key length and recover the key of a text encrypted using the Vigenere cipher
+    '''
+    def __init__(self, alphabet : str = ENGLISH_ALPHABET, frequencies : dict = None, max_key_length : int = 40):
+        '''
+            Initialize the VigenereAnalyzer object
+
+            Parameters
+            ------------
+            alphabet : str
+                It is the alphabet used by the cipher (English or base 64)
+
+            frequencies : dict or list[dict]
+                It is the expected frequency of each letter of the plaintext.
+                A list gives the frequencies of each position modulo its length (e.g. base 64 text has a period of 4 letters).
+                By default, the English frequencies are used for the English alphabet.
+
+            max_key_length : int
+                It is the biggest key length that will be considered
+        '''
+        self.__alphabet = alphabet
+        self.__max_key_length = max_key_length
+        self.__index_table = np.full(256, -1, dtype=np.int16)
+        self.__index_table[np.frombuffer(bytes(alphabet, "ascii"), dtype=np.uint8)] = np.arange(len(alphabet), dtype=np.int16)
+        if frequencies is None and alphabet == ENGLISH_ALPHABET:
+            frequencies = ENGLISH_FREQUENCIES
+        self.__frequencies = None
+        if frequencies is not None:
+            if isinstance(frequencies, dict):
+                frequencies = [frequencies]
+            # One row of expected frequencies per position modulo the period of the plaintext
+            self.__frequencies = np.array([[phase.get(letter, 0) for letter in alphabet] for phase in frequencies], dtype=np.float64)
+            # Avoid dividing by 0 for letters that never appear
+            self.__frequencies = np.maximum(self.__frequencies, 1e-6)
+            self.__frequencies /= self.__frequencies.sum(axis=1, keepdims=True)
+
+
+    def frequencies_from_sample(self, sample : str, period : int = 1):
+        '''
+            Compute the frequency of each letter of the alphabet in a sample plaintext.\n
+            It is used to get the expected frequencies of alphabets without a known distribution (e.g. base 64).
+
+            Parameters
+            ------------
+            sample : str
+                It is a plaintext representative of the encrypted texts
+
+            period : int
+                It is the number of positions with their own distribution (4 for base 64 encoded text)
+
+            Return
+            ------------
+            frequencies : dict or list[dict]
+                It is the relative frequency of each letter (for each position modulo the period if it is greater than 1)
+        '''
+        counts = self.__column_counts(self.__to_indices(sample), period)
+        frequencies = [dict(zip(self.__alphabet, (row / max(row.sum(), 1)).tolist())) for row in counts]
+        return frequencies[0] if period == 1 else frequencies
+
+
+    def __to_indices(self, text : str):
+        '''
+            Transform a text into the array of the alphabet index of each letter, ignoring characters outside the alphabet
+
+            Parameters
+            ------------
+            text : str
+                It is the text that will be transformed
+
+            Return
+            ------------
+            indices : np.ndarray
+                It is the alphabet index of each letter
+        '''
+        indices = self.__index_table[np.frombuffer(text.encode("ascii", "ignore"), dtype=np.uint8)]
+        return indices[indices >= 0].astype(np.int64)
+
+
+    def __column_counts(self, indices : np.ndarray, key_length : int):
+        '''
+            Count how many times each letter appears in each column (letters encrypted with the same key letter)
+
+            Parameters
+            ------------
+            indices : np.ndarray
+                It is the alphabet index of each letter of the encrypted text
+
+            key_length : int
+                It is the number of columns
+
+            Return
+            ------------
+            counts : np.ndarray
+                It is a matrix (key_length x alphabet size) with the histogram of each column
+        '''
+        size = len(self.__alphabet)
+        # Strided view: row r contains the letters r * key_length ... r * key_length + key_length - 1
+        columns = indices[: (indices.size // key_length) * key_length].reshape(-1, key_length)
+        counts = np.bincount((columns + np.arange(key_length) * size).ravel(), minlength=key_length * size)
+        return counts.reshape(key_length, size)
+
+
+    def kasiski(self, encrypted_text : str, ngram_size : int = 3):
+        '''
+            Kasiski examination: get the distances between repeated n-grams and count, for each key length,
+            how many of them are multiples of it compared to what is expected by chance
+
+            Parameters
+            ------------
+            encrypted_text : str
+                It is the text encrypted using the Vigenere cipher
+
+            ngram_size : int
+                It is the size of the repeated sequences
+
+            Return
+            ------------
+            scores : np.ndarray
+                scores[length] is the ratio between the distances divisible by length and the expected amount (1 means chance)
+        '''
+        indices = self.__to_indices(encrypted_text)
+        scores = np.zeros(self.__max_key_length + 1)
+        if indices.size <= ngram_size:
+            return scores
+        # Encode each n-gram as a single integer
+        codes = np.zeros(indices.size - ngram_size + 1, dtype=np.int64)
+        for position in range(ngram_size):
+            codes = codes * len(self.__alphabet) + indices[position : indices.size - ngram_size + 1 + position]
+        # Equal n-grams are consecutive after sorting, and the stable sort keeps their positions in increasing order
+        order = np.argsort(codes, kind="stable")
+        repeated = codes[order[1:]] == codes[order[:-1]]
+        distances = order[1:][repeated] - order[:-1][repeated]
+        if distances.size == 0:
+            return scores
+        for length in range(2, self.__max_key_length + 1):
+            scores[length] = np.count_nonzero(distances % length == 0) * length / distances.size
+        return scores
+
+
+    def index_of_coincidence(self, encrypted_text : str):
+        '''
+            Get the average index of coincidence of the columns for each possible key length
+
+            Parameters
+            ------------
+            encrypted_text : str
+                It is the text encrypted using the Vigenere cipher
+
+            Return
+            ------------
+            coincidences : np.ndarray
+                coincidences[length] is the average index of coincidence of the columns when the key has that length
+        '''
+        indices = self.__to_indices(encrypted_text)
+        coincidences = np.zeros(self.__max_key_length + 1)
+        for length in range(1, min(self.__max_key_length, indices.size // 2) + 1):
+            counts = self.__column_counts(indices, length)
+            totals = counts.sum(axis=1)
+            coincidences[length] = np.mean((counts * (counts - 1)).sum(axis=1) / (totals * (totals - 1)))
+        return coincidences
+
+
+    def key_length(self, encrypted_text : str):
+        '''
+            Estimate the key length.\n
+            The right length and its multiples have an index of coincidence close to the language's one,
+            so the smallest length close enough to the highest index is chosen. Ties are broken with the Kasiski examination.
+
+            Parameters
+            ------------
+            encrypted_text : str
+                It is the text encrypted using the Vigenere cipher
+
+            Return
+            ------------
+            int
+                It is the estimated key length
+        '''
+        coincidences = self.index_of_coincidence(encrypted_text)
+        random_coincidence = 1 / len(self.__alphabet)
+        threshold = random_coincidence + 0.8 * (coincidences.max() - random_coincidence)
+        candidates = np.flatnonzero(coincidences >= threshold).tolist()
+        if not candidates:
+            return 1
+        # Discard the multiples of smaller candidates
+        candidates = [length for length in candidates if all(length % other != 0 for other in candidates if other < length)]
+        if len(candidates) == 1:
+            return candidates[0]
+        kasiski = self.kasiski(encrypted_text)
+        return max(candidates, key=lambda length: kasiski[length])
+
+
+    def recover_key(self, encrypted_text : str, key_length : int = None):
+        '''
+            Recover the key choosing, for each column, the shift whose decryption best fits the expected frequencies (chi-squared)
+
+            Parameters
+            ------------
+            encrypted_text : str
+                It is the text encrypted using the Vigenere cipher
+
+            key_length : int
+                It is the key length. By default, it is estimated.
+
+            Return
+            ------------
+            key : str
+                It is the recovered key
+        '''
+        if self.__frequencies is None:
+            raise ValueError("The expected frequencies of the alphabet are needed to recover the key")
+        key_length = key_length or self.key_length(encrypted_text)
+        # Every column must contain letters of a single plaintext period position to compare it with its frequencies
+        period = len(self.__frequencies)
+        columns_length = key_length * period // math.gcd(key_length, period)
+        size = len(self.__alphabet)
+        counts = self.__column_counts(self.__to_indices(encrypted_text), columns_length).astype(np.float64)
+        expected = counts.sum(axis=1, keepdims=True) * self.__frequencies[np.arange(columns_length) % period]
+        # shifted[column, shift, letter] = times the letter appears in the column once the shift is undone
+        shifted = counts[:, (np.arange(size)[:, None] + np.arange(size)[None, :]) % size]
+        chi_squared = ((shifted - expected[:, None, :]) ** 2 / expected[:, None, :]).sum(axis=2)
+        key = "".join(self.__alphabet[shift] for shift in chi_squared.argmin(axis=1))
+        # Reduce the key to its smallest repeating unit
+        for length in range(1, columns_length + 1):
+            if columns_length % length == 0 and key == key[:length] * (columns_length // length):
+                return key[:length]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python VigenereAnalyzer.py encrypted_filename [encrypted_filename ...]")
+    analyzer = VigenereAnalyzer()
+    for filename in sys.argv[1:]:
+        with open(filename, "r") as reader:
+            encrypted_text = reader.read()
+        key_length = analyzer.key_length(encrypted_text)
+        print(f"{filename}: key length {key_length}, key {analyzer.recover_key(encrypted_text, key_length)}")
@@ -1,46 +1,174 @@
 
 
 from typing import Counter
+import argparse
+import sys
+import numpy as np
+
+# Alphabets of the Vigenere cipher: the English letters and the base 64 letters used by the modes of operation
+ENGLISH_ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+BASE64_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
 
 
 class VigenereCipher:
     '''
         This class is used to encrypt/decrypt text using the Vigenere cipher
     '''
-    def __init__ (self):
-        self.__alphabet = ['a','b','c','d','e','f','g','h','i','j','k','l','m','n','o','p','q','r','s','t','u','v','w','x','y','z']
+    # Translation tables shared by every instance, indexed by (alphabet, shift)
+    __shift_tables = dict()
+
+    def __init__ (self, alphabet : str = ENGLISH_ALPHABET):
+        '''
+            Initialize the VigenereCipher object
+
+            Parameters
+            --------------
+            alphabet : str
+                It is the letters of the cipher in the order of their shifts (ASCII characters without repetitions),
+                e.g. ENGLISH_ALPHABET or BASE64_ALPHABET
+        '''
+        if not alphabet or not alphabet.isascii() or len(set(alphabet)) != len(alphabet):
+            raise ValueError("The alphabet must contain different ASCII characters")
+        self.__alphabet = list(alphabet)
         self.__letter_to_index = dict(zip(self.__alphabet, range(len(self.__alphabet))))
         self.__index_to_letter = dict(zip(range(len(self.__alphabet)), self.__alphabet))
+        self.__alphabet_bytes = bytes("".join(self.__alphabet), "ascii")
+        # Lookup tables used by the batch API: byte -> alphabet index (-1 if it is not a letter) and index -> byte
+        self.__index_table = np.full(256, -1, dtype=np.int16)
+        self.__index_table[np.frombuffer(self.__alphabet_bytes, dtype=np.uint8)] = np.arange(len(self.__alphabet), dtype=np.int16)
+        self.__letter_table = np.frombuffer(self.__alphabet_bytes, dtype=np.uint8)
 
 
-    def __divide_text(self, text : str, division_size : int):
+    def __get_tables(self, key : str, direction : int):
         '''
-            Divide a text into blocks of size division_key.\n
-            Example:\n
-            text     |  division_size | result\n
-            "abc"   |       3       |  [[0,1,2]]\n
-            "abcd" |        3      |  [[0,1,2], [3]]
+            Get the translation table of each position of the key.\n
+            The tables only depend on the shift of each key letter, so they are built once and shared by every instance.
 
             Parameters
             --------------
-            text : str
-                It is the text that will be divided
-            
-            division_size : int
-                It defines the size of each block created.
-            
+            key : str
+                It is the key whose tables are needed
+
+            direction : int
+                It is 1 to encrypt and -1 to decrypt
+
+            Return
+            ---------------
+            tables : list[bytes]
+                It is the translation table (for bytes.translate) of each key position
+        '''
+        if not key:
+            raise ValueError("The key must contain at least one letter")
+        if any(key_letter not in self.__letter_to_index for key_letter in key):
+            raise ValueError("The key contains characters that do not belong to the alphabet")
+        tables = []
+        for key_letter in key:
+            shift = (direction * self.__letter_to_index[key_letter]) % len(self.__alphabet)
+            table = VigenereCipher.__shift_tables.get((self.__alphabet_bytes, shift))
+            if table is None:
+                shifted_alphabet = self.__alphabet_bytes[shift:] + self.__alphabet_bytes[:shift]
+                table = bytes.maketrans(self.__alphabet_bytes, shifted_alphabet)
+                VigenereCipher.__shift_tables[(self.__alphabet_bytes, shift)] = table
+            tables.append(table)
+        return tables
+
+
+    def __translate_bytes(self, data : bytes, key : str, direction : int, offset : int = 0, keep_other : bool = False):
+        '''
+            Shift every letter of the text using the letter of the key in its position.\n
+            Each key position is processed as a whole strided slice, so the text is transformed in len(key) calls.
+
+            Parameters
+            --------------
+            data : bytes
+                It is the text (ASCII encoded, any bytes-like object) that will be transformed
+
+            key : str
+                It is the key used to transform the text
+
+            direction : int
+                It is 1 to encrypt and -1 to decrypt
+
+            offset : int
+                It is the position of the first letter of the text inside the whole message, so the key continues from there
+
+            keep_other : bool
+                If it is True, the bytes that are not letters of the alphabet are copied unchanged and do not use a key position.
+                Otherwise, they raise ValueError.
+
+            Return
+            ---------------
+            bytearray
+                It is the transformed text
+        '''
+        # The strided slices of a memoryview or a bytearray do not translate like bytes, so the data is copied once
+        data = bytes(data)
+        if keep_other:
+            # Only the letters are transformed; the bytes of the other characters (UTF-8 included) never match a letter
+            result = np.frombuffer(data, dtype=np.uint8).copy()
+            letters = self.__index_table[result] >= 0
+            result[letters] = np.frombuffer(self.__translate_bytes(result[letters].tobytes(), key, direction, offset), dtype=np.uint8)
+            return bytearray(result.tobytes())
+        tables = self.__get_tables(key, direction)
+        # Rotate the tables so the first letter uses the key letter of its position
+        offset %= len(tables)
+        tables = tables[offset:] + tables[:offset]
+        # Every letter must belong to the alphabet, as it happens with the letter to index lookup
+        if data.translate(None, self.__alphabet_bytes):
+            raise ValueError("The text contains characters that do not belong to the alphabet")
+        period = len(tables)
+        result = bytearray(len(data))
+        for position, table in enumerate(tables):
+            result[position::period] = data[position::period].translate(table)
+        return result
+
+
+    def __translate_batch(self, messages : list, keys : list, direction : int):
+        '''
+            Shift every letter of many messages at once, each message using its own key.\n
+            All the messages are concatenated into one index array, so the shift of every letter is computed with vectorized modular arithmetic.
+
+            Parameters
+            --------------
+            messages : list[str]
+                It is the list (or array) of messages that will be transformed
+
+            keys : list[str]
+                It is the key of each message
+
+            direction : int
+                It is 1 to encrypt and -1 to decrypt
+
             Return
             ---------------
-            list[list[int]]
-                It is a matrix that contains each block generated from the text
+            list[str]
+                It is the list of transformed messages
         '''
-        divided_text = list()
-        for index in range(0, len(text), division_size):
-            divided_text.append([letter for letter in text[index : index + division_size]])
-        return  divided_text
+        if len(messages) != len(keys):
+            raise ValueError("Each message needs its own key")
+        if len(messages) == 0:
+            return []
+        encoded_messages = [message.encode("ascii") for message in messages]
+        encoded_keys = [key.encode("ascii") for key in keys]
+        lengths = np.fromiter(map(len, encoded_messages), dtype=np.int64, count=len(encoded_messages))
+        periods = np.fromiter(map(len, encoded_keys), dtype=np.int64, count=len(encoded_keys))
+        if not periods.all():
+            raise ValueError("The key must contain at least one letter")
+        letters = self.__index_table[np.frombuffer(b"".join(encoded_messages), dtype=np.uint8)]
+        key_letters = self.__index_table[np.frombuffer(b"".join(encoded_keys), dtype=np.uint8)]
+        if (letters < 0).any() or (key_letters < 0).any():
+            raise ValueError("The text contains characters that do not belong to the alphabet")
+        # Message and key that every letter belongs to, and the position of the letter inside its message
+        starts = np.cumsum(lengths) - lengths
+        key_starts = np.cumsum(periods) - periods
+        rows = np.repeat(np.arange(len(messages)), lengths)
+        positions = np.arange(letters.size) - starts[rows]
+        shifts = key_letters[key_starts[rows] + positions % periods[rows]]
+        result = self.__letter_table[(letters + direction * shifts) % len(self.__alphabet)].tobytes()
+        return [result[start : start + length].decode("ascii") for start, length in zip(starts.tolist(), lengths.tolist())]
 
 
-    def encrypt(self, plaintext : str, key : str):
+    def encrypt(self, plaintext : str, key : str, offset : int = 0):
         '''
             Encrypt a plaintext using the key
 
@@ -52,23 +180,18 @@ class VigenereCipher:
             key : str
                 It is the key used to encrypt the text
 
+            offset : int
+                It is the position of the plaintext inside the whole message (0 by default)
+
             Return
             --------
             encrypted_text : str
                 It is  result of encrypting the plaintext using the key
         '''
-        encrypted_text = ""
-        plaintext_divisions = self.__divide_text(plaintext, len(key))
-        for division in plaintext_divisions:
-            for i in range(len(division)):
-                text_letter = division[i]
-                key_letter = key[i]            
-                new_text_letter_index = (self.__letter_to_index[text_letter] + self.__letter_to_index[key_letter]) % len(self.__alphabet)
-                encrypted_text += self.__index_to_letter[new_text_letter_index]
-        return encrypted_text
+        return self.__translate_bytes(plaintext.encode("ascii"), key, 1, offset).decode("ascii")
 
 
-    def decrypt(self, encrypted_text : str, key : str):
+    def decrypt(self, encrypted_text : str, key : str, offset : int = 0):
         '''
             Decrypt a encrypted text using the key
 
@@ -80,25 +203,255 @@ class VigenereCipher:
             key : str
                 It is the key used to decrypt the text
 
+            offset : int
+                It is the position of the encrypted text inside the whole message (0 by default)
+
             Return
             --------
             decrypted_text : str
                 It is  result of decrypting the encrypted text using the key
         '''
-        decrypted_text = ""
-        encrypted_text_division = self.__divide_text(encrypted_text, len(key))
-        for division in encrypted_text_division:
-            for i in range(len(division)):
-                text_letter = division[i]
-                key_letter = key[i]            
-                new_text_letter_index = (self.__letter_to_index[text_letter] - self.__letter_to_index[key_letter]) % len(self.__alphabet)
-                decrypted_text += self.__index_to_letter[new_text_letter_index]
-        return decrypted_text
+        return self.__translate_bytes(encrypted_text.encode("ascii"), key, -1, offset).decode("ascii")
+
+
+    def encrypt_bytes(self, data : bytes, key : str, offset : int = 0, keep_other : bool = False):
+        '''
+            Encrypt an ASCII encoded plaintext using the key
+
+            Parameters
+            --------
+            data : bytes
+                It is the plaintext (ASCII encoded) that will be encrypted
+            
+            key : str
+                It is the key used to encrypt the text
+
+            offset : int
+                It is the position of the plaintext inside the whole message (0 by default)
+
+            keep_other : bool
+                If it is True, the bytes that are not letters of the alphabet are copied unchanged (see __translate_bytes)
+
+            Return
+            --------
+            bytearray
+                It is the result of encrypting the plaintext using the key
+        '''
+        return self.__translate_bytes(data, key, 1, offset, keep_other)
+
+
+    def decrypt_bytes(self, data : bytes, key : str, offset : int = 0, keep_other : bool = False):
+        '''
+            Decrypt an ASCII encoded encrypted text using the key
+
+            Parameters
+            --------
+            data : bytes
+                It is the encrypted text (ASCII encoded) that will be decrypted
+            
+            key : str
+                It is the key used to decrypt the text
+
+            offset : int
+                It is the position of the encrypted text inside the whole message (0 by default)
+
+            keep_other : bool
+                If it is True, the bytes that are not letters of the alphabet are copied unchanged (see __translate_bytes)
+
+            Return
+            --------
+            bytearray
+                It is the result of decrypting the encrypted text using the key
+        '''
+        return self.__translate_bytes(data, key, -1, offset, keep_other)
+
+
+    def count_letters(self, data : bytes):
+        '''
+            Count the letters of the alphabet in an ASCII (or UTF-8) encoded text, i.e. the key positions that it uses
+
+            Parameters
+            --------
+            data : bytes
+                It is the text
+
+            Return
+            --------
+            int
+                It is the number of letters
+        '''
+        return len(data) - len(bytes(data).translate(None, self.__alphabet_bytes))
+
+
+    def encrypt_batch(self, messages : list, keys : list):
+        '''
+            Encrypt many plaintexts in one call, each one using its own key
+
+            Parameters
+            --------
+            messages : list[str]
+                It is the list (or array) of plaintexts that will be encrypted
+            
+            keys : list[str]
+                It is the key used to encrypt each plaintext
+
+            Return
+            --------
+            list[str]
+                It is the result of encrypting each plaintext using its key
+        '''
+        return self.__translate_batch(messages, keys, 1)
+
+
+    def decrypt_batch(self, messages : list, keys : list):
+        '''
+            Decrypt many encrypted texts in one call, each one using its own key
+
+            Parameters
+            --------
+            messages : list[str]
+                It is the list (or array) of encrypted texts that will be decrypted
+            
+            keys : list[str]
+                It is the key used to decrypt each encrypted text
+
+            Return
+            --------
+            list[str]
+                It is the result of decrypting each encrypted text using its key
+        '''
+        return self.__translate_batch(messages, keys, -1)
+
+
+    def __translate_stream(self, source, writer, key : str, direction : int, chunk_size : int, keep_other : bool = False):
+        '''
+            Transform a stream chunk by chunk, keeping track of the key position between chunks.\n
+            Only one chunk is kept in memory, so the memory used does not depend on the size of the stream.
+
+            Parameters
+            --------------
+            source : file object or iterable[str]
+                It is the file object (opened in text mode) or the generator that provides the text
+
+            writer : file object
+                It is the file object (opened in text mode) where the transformed text will be written
+
+            key : str
+                It is the key used to transform the text
+
+            direction : int
+                It is 1 to encrypt and -1 to decrypt
+
+            chunk_size : int
+                It is the number of characters read from the file object each time
+
+            keep_other : bool
+                If it is True, the characters that do not belong to the alphabet (spaces, new lines, punctuation, capital letters...)
+                are written unchanged and do not use a key position. Otherwise, they raise ValueError.
+
+            Return
+            ---------------
+            int
+                It is the number of letters transformed
+        '''
+        if hasattr(source, "read"):
+            chunks = iter(lambda: source.read(chunk_size), "")
+        else:
+            chunks = source
+        offset = 0
+        for chunk in chunks:
+            if not keep_other:
+                writer.write(self.__translate_bytes(chunk.encode("ascii"), key, direction, offset).decode("ascii"))
+                offset += len(chunk)
+                continue
+            data = chunk.encode("utf-8")
+            writer.write(self.__translate_bytes(data, key, direction, offset, True).decode("utf-8"))
+            offset += self.count_letters(data)
+        return offset
+
+
+    def encrypt_stream(self, source, writer, key : str, chunk_size : int = 1024 * 1024, keep_other : bool = False):
+        '''
+            Encrypt a stream of plaintext using the key, producing the same result as encrypt over the whole text
+
+            Parameters
+            --------
+            source : file object or iterable[str]
+                It is the file object or the generator that provides the plaintext
+            
+            writer : file object
+                It is the file object where the encrypted text will be written
+
+            key : str
+                It is the key used to encrypt the text
+
+            chunk_size : int
+                It is the number of characters read each time from a file object
+
+            keep_other : bool
+                If it is True, the characters that do not belong to the alphabet are written unchanged (see __translate_stream)
+
+            Return
+            --------
+            int
+                It is the number of letters encrypted
+        '''
+        return self.__translate_stream(source, writer, key, 1, chunk_size, keep_other)
+
+
+    def decrypt_stream(self, source, writer, key : str, chunk_size : int = 1024 * 1024, keep_other : bool = False):
+        '''
+            Decrypt a stream of encrypted text using the key, producing the same result as decrypt over the whole text
+
+            Parameters
+            --------
+            source : file object or iterable[str]
+                It is the file object or the generator that provides the encrypted text
+            
+            writer : file object
+                It is the file object where the decrypted text will be written
+
+            key : str
+                It is the key used to decrypt the text
+
+            chunk_size : int
+                It is the number of characters read each time from a file object
+
+            keep_other : bool
+                If it is True, the characters that do not belong to the alphabet are written unchanged (see __translate_stream)
+
+            Return
+            --------
+            int
+                It is the number of letters decrypted
+        '''
+        return self.__translate_stream(source, writer, key, -1, chunk_size, keep_other)
+
 
 if __name__ == "__main__":
-    cipher = VigenereCipher()
-    key = "cat"
-    plaintext = "cryptography"
-    encrypted_text = cipher.encrypt(plaintext, key)
-    print(encrypted_text)
-    print(cipher.decrypt(encrypted_text, key))
+    if len(sys.argv) > 1:
+        # Encrypt/decrypt a file as a stream, e.g. python VigenereCipher.py encrypt plaintext.txt encrypted.txt cat
+        parser = argparse.ArgumentParser(description="Encrypt/decrypt a file using the Vigenere cipher with bounded memory")
+        parser.add_argument("operation", choices=["encrypt", "decrypt"])
+        parser.add_argument("input_filename", help="File (with extension) that contains the text")
+        parser.add_argument("output_filename", help="File (with extension) that will store the result")
+        parser.add_argument("key", help="Key used to encrypt/decrypt the text")
+        parser.add_argument("--chunk-size", type=int, default=1024 * 1024, help="Number of characters processed each time")
+        parser.epilog = "Only the lowercase letters a-z are encrypted/decrypted. Any other character (spaces, new lines, punctuation, " \
+            "capital letters...) is copied unchanged and does not use a letter of the key."
+        args = parser.parse_args()
+        if args.chunk_size <= 0:
+            parser.error("--chunk-size must be a positive number")
+        cipher = VigenereCipher()
+        with open(args.input_filename, "r", encoding="utf-8", newline="") as reader, open(args.output_filename, "w", encoding="utf-8", newline="") as writer:
+            if args.operation == "encrypt":
+                cipher.encrypt_stream(reader, writer, args.key, args.chunk_size, keep_other=True)
+            else:
+                cipher.decrypt_stream(reader, writer, args.key, args.chunk_size, keep_other=True)
+    else:
+        cipher = VigenereCipher()
+        key = "cat"
+        plaintext = "cryptography"
+        encrypted_text = cipher.encrypt(plaintext, key)
+        print(encrypted_text)
+        print(cipher.decrypt(encrypted_text, key))
@@ -0,0 +1,274 @@
+'''
+    Dictionary attack against the Vigenere cipher.
+
+    Every candidate key of a wordlist decrypts a short prefix of the encrypted text, the result is scored with
+    an n-gram fitness function (log probabilities of the language) and the best candidates are kept in a heap.
+    The wordlist is divided in chunks that are processed by a pool of processes.
+
+    Usage: python VigenereKeySearch.py encrypted_filename wordlist_filename [--corpus english.txt] [--top 10]
+'''
+
+import argparse
+import heapq
+import itertools
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+from VigenereAnalyzer import ENGLISH_ALPHABET, ENGLISH_FREQUENCIES
+from VigenereCipher import VigenereCipher
+
+
+# State of each worker process, set once by initialize_worker
+worker_state = dict()
+# Bytes that are not letters of the alphabet, deleted from the encrypted text before taking the prefix
+OTHER_CHARACTERS = bytes(sorted(set(range(256)) - set(ENGLISH_ALPHABET.encode("ascii"))))
+
+
+def to_indices(text : str):
+    '''
+        Transform a text into the array of the alphabet index of each letter, ignoring characters outside the alphabet
+
+        Parameters
+        ------------
+        text : str
+            It is the text that will be transformed
+
+        Return
+        ------------
+        np.ndarray
+            It is the alphabet index of each letter
+    '''
+    letters = np.frombuffer(text.lower().encode("ascii", "ignore"), dtype=np.uint8).astype(np.int64) - ord("a")
+    return letters[(letters >= 0) & (letters < len(ENGLISH_ALPHABET))]
+
+
+def score_rows(rows : np.ndarray, log_probabilities : np.ndarray, ngram_size : int):
+    '''
+        Score many texts of the same length at once, adding the log probability of each n-gram
+
+        Parameters
+        ------------
+        rows : np.ndarray
+            It is a matrix (texts x letters) with the alphabet index of each letter
+
+        log_probabilities : np.ndarray
+            It is the log probability of each n-gram, indexed by its code
+
+        ngram_size : int
+            It is the size of the n-grams
+
+        Return
+        ------------
+        np.ndarray
+            It is the fitness of each text (the higher, the more it looks like the language)
+    '''
+    codes = np.zeros((rows.shape[0], rows.shape[1] - ngram_size + 1), dtype=np.int64)
+    for position in range(ngram_size):
+        codes = codes * len(ENGLISH_ALPHABET) + rows[:, position : rows.shape[1] - ngram_size + 1 + position]
+    return log_probabilities[codes].sum(axis=1)
+
+
+def initialize_worker(prefix : str, log_probabilities : np.ndarray, ngram_size : int):
+    '''
+        Store the encrypted prefix and the fitness function in the worker process
+
+        Parameters
+        ------------
+        prefix : str
+            It is the prefix of the encrypted text decrypted with every candidate
+
+        log_probabilities : np.ndarray
+            It is the log probability of each n-gram
+
+        ngram_size : int
+            It is the size of the n-grams
+    '''
+    worker_state["prefix"] = prefix
+    worker_state["log_probabilities"] = log_probabilities
+    worker_state["ngram_size"] = ngram_size
+    worker_state["cipher"] = VigenereCipher()
+
+
+def score_candidates(candidates : list, top : int):
+    '''
+        Decrypt the prefix with every candidate key and keep the best ones
+
+        Parameters
+        ------------
+        candidates : list[str]
+            It is a chunk of the wordlist
+
+        top : int
+            It is the number of candidates kept
+
+        Return
+        ------------
+        list[tuple]
+            It is the list of (score, key) of the best candidates, and the number of valid candidates tested
+    '''
+    letters = set(ENGLISH_ALPHABET)
+    # The same key can appear many times in the wordlist (e.g. Lemon and lemon), it is scored once
+    keys = list(dict.fromkeys(candidate for candidate in (word.strip().lower() for word in candidates) if candidate and set(candidate) <= letters))
+    if not keys:
+        return [], 0
+    prefix = worker_state["prefix"]
+    # All the decryptions have the length of the prefix, so they form a matrix
+    decrypted = worker_state["cipher"].decrypt_batch([prefix] * len(keys), keys)
+    rows = np.frombuffer("".join(decrypted).encode("ascii"), dtype=np.uint8).reshape(len(keys), len(prefix)).astype(np.int64) - ord("a")
+    scores = score_rows(rows, worker_state["log_probabilities"], worker_state["ngram_size"])
+    best = np.argsort(scores)[::-1][:top]
+    return [(float(scores[index]), keys[index]) for index in best], len(keys)
+
+
+class VigenereKeySearch:
+    '''
+        This class is used to find the key of a text encrypted using the Vigenere cipher from a list of candidate keys
+    '''
+    def __init__(self, corpus : str = None, ngram_size : int = 3, workers : int = None, chunk_size : int = 20000, prefix_length : int = 120):
+        '''
+            Initialize the VigenereKeySearch object
+
+            Parameters
+            ------------
+            corpus : str
+                It is a text in the language of the plaintext used to compute the n-gram probabilities.
+                Without it, the English letter frequencies are used (n-grams of size 1).
+
+            ngram_size : int
+                It is the size of the n-grams used by the fitness function
+
+            workers : int
+                It is the number of processes used. By default, one per core.
+
+            chunk_size : int
+                It is the number of candidates sent to a worker each time
+
+            prefix_length : int
+                It is the number of letters of the encrypted text decrypted with every candidate
+        '''
+        self.__workers = workers or os.cpu_count()
+        self.__chunk_size = chunk_size
+        self.__prefix_length = prefix_length
+        if corpus is None:
+            self.__ngram_size = 1
+            frequencies = np.array([ENGLISH_FREQUENCIES[letter] for letter in ENGLISH_ALPHABET])
+            self.__log_probabilities = np.log(frequencies / frequencies.sum())
+        else:
+            self.__ngram_size = ngram_size
+            indices = to_indices(corpus)
+            codes = np.zeros(indices.size - ngram_size + 1, dtype=np.int64)
+            for position in range(ngram_size):
+                codes = codes * len(ENGLISH_ALPHABET) + indices[position : indices.size - ngram_size + 1 + position]
+            counts = np.bincount(codes, minlength=len(ENGLISH_ALPHABET) ** ngram_size).astype(np.float64)
+            # N-grams that never appear in the corpus get a small probability instead of 0
+            counts[counts == 0] = 0.01
+            self.__log_probabilities = np.log(counts / counts.sum())
+
+
+    def fitness(self, text : str):
+        '''
+            Score how much a text looks like the language of the corpus
+
+            Parameters
+            ------------
+            text : str
+                It is the text that will be scored
+
+            Return
+            ------------
+            float
+                It is the sum of the log probabilities of the n-grams of the text
+        '''
+        indices = to_indices(text)
+        if indices.size < self.__ngram_size:
+            return -math.inf
+        return float(score_rows(indices[None, :], self.__log_probabilities, self.__ngram_size)[0])
+
+
+    def search(self, encrypted_text : str, candidates, top : int = 10):
+        '''
+            Try every candidate key and get the best ones
+
+            Parameters
+            ------------
+            encrypted_text : str
+                It is the text encrypted using the Vigenere cipher (the characters that are not letters a-z are ignored)
+
+            candidates : iterable[str]
+                It is the list (or file object) of candidate keys, one per item
+
+            top : int
+                It is the number of candidates returned
+
+            Return
+            ------------
+            best : list[tuple]
+                It is the list of (score, key) of the best candidates, from the best to the worst
+
+            candidates_per_second : float
+                It is the number of candidate keys tested per second
+        '''
+        # Only the letters use a key position, so removing the other characters (spaces, new lines...) keeps the key aligned
+        prefix = encrypted_text.encode("utf-8").translate(None, OTHER_CHARACTERS).decode("ascii")[: self.__prefix_length]
+        if len(prefix) < self.__ngram_size:
+            raise ValueError("The encrypted text is too short to score the candidates")
+        candidates = iter(candidates)
+        best = []
+        # Keys in the heap, a key repeated in another chunk of the wordlist is not kept twice
+        best_keys = set()
+        tested = 0
+        start = time.perf_counter()
+        with ProcessPoolExecutor(self.__workers, initializer=initialize_worker, initargs=(prefix, self.__log_probabilities, self.__ngram_size)) as executor:
+            pending = set()
+            while True:
+                # Keep a bounded number of chunks in flight so the wordlist is never fully loaded
+                while len(pending) < 2 * self.__workers:
+                    chunk = list(itertools.islice(candidates, self.__chunk_size))
+                    if not chunk:
+                        break
+                    pending.add(executor.submit(score_candidates, chunk, top))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk_best, chunk_tested = future.result()
+                    tested += chunk_tested
+                    for candidate in chunk_best:
+                        if candidate[1] in best_keys:
+                            continue
+                        if len(best) < top:
+                            heapq.heappush(best, candidate)
+                            best_keys.add(candidate[1])
+                        elif candidate > best[0]:
+                            best_keys.discard(heapq.heapreplace(best, candidate)[1])
+                            best_keys.add(candidate[1])
+        elapsed = time.perf_counter() - start
+        return sorted(best, reverse=True), tested / max(elapsed, 1e-9)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dictionary attack against the Vigenere cipher")
+    parser.add_argument("encrypted_filename", help="File (with extension) that contains the encrypted text")
+    parser.add_argument("wordlist_filename", help="File (with extension) that contains a candidate key per line")
+    parser.add_argument("--corpus", help="Text file in the language of the plaintext used to compute the n-gram fitness")
+    parser.add_argument("--top", type=int, default=10, help="Number of candidates reported")
+    parser.add_argument("--workers", type=int, default=None, help="Number of processes")
+    args = parser.parse_args()
+
+    corpus = None
+    if args.corpus:
+        with open(args.corpus, "r") as reader:
+            corpus = reader.read()
+    with open(args.encrypted_filename, "r", encoding="utf-8") as reader:
+        encrypted_text = reader.read()
+    key_search = VigenereKeySearch(corpus, workers=args.workers)
+    with open(args.wordlist_filename, "r", errors="ignore") as wordlist:
+        best, candidates_per_second = key_search.search(encrypted_text, wordlist, args.top)
+    print(f"Candidates per second: {candidates_per_second:.0f}")
+    cipher = VigenereCipher()
+    for score, key in best:
+        print(f"{score:12.2f} {key}: {cipher.decrypt_bytes(encrypted_text[:60].encode('utf-8'), key, keep_other=True).decode('utf-8')!r}")
@@ -0,0 +1,94 @@
+'''
+    Benchmark of the table-driven Vigenere cipher against the previous letter by letter implementation
+
+    Usage: python benchmark.py [--sizes 1K 1M 100M] [--key cat]
+'''
+
+import argparse
+import random
+import time
+
+from VigenereCipher import VigenereCipher
+
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+
+def legacy_encrypt(plaintext : str, key : str):
+    '''
+        Encrypt a plaintext the way VigenereCipher used to do it: one dictionary lookup and one string concatenation per letter
+
+        Parameters
+        --------
+        plaintext : str
+            It is the plaintext that will be encrypted
+
+        key : str
+            It is the key used to encrypt the text
+
+        Return
+        --------
+        encrypted_text : str
+            It is  result of encrypting the plaintext using the key
+    '''
+    letter_to_index = dict(zip(ALPHABET, range(len(ALPHABET))))
+    index_to_letter = dict(zip(range(len(ALPHABET)), ALPHABET))
+    encrypted_text = ""
+    for index in range(0, len(plaintext), len(key)):
+        division = plaintext[index : index + len(key)]
+        for i in range(len(division)):
+            new_text_letter_index = (letter_to_index[division[i]] + letter_to_index[key[i]]) % len(ALPHABET)
+            encrypted_text += index_to_letter[new_text_letter_index]
+    return encrypted_text
+
+
+def parse_size(size : str):
+    '''
+        Transform a size like 1K, 1M or 100M into its number of bytes
+
+        Parameters
+        --------
+        size : str
+            It is the size with an optional K, M or G suffix
+
+        Return
+        --------
+        int
+            It is the number of bytes
+    '''
+    multipliers = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    size = size.upper()
+    if size[-1] in multipliers:
+        return int(size[:-1]) * multipliers[size[-1]]
+    return int(size)
+
+
+def throughput(function, text : str, key : str):
+    '''
+        Measure the throughput of a cipher function
+
+        Return
+        --------
+        float
+            It is the throughput in MB/s
+    '''
+    start = time.perf_counter()
+    function(text, key)
+    elapsed = time.perf_counter() - start
+    return len(text) / (1024 ** 2) / max(elapsed, 1e-9)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vigenere cipher throughput benchmark")
+    parser.add_argument("--sizes", nargs="+", default=["1K", "1M", "100M"], help="Input sizes (1K, 1M, 100M, ...)")
+    parser.add_argument("--key", default="cryptography", help="Key used to encrypt the random text")
+    args = parser.parse_args()
+
+    cipher = VigenereCipher()
+    print(f"{'size':>8} | {'legacy MB/s':>12} | {'tables MB/s':>12} | {'speedup':>8}")
+    for size in args.sizes:
+        text = "".join(random.choices(ALPHABET, k=parse_size(size)))
+        assert cipher.encrypt(text[:4096], args.key) == legacy_encrypt(text[:4096], args.key)
+        legacy = throughput(legacy_encrypt, text, args.key)
+        tables = throughput(cipher.encrypt, text, args.key)
+        print(f"{size:>8} | {legacy:>12.2f} | {tables:>12.2f} | {tables / legacy:>7.1f}x")
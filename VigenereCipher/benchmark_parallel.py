@@ -0,0 +1,65 @@
+'''
+    Scaling benchmark of ParallelVigenereCipher over a large file
+
+    Usage: python benchmark_parallel.py [--size 1G] [--workers 1 2 4 8]
+'''
+
+import argparse
+import os
+import tempfile
+import time
+
+from ParallelVigenereCipher import ParallelVigenereCipher
+from VigenereCipher import VigenereCipher
+from benchmark import parse_size
+
+
+ALPHABET = b"abcdefghijklmnopqrstuvwxyz"
+
+
+def create_plaintext(filename : str, size : int):
+    '''
+        Create a file that contains size random letters
+
+        Parameters
+        --------
+        filename : str
+            It is the filename (with extension) of the created file
+
+        size : int
+            It is the number of letters
+    '''
+    # Map every random byte to a letter
+    table = bytes(ALPHABET[value % len(ALPHABET)] for value in range(256))
+    with open(filename, "wb") as writer:
+        for start in range(0, size, 16 * 1024 * 1024):
+            writer.write(os.urandom(min(16 * 1024 * 1024, size - start)).translate(table))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel Vigenere cipher scaling benchmark")
+    parser.add_argument("--size", default="1G", help="Input size (1M, 100M, 1G, ...)")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4, 8], help="Number of processes to try")
+    parser.add_argument("--chunk-size", default="64M", help="Letters processed by a worker each time")
+    parser.add_argument("--key", default="cryptography", help="Key used to encrypt the file")
+    args = parser.parse_args()
+
+    size = parse_size(args.size)
+    with tempfile.TemporaryDirectory() as directory:
+        plaintext_filename = os.path.join(directory, "plaintext.txt")
+        encrypted_filename = os.path.join(directory, "encrypted.txt")
+        create_plaintext(plaintext_filename, size)
+
+        with open(plaintext_filename, "rb") as reader:
+            sample = reader.read(4096)
+        print(f"{'workers':>8} | {'seconds':>8} | {'MB/s':>10} | {'speedup':>8}")
+        baseline = None
+        for workers in args.workers:
+            cipher = ParallelVigenereCipher(workers, parse_size(args.chunk_size))
+            start = time.perf_counter()
+            cipher.encrypt_file(plaintext_filename, encrypted_filename, args.key)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{workers:>8} | {elapsed:>8.2f} | {size / (1024 ** 2) / elapsed:>10.2f} | {baseline / elapsed:>7.2f}x")
+            with open(encrypted_filename, "rb") as reader:
+                assert reader.read(4096) == VigenereCipher().encrypt_bytes(sample, args.key)